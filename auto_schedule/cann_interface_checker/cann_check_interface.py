@@ -18,9 +18,19 @@
 cann check interface
 """
 import os
+import ast
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 
 specs_dir = os.path.realpath(__file__ + "../../../dsl_interface_spec")
 tbe_root = os.path.realpath(__file__ + "../../../")
+# the parse results of the files, they are reused if the file is not changed
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "cann_interface_checker",
+                                  "signature_cache.json")
+# change it when the parse result is changed
+CACHE_VERSION = 1
 
 
 class FuncIntfSpec:
@@ -99,49 +109,6 @@ def get_tree_idx(str_info: str):
         return 1
 
 
-def build_file_spec(spec_lines, file_spec: FileSpec):
-    spec_tree = [file_spec, ]
-    for spec_line in spec_lines:
-        spec_line = spec_line.rstrip()
-        if spec_line.startswith("#"):
-            continue
-        elif "class" in spec_line:
-            tree_idx = get_tree_idx(spec_line)
-            if "(" in spec_line:
-                class_name = spec_line[6:spec_line.index("(")]
-                super_classes = spec_line[spec_line.index("(") + 1:spec_line.index(")")].split(",")
-            else:
-                class_name = spec_line[6:-1]
-                super_classes = []
-            class_spec = ClassIntfSpec(class_name, super_classes)
-            if len(spec_tree) < (tree_idx + 1):
-                spec_tree.append(class_spec)
-            else:
-                spec_tree[tree_idx] = class_spec
-            spec_tree[tree_idx - 1].add_class_spec(class_spec)
-        elif "def" in spec_line:
-            tree_idx = get_tree_idx(spec_line)
-            spec_line = spec_line.strip()
-            func_name = spec_line[4:spec_line.index("(")]
-            param_list = [x.strip() for x in spec_line[spec_line.index("(") + 1:spec_line.index(")")].split(",")]
-            func_spec = FuncIntfSpec(func_name, param_list)
-            if len(spec_tree) < (tree_idx + 1):
-                spec_tree.append(func_spec)
-            else:
-                spec_tree[tree_idx] = func_spec
-            spec_tree[tree_idx - 1].add_func_spec(func_spec)
-        elif is_global_variable(spec_line):
-            tree_idx = get_tree_idx(spec_line)
-            name = spec_line[:spec_line.index("=")].rstrip()
-            values = spec_line[(len(name) + 3):]
-            global_var_spec = GlobalVarSpec(name, values)
-            if len(spec_tree) < (tree_idx + 1):
-                spec_tree.append(global_var_spec)
-            else:
-                spec_tree[tree_idx] = global_var_spec
-            spec_tree[tree_idx - 1].add_global_var_spec(global_var_spec)
-
-
 def is_global_variable(spec_line):
     if spec_line.startswith("    "):
         return False
@@ -155,82 +122,310 @@ def is_global_variable(spec_line):
     return True
 
 
-def get_spec_info_list():
-    def _get_class_spec_info(spec_line, spec_tree):
+def split_params(params_text):
+    """
+    split the params text at the commas out of brackets and strings, it ends
+    at the bracket closing the param list
+    :param params_text: the text after "(" of the function define
+    :return: list of param text
+    """
+    params = []
+    depth = 0
+    quote = None
+    start = 0
+    for index, char in enumerate(params_text):
+        if quote is not None:
+            if char == quote and params_text[index - 1] != "\\":
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char in "([{":
+            depth += 1
+        elif char in ")]}":
+            if depth == 0:
+                params.append(params_text[start:index])
+                return params
+            depth -= 1
+        elif char == "," and depth == 0:
+            params.append(params_text[start:index])
+            start = index + 1
+    params.append(params_text[start:])
+    return params
+
+
+def _func_spec_to_obj(func_spec: FuncIntfSpec):
+    return func_spec.param_list
+
+
+def _class_spec_to_obj(class_spec: ClassIntfSpec):
+    return {"super_classes": class_spec.super_classes,
+            "funcs": {name: _func_spec_to_obj(func_spec) for name, func_spec in class_spec.func_list.items()}}
+
+
+def file_spec_to_obj(file_spec: FileSpec):
+    """
+    convert the FileSpec to json obj, it is saved in the cache and passed
+    from the worker process
+    """
+    return {"spec_file_name": file_spec.spec_file_name,
+            "source_file_name": file_spec.source_file_name,
+            "classes": {name: _class_spec_to_obj(class_spec) for name, class_spec in file_spec.class_specs.items()},
+            "funcs": {name: _func_spec_to_obj(func_spec) for name, func_spec in file_spec.func_specs.items()},
+            "global_vars": {name: global_var_spec.global_var_values
+                            for name, global_var_spec in file_spec.global_var_spec.items()}}
+
+
+def file_spec_from_obj(file_spec_obj):
+    """
+    convert the json obj to FileSpec
+    """
+    file_spec = FileSpec(file_spec_obj["spec_file_name"], file_spec_obj["source_file_name"])
+    for class_name, class_obj in file_spec_obj["classes"].items():
+        class_spec = ClassIntfSpec(class_name, class_obj["super_classes"])
+        for func_name, param_list in class_obj["funcs"].items():
+            class_spec.add_func_spec(FuncIntfSpec(func_name, param_list))
+        file_spec.add_class_spec(class_spec)
+    for func_name, param_list in file_spec_obj["funcs"].items():
+        file_spec.add_func_spec(FuncIntfSpec(func_name, param_list))
+    for name, values in file_spec_obj["global_vars"].items():
+        file_spec.add_global_var_spec(GlobalVarSpec(name, values))
+    return file_spec
+
+
+def parse_spec_file(spec_file_path):
+    """
+    parse the interface define file, one file may define many source files
+    :return: list of FileSpec json obj
+    """
+    def _add_spec(spec_line, spec, spec_tree):
         tree_idx = get_tree_idx(spec_line)
+        if len(spec_tree) < (tree_idx + 1):
+            spec_tree.append(spec)
+        else:
+            spec_tree[tree_idx] = spec
+        if isinstance(spec, ClassIntfSpec):
+            spec_tree[tree_idx - 1].add_class_spec(spec)
+        elif isinstance(spec, FuncIntfSpec):
+            spec_tree[tree_idx - 1].add_func_spec(spec)
+        else:
+            spec_tree[tree_idx - 1].add_global_var_spec(spec)
+
+    def _get_class_spec(spec_line):
         if "(" in spec_line:
             class_name = spec_line[6:spec_line.index("(")]
             super_classes = spec_line[spec_line.index("(") + 1:spec_line.index(")")].split(",")
         else:
             class_name = spec_line[6:-1]
             super_classes = []
-        class_spec = ClassIntfSpec(class_name, super_classes)
-        if len(spec_tree) < (tree_idx + 1):
-            spec_tree.append(class_spec)
-        else:
-            spec_tree[tree_idx] = class_spec
-        spec_tree[tree_idx - 1].add_class_spec(class_spec)
+        return ClassIntfSpec(class_name, super_classes)
 
-    def _get_def_spec_info(spec_line, spec_tree):
-        tree_idx = get_tree_idx(spec_line)
+    def _get_def_spec(spec_line):
         spec_line = spec_line.strip()
         func_name = spec_line[4:spec_line.index("(")]
-        param_list = [x.strip() for x in spec_line[spec_line.index("(") + 1:spec_line.index(")")].split(",")]
-        func_spec = FuncIntfSpec(func_name, param_list)
-        if len(spec_tree) < (tree_idx + 1):
-            spec_tree.append(func_spec)
-        else:
-            spec_tree[tree_idx] = func_spec
-        spec_tree[tree_idx - 1].add_func_spec(func_spec)
+        param_list = [x.strip() for x in split_params(spec_line[spec_line.index("(") + 1:])]
+        return FuncIntfSpec(func_name, param_list)
 
-    def _get_global_var_spec_info(spec_line, spec_tree):
-        tree_idx = get_tree_idx(spec_line)
+    def _get_global_var_spec(spec_line):
         name = spec_line[:spec_line.index("=")].rstrip()
         values = spec_line[(len(name) + 3):]
-        global_var_spec = GlobalVarSpec(name, values)
-        if len(spec_tree) < (tree_idx + 1):
-            spec_tree.append(global_var_spec)
-        else:
-            spec_tree[tree_idx] = global_var_spec
-        spec_tree[tree_idx - 1].add_global_var_spec(global_var_spec)
+        return GlobalVarSpec(name, values)
 
-    def _process_dir(specs, specs_dir, file_spec_list):
-        for spec_file in specs:
-            spec_tree = []
-            if not spec_file.endswith("pyh"):
-                continue
-            with open(os.path.join(specs_dir, spec_file)) as sf:
-                spec_lines = sf.readlines()
-
-            for spec_line in spec_lines:
-                spec_line = spec_line.rstrip()
-                if "# source file:" in spec_line:
-                    spec_source_file = spec_line[14:].strip()
-                    file_spec = FileSpec(spec_file, spec_source_file)
-                    file_spec_list.append(file_spec)
-                    if len(spec_tree) < 1:
-                        spec_tree.append(file_spec)
-                    else:
-                        spec_tree[0] = file_spec
-                elif spec_line.startswith("#"):
-                    continue
-                elif "class" in spec_line:
-                    _get_class_spec_info(spec_line, spec_tree)
-                elif "def" in spec_line:
-                    _get_def_spec_info(spec_line, spec_tree)
-                elif is_global_variable(spec_line):
-                    _get_global_var_spec_info(spec_line, spec_tree)
-
-    specs = os.listdir(specs_dir)
-    sub_dirs = traversal_dir(specs_dir)
+    spec_file = os.path.basename(spec_file_path)
     file_spec_list = []
-    _process_dir(specs, specs_dir, file_spec_list)
-    for sub_dir in sub_dirs:
-        _process_dir(os.listdir(sub_dir), sub_dir, file_spec_list)
-        sub_sub_dirs = traversal_dir(sub_dir)
-        for sub_sub_dir in sub_sub_dirs:
-            _process_dir(os.listdir(sub_sub_dir), sub_sub_dir, file_spec_list)
-    return file_spec_list
+    spec_tree = []
+    with open(spec_file_path) as sf:
+        spec_lines = sf.readlines()
+    for spec_line in spec_lines:
+        spec_line = spec_line.rstrip()
+        if "# source file:" in spec_line:
+            spec_source_file = spec_line[14:].strip()
+            file_spec = FileSpec(spec_file, spec_source_file)
+            file_spec_list.append(file_spec)
+            if len(spec_tree) < 1:
+                spec_tree.append(file_spec)
+            else:
+                spec_tree[0] = file_spec
+        elif spec_line.startswith("#"):
+            continue
+        elif "class" in spec_line:
+            _add_spec(spec_line, _get_class_spec(spec_line), spec_tree)
+        elif "def" in spec_line:
+            _add_spec(spec_line, _get_def_spec(spec_line), spec_tree)
+        elif is_global_variable(spec_line):
+            _add_spec(spec_line, _get_global_var_spec(spec_line), spec_tree)
+    return [file_spec_to_obj(file_spec) for file_spec in file_spec_list]
+
+
+def _get_source_segment(source_lines, node, end_node=None):
+    """
+    get the source text from node to end_node, the lines are stripped and
+    joined as the line based parser did
+    """
+    end_node = node if end_node is None else end_node
+    if node.lineno == end_node.end_lineno:
+        return source_lines[node.lineno - 1][node.col_offset:end_node.end_col_offset]
+    text_lines = [source_lines[node.lineno - 1][node.col_offset:]]
+    text_lines += source_lines[node.lineno:end_node.end_lineno - 1]
+    text_lines.append(source_lines[end_node.end_lineno - 1][:end_node.end_col_offset])
+    return "".join(line.strip() for line in text_lines)
+
+
+def _get_param_list(source_lines, args: ast.arguments):
+    """
+    get the params of the function as they are written, like ["x", "y=None", "*args"]
+    """
+    def _get_param(arg, default):
+        if default is None:
+            return _get_source_segment(source_lines, arg)
+        return _get_source_segment(source_lines, arg, default).strip()
+
+    param_list = []
+    positional_args = getattr(args, "posonlyargs", []) + args.args
+    defaults = [None] * (len(positional_args) - len(args.defaults)) + list(args.defaults)
+    for index, (arg, default) in enumerate(zip(positional_args, defaults)):
+        param_list.append(_get_param(arg, default))
+        if index + 1 == len(getattr(args, "posonlyargs", [])):
+            param_list.append("/")
+    if args.vararg is not None:
+        param_list.append("*" + _get_source_segment(source_lines, args.vararg))
+    elif args.kwonlyargs:
+        param_list.append("*")
+    for arg, default in zip(args.kwonlyargs, args.kw_defaults):
+        param_list.append(_get_param(arg, default))
+    if args.kwarg is not None:
+        param_list.append("**" + _get_source_segment(source_lines, args.kwarg))
+    # the same as "def func():" in the interface define
+    return param_list if param_list else [""]
+
+
+def _get_global_var_spec(source_lines, node):
+    """
+    get the global variable spec of the module level assignment, the upper
+    case names are the global variables
+    """
+    spec_line = source_lines[node.lineno - 1].rstrip()
+    if node.col_offset != 0 or not is_global_variable(spec_line):
+        return None
+    name = spec_line[:spec_line.index("=")].rstrip()
+    values = spec_line[(len(name) + 3):]
+    return GlobalVarSpec(name, values)
+
+
+def parse_source_file(source_file_path):
+    """
+    parse the module level functions, classes with their methods and global
+    variables of the python source file by ast, the nested functions are
+    not interfaces
+    :return: FileSpec json obj
+    """
+    with open(source_file_path) as source_file:
+        source = source_file.read()
+    source_lines = source.splitlines(True)
+    file_spec = FileSpec("", source_file_path)
+    func_types = (ast.FunctionDef, ast.AsyncFunctionDef)
+    for node in ast.parse(source, source_file_path).body:
+        if isinstance(node, func_types):
+            file_spec.add_func_spec(FuncIntfSpec(node.name, _get_param_list(source_lines, node.args)))
+        elif isinstance(node, ast.ClassDef):
+            class_spec = ClassIntfSpec(node.name, [_get_source_segment(source_lines, base).strip()
+                                                   for base in node.bases])
+            for class_node in node.body:
+                if isinstance(class_node, func_types):
+                    class_spec.add_func_spec(
+                        FuncIntfSpec(class_node.name, _get_param_list(source_lines, class_node.args)))
+            file_spec.add_class_spec(class_spec)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            global_var_spec = _get_global_var_spec(source_lines, node)
+            if global_var_spec is not None:
+                file_spec.add_global_var_spec(global_var_spec)
+    return file_spec_to_obj(file_spec)
+
+
+class SignatureCache:
+    """
+    The parse results of spec and source files, keyed by file path and
+    checked by sha256 of the file content. The changed files are parsed in a
+    process pool.
+    """
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self.items = {}
+        self.parsed_cnt = 0
+        self.changed = False
+        if cache_path:
+            try:
+                with open(cache_path) as cache_file:
+                    cache_obj = json.load(cache_file)
+                if cache_obj.get("version") == CACHE_VERSION:
+                    self.items = cache_obj.get("items")
+            except (OSError, ValueError, AttributeError):
+                self.items = {}
+
+    @staticmethod
+    def _get_file_hash(file_path):
+        with open(file_path, "rb") as hash_file:
+            return hashlib.sha256(hash_file.read()).hexdigest()
+
+    def parse_files(self, parse_func, file_paths, jobs):
+        """
+        parse the files by parse_func, the unchanged files are not parsed
+        :return: {file path: parse result}
+        """
+        results = {}
+        changed_files = []
+        for file_path in file_paths:
+            file_hash = self._get_file_hash(file_path)
+            item = self.items.get(file_path)
+            if item is not None and item.get("hash") == file_hash and item.get("parser") == parse_func.__name__:
+                results[file_path] = item.get("result")
+            else:
+                changed_files.append((file_path, file_hash))
+        if len(changed_files) > 1 and jobs != 1:
+            with ProcessPoolExecutor(max_workers=jobs if jobs else os.cpu_count()) as executor:
+                parse_results = list(executor.map(parse_func, [file_path for file_path, _ in changed_files]))
+        else:
+            parse_results = [parse_func(file_path) for file_path, _ in changed_files]
+        for (file_path, file_hash), result in zip(changed_files, parse_results):
+            self.items[file_path] = {"hash": file_hash, "parser": parse_func.__name__, "result": result}
+            results[file_path] = result
+        self.parsed_cnt += len(changed_files)
+        self.changed = self.changed or bool(changed_files)
+        return results
+
+    def save(self):
+        """
+        save the cache if changed
+        """
+        if not self.cache_path or not self.changed:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_cache_path = "%s.%d.tmp" % (self.cache_path, os.getpid())
+        with open(tmp_cache_path, "w") as cache_file:
+            json.dump({"version": CACHE_VERSION, "items": self.items}, cache_file)
+        os.replace(tmp_cache_path, self.cache_path)
+
+
+def get_spec_file_list():
+    spec_files = []
+
+    def _process_dir(specs, specs_dir):
+        for spec_file in specs:
+            if spec_file.endswith("pyh"):
+                spec_files.append(os.path.join(specs_dir, spec_file))
+
+    _process_dir(os.listdir(specs_dir), specs_dir)
+    for sub_dir in traversal_dir(specs_dir):
+        _process_dir(os.listdir(sub_dir), sub_dir)
+        for sub_sub_dir in traversal_dir(sub_dir):
+            _process_dir(os.listdir(sub_sub_dir), sub_sub_dir)
+    return spec_files
+
+
+def get_spec_info_list(signature_cache=None, jobs=0):
+    signature_cache = SignatureCache("") if signature_cache is None else signature_cache
+    spec_files = get_spec_file_list()
+    results = signature_cache.parse_files(parse_spec_file, spec_files, jobs)
+    return [file_spec_from_obj(file_spec_obj) for spec_file in spec_files for file_spec_obj in results[spec_file]]
 
 
 def traversal_dir(path):
@@ -245,70 +440,7 @@ def traversal_dir(path):
     return sub_dirs
 
 
-def get_spec_from_file(file_path):
-    with open(file_path) as ff:
-        lines = ff.readlines()
-
-    def _get_new_lines(line, line_end, new_lines):
-        if "def " in line or "class " in line:
-            if not line.rstrip().endswith(":"):
-                line_end = False
-                new_lines.append(line.rstrip())
-            else:
-                new_lines.append(line.rstrip())
-        elif is_global_variable(line):
-            new_lines.append(line.rstrip())
-        return line_end
-
-    new_lines = []
-    block_comment = False
-    line_end = True
-    for line in lines:
-        tmp_line = line.strip()
-        if block_comment:
-            if "\"\"\"" in tmp_line:
-                block_comment = False
-        else:
-            if tmp_line.startswith("#"):
-                continue
-            if "\"\"\"" in tmp_line and not tmp_line.endswith("\"\"\""):
-                block_comment = True
-                continue
-            if "#" in line:
-                line = line[:line.index("#")]
-            if line_end:
-                line_end = _get_new_lines(line, line_end, new_lines)
-            else:
-                new_lines[-1] += line.strip()
-                if line.rstrip().endswith(":"):
-                    line_end = True
-
-    return new_lines
-
-
-def remove_sub_func_under_func(lines):
-    tree_info = [""]
-    new_lines = []
-    for line in lines:
-        idx = get_tree_idx(line)
-        if line.strip().startswith("def "):
-            type_name = "func"
-        elif line.strip().startswith("class "):
-            type_name = "class"
-        elif is_global_variable(line):
-            name = line[:line.index("=")].rstrip()
-            type_name = name
-        if type_name == "func" and tree_info[min(len(tree_info) - 1, idx - 1)] == "func":
-            continue
-        if len(tree_info) <= idx:
-            tree_info.append(type_name)
-        else:
-            tree_info[idx] = type_name
-        new_lines.append(line)
-    return new_lines
-
-
-def check_source_file_match(defined_spec: FileSpec):
+def get_source_file_path(defined_spec: FileSpec):
     source_file_path = os.path.realpath(os.path.join(tbe_root, defined_spec.source_file_name))
     if source_file_path.find("/te/") != -1:
         source_file_path = source_file_path.replace("/te", "")
@@ -316,12 +448,12 @@ def check_source_file_match(defined_spec: FileSpec):
         source_file_path = source_file_path.replace("/cann/cann/", "/cann/")
     if source_file_path.find("/canndev/cann/") != -1:
         source_file_path = source_file_path.replace("/canndev/cann/", "/canndev/")
-    lines = get_spec_from_file(source_file_path)
-    new_lines = remove_sub_func_under_func(lines)
+    return source_file_path
 
-    spec_in_source = FileSpec("", source_file_path)
-    build_file_spec(new_lines, spec_in_source)
 
+def check_source_file_match(defined_spec: FileSpec, spec_in_source: FileSpec = None):
+    if spec_in_source is None:
+        spec_in_source = file_spec_from_obj(parse_source_file(get_source_file_path(defined_spec)))
     return compare_file_spec(defined_spec, spec_in_source)
 
 
@@ -515,15 +647,26 @@ def compare_file_spec(spec1: FileSpec, spec2: FileSpec):
     return compare_matched
 
 
-def check_all():
+def check_all(jobs=0, cache_path=DEFAULT_CACHE_PATH):
+    signature_cache = SignatureCache(cache_path)
+    spec_define_list = get_spec_info_list(signature_cache, jobs)
+    source_files = [get_source_file_path(spec) for spec in spec_define_list]
+    source_specs = signature_cache.parse_files(parse_source_file, sorted(set(source_files)), jobs)
+    signature_cache.save()
     check_result = True
-    spec_define_list = get_spec_info_list()
-    for spec in spec_define_list:
-        if not check_source_file_match(spec):
+    for spec, source_file in zip(spec_define_list, source_files):
+        if not check_source_file_match(spec, file_spec_from_obj(source_specs[source_file])):
             check_result = False
+    print("\n[====] %d files are parsed, the others are not changed" % signature_cache.parsed_cnt)
     return check_result
 
 
 if __name__ == "__main__":
-    if not check_all():
+    parser = argparse.ArgumentParser(description="check the interfaces of the source files with the defines")
+    parser.add_argument("-j", "--jobs", type=int, default=0,
+                        help="the worker count to parse files, default is the cpu count")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="the parse result cache file")
+    parser.add_argument("--no_cache", action="store_true", help="parse all files without cache")
+    args = parser.parse_args()
+    if not check_all(args.jobs, "" if args.no_cache else args.cache):
         exit(-1)
@@ -26,6 +26,30 @@ from .auto_cast import auto_cast_of_cast
 
 STACKLEVEL_FOR_DSL_AUTOCAST = 4
 STACKLEVEL_FOR_DSL_NO_AUTOCAST = 2
+# the tbe.dsl functions resolved, {name: function}
+_DSL_FUNCS = {}
+
+
+def _warn_deprecated(message, stacklevel):
+    """
+    warn the deprecated api, the repeated warnings are filtered by the
+    warnings registry of the caller as the warnings filters configure.
+    """
+    # one more level for this function
+    warnings.warn(message, DeprecationWarning, stacklevel=stacklevel + 1)
+
+
+def _get_dsl_func(name):
+    """
+    get the function of tbe.dsl, it is resolved once. tbe.dsl is imported
+    lazily, it imports this module.
+    """
+    func = _DSL_FUNCS.get(name)
+    if func is None:
+        import tbe.dsl
+        func = getattr(tbe.dsl, name)
+        _DSL_FUNCS[name] = func
+    return func
 
 
 @auto_cast_of_cast
@@ -41,10 +65,9 @@ def ceil(raw_tensor):
     -------
     wrapped_tensor : casted tensor
     """
-    warnings.warn("te.lang.cce.ceil is deprecated, please replace it with tbe.dsl.ceil",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.ceil(raw_tensor)
+    _warn_deprecated("te.lang.cce.ceil is deprecated, please replace it with tbe.dsl.ceil",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("ceil")(raw_tensor)
 
 
 @auto_cast_of_cast
@@ -60,10 +83,9 @@ def floor(raw_tensor):
     -------
     wrapped_tensor : casted tensor
     """
-    warnings.warn("te.lang.cce.floor is deprecated, please replace it with tbe.dsl.floor",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.floor(raw_tensor)
+    _warn_deprecated("te.lang.cce.floor is deprecated, please replace it with tbe.dsl.floor",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("floor")(raw_tensor)
 
 
 @auto_cast_of_cast
@@ -79,10 +101,9 @@ def round(raw_tensor):
     -------
     wrapped_tensor : casted tensor
     """
-    warnings.warn("te.lang.cce.round is deprecated, please replace it with tbe.dsl.round",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.round(raw_tensor)
+    _warn_deprecated("te.lang.cce.round is deprecated, please replace it with tbe.dsl.round",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("round")(raw_tensor)
 
 
 @auto_cast_of_cast
@@ -98,10 +119,9 @@ def trunc(raw_tensor):
     -------
     wrapped_tensor : casted tensor
     """
-    warnings.warn("te.lang.cce.trunc is deprecated, please replace it with tbe.dsl.trunc",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.trunc(raw_tensor)
+    _warn_deprecated("te.lang.cce.trunc is deprecated, please replace it with tbe.dsl.trunc",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("trunc")(raw_tensor)
 
 
 def round_half_up(raw_tensor):
@@ -116,11 +136,9 @@ def round_half_up(raw_tensor):
     -------
     wrapped_tensor : casted tensor
     """
-    warnings.warn(
-        "te.lang.cce.round_half_up is deprecated, please replace it with tbe.dsl.round_half_up",
-         DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.round_half_up(raw_tensor)
+    _warn_deprecated("te.lang.cce.round_half_up is deprecated, please replace it with tbe.dsl.round_half_up",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("round_half_up")(raw_tensor)
 
 
 def cast_to(data, dtype, f1628IntegerFlag=True):
@@ -143,10 +161,9 @@ def cast_to(data, dtype, f1628IntegerFlag=True):
     -------
     tensor : tvm.tensor
     """
-    warnings.warn("te.lang.cce.cast_to is deprecated, please replace it with tbe.dsl.cast_to",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.cast_to(data, dtype, f1628IntegerFlag)
+    _warn_deprecated("te.lang.cce.cast_to is deprecated, please replace it with tbe.dsl.cast_to",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("cast_to")(data, dtype, f1628IntegerFlag)
 
 
 @auto_cast_of_elewise
@@ -166,10 +183,9 @@ def vadd(lhs, rhs):
     -------
     wrapped_tensor : lhs + rhs
     """
-    warnings.warn("te.lang.cce.vadd is deprecated, please replace it with tbe.dsl.vadd",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vadd(lhs, rhs)
+    _warn_deprecated("te.lang.cce.vadd is deprecated, please replace it with tbe.dsl.vadd",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vadd")(lhs, rhs)
 
 
 @auto_cast_of_elewise
@@ -189,10 +205,9 @@ def vsub(lhs, rhs):
     -------
     wrapped_tensor : lhs - rhs
     """
-    warnings.warn("te.lang.cce.vsub is deprecated, please replace it with tbe.dsl.vsub",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vsub(lhs, rhs)
+    _warn_deprecated("te.lang.cce.vsub is deprecated, please replace it with tbe.dsl.vsub",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vsub")(lhs, rhs)
 
 
 @auto_cast_of_elewise
@@ -212,10 +227,9 @@ def vmul(lhs, rhs):
     -------
     wrapped_tensor : lhs*rhs
     """
-    warnings.warn("te.lang.cce.vmul is deprecated, please replace it with tbe.dsl.vmul",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vmul(lhs, rhs)
+    _warn_deprecated("te.lang.cce.vmul is deprecated, please replace it with tbe.dsl.vmul",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vmul")(lhs, rhs)
 
 
 @auto_cast_of_elewise
@@ -234,10 +248,9 @@ def vdiv(lhs, rhs):
     -----
     wrapped_tensor: lhs / rhs
     """
-    warnings.warn("te.lang.cce.vdiv is deprecated, please replace it with tbe.dsl.vdiv",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vdiv(lhs, rhs)
+    _warn_deprecated("te.lang.cce.vdiv is deprecated, please replace it with tbe.dsl.vdiv",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vdiv")(lhs, rhs)
 
 
 @auto_cast_of_elewise
@@ -254,14 +267,13 @@ def vrec(raw_tensor, priority_flag=1):
     -------
     wrapped_tensor : vrec(raw_tensor)
     """
-    warnings.warn("te.lang.cce.vrec is deprecated, please replace it with tbe.dsl.vrec",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
+    _warn_deprecated("te.lang.cce.vrec is deprecated, please replace it with tbe.dsl.vrec",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
     impl_mode = "high_precision"
     from .te_compute.util import _get_priority_flag_value
     if _get_priority_flag_value(priority_flag) == 0.0:
         impl_mode = "high_performance"
-    import tbe.dsl
-    return tbe.dsl.vrec(raw_tensor, impl_mode)
+    return _get_dsl_func("vrec")(raw_tensor, impl_mode)
 
 
 def vmod(lhs, rhs):
@@ -280,10 +292,9 @@ def vmod(lhs, rhs):
     -----
     wrapped_tensor : lhs - floor(lhs/rhs) * rhs
     """
-    warnings.warn("te.lang.cce.vmod is deprecated, please replace it with tbe.dsl.vmod",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vmod(lhs, rhs)
+    _warn_deprecated("te.lang.cce.vmod is deprecated, please replace it with tbe.dsl.vmod",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("vmod")(lhs, rhs)
 
 
 @auto_cast_of_elewise
@@ -300,10 +311,9 @@ def vmax(lhs, rhs):
     -------
     wrapped_tensor : max(lhs , rhs)
     """
-    warnings.warn("te.lang.cce.vmax is deprecated, please replace it with tbe.dsl.vmax",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vmax(lhs, rhs)
+    _warn_deprecated("te.lang.cce.vmax is deprecated, please replace it with tbe.dsl.vmax",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vmax")(lhs, rhs)
 
 
 @auto_cast_of_elewise
@@ -320,10 +330,9 @@ def vmin(lhs, rhs):
     -------
     wrapped_tensor : min(lhs , rhs)
     """
-    warnings.warn("te.lang.cce.vmin is deprecated, please replace it with tbe.dsl.vmin",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vmin(lhs, rhs)
+    _warn_deprecated("te.lang.cce.vmin is deprecated, please replace it with tbe.dsl.vmin",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vmin")(lhs, rhs)
 
 
 @auto_cast_of_elewise
@@ -340,14 +349,13 @@ def vlog(raw_tensor, priority_flag=0):
     -------
     wrapped_tensor : log(raw_tensor)
     """
-    warnings.warn("te.lang.cce.vlog is deprecated, please replace it with tbe.dsl.vlog",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
+    _warn_deprecated("te.lang.cce.vlog is deprecated, please replace it with tbe.dsl.vlog",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
     impl_mode = "high_performance"
     from .te_compute.util import _get_priority_flag_value
     if _get_priority_flag_value(priority_flag) == 1.0:
         impl_mode = "high_precision"
-    import tbe.dsl
-    return tbe.dsl.vlog(raw_tensor, impl_mode)
+    return _get_dsl_func("vlog")(raw_tensor, impl_mode)
 
 
 @auto_cast_of_elewise
@@ -363,10 +371,9 @@ def vexp(raw_tensor):
     -------
     wrapped_tensor : exp(raw_tensor)
     """
-    warnings.warn("te.lang.cce.vexp is deprecated, please replace it with tbe.dsl.vexp",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vexp(raw_tensor)
+    _warn_deprecated("te.lang.cce.vexp is deprecated, please replace it with tbe.dsl.vexp",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vexp")(raw_tensor)
 
 
 @auto_cast_of_elewise
@@ -382,10 +389,9 @@ def vabs(raw_tensor):
     -------
     wrapped_tensor : abs(raw_tensor)
     """
-    warnings.warn("te.lang.cce.vabs is deprecated, please replace it with tbe.dsl.vabs",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vabs(raw_tensor)
+    _warn_deprecated("te.lang.cce.vabs is deprecated, please replace it with tbe.dsl.vabs",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vabs")(raw_tensor)
 
 
 @auto_cast_of_elewise
@@ -403,14 +409,13 @@ def vsqrt(raw_tensor, priority_flag=0):
     -------
     wrapped_tensor : vsqrt(raw_tensor)
     """
-    warnings.warn("te.lang.cce.vsqrt is deprecated, please replace it with tbe.dsl.vsqrt",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
+    _warn_deprecated("te.lang.cce.vsqrt is deprecated, please replace it with tbe.dsl.vsqrt",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
     impl_mode = "high_performance"
     from .te_compute.util import _get_priority_flag_value
     if _get_priority_flag_value(priority_flag) == 1.0:
         impl_mode = "high_precision"
-    import tbe.dsl
-    return tbe.dsl.vsqrt(raw_tensor, impl_mode)
+    return _get_dsl_func("vsqrt")(raw_tensor, impl_mode)
 
 
 @auto_cast_of_elewise
@@ -426,14 +431,13 @@ def vrsqrt(raw_tensor, priority_flag=0):
     -------
     wrapped_tensor : vrsqrt(raw_tensor)
     """
-    warnings.warn("te.lang.cce.vrsqrt is deprecated, please replace it with tbe.dsl.vrsqrt",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
+    _warn_deprecated("te.lang.cce.vrsqrt is deprecated, please replace it with tbe.dsl.vrsqrt",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
     impl_mode = "high_performance"
     from .te_compute.util import _get_priority_flag_value
     if _get_priority_flag_value(priority_flag) == 1.0:
         impl_mode = "high_precision"
-    import tbe.dsl
-    return tbe.dsl.vrsqrt(raw_tensor, impl_mode)
+    return _get_dsl_func("vrsqrt")(raw_tensor, impl_mode)
 
 
 @auto_cast_of_elewise
@@ -449,10 +453,9 @@ def vnot(raw_tensor):
     -------
     wrapped_tensor : vnot(raw_tensor)
     """
-    warnings.warn("te.lang.cce.vnot is deprecated, please replace it with tbe.dsl.vnot",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vnot(raw_tensor)
+    _warn_deprecated("te.lang.cce.vnot is deprecated, please replace it with tbe.dsl.vnot",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vnot")(raw_tensor)
 
 
 @auto_cast_of_elewise
@@ -469,10 +472,9 @@ def vor(lhs, rhs):
     -------
     wrapped_tensor : or(lhs , rhs)
     """
-    warnings.warn("te.lang.cce.vor is deprecated, please replace it with tbe.dsl.vor",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vor(lhs, rhs)
+    _warn_deprecated("te.lang.cce.vor is deprecated, please replace it with tbe.dsl.vor",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vor")(lhs, rhs)
 
 
 @auto_cast_of_elewise
@@ -489,10 +491,9 @@ def vand(lhs, rhs):
     -------
     wrapped_tensor : max(lhs , rhs)
     """
-    warnings.warn("te.lang.cce.vand is deprecated, please replace it with tbe.dsl.vand",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vand(lhs, rhs)
+    _warn_deprecated("te.lang.cce.vand is deprecated, please replace it with tbe.dsl.vand",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vand")(lhs, rhs)
 
 
 def vlogic(lhs, rhs=None, operation='logic_and'):
@@ -513,10 +514,9 @@ def vlogic(lhs, rhs=None, operation='logic_and'):
     -------
     wrapped_tensor
     """
-    warnings.warn("te.lang.cce.vlogic is deprecated, please replace it with tbe.dsl.vlogic",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vlogic(lhs, rhs, operation)
+    _warn_deprecated("te.lang.cce.vlogic is deprecated, please replace it with tbe.dsl.vlogic",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("vlogic")(lhs, rhs, operation)
 
 
 @auto_cast_of_elewise
@@ -534,10 +534,9 @@ def vadds(raw_tensor, scalar):
     -------
     wrapped_tensor : raw_tensor + scalar
     """
-    warnings.warn("te.lang.cce.vadds is deprecated, please replace it with tbe.dsl.vadds",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vadds(raw_tensor, scalar)
+    _warn_deprecated("te.lang.cce.vadds is deprecated, please replace it with tbe.dsl.vadds",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vadds")(raw_tensor, scalar)
 
 
 @auto_cast_of_elewise
@@ -556,10 +555,9 @@ def vmuls(raw_tensor, scalar):
     -------
     wrapped_tensor : raw_tensor*scalar
     """
-    warnings.warn("te.lang.cce.vmuls is deprecated, please replace it with tbe.dsl.vmuls",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vmuls(raw_tensor, scalar)
+    _warn_deprecated("te.lang.cce.vmuls is deprecated, please replace it with tbe.dsl.vmuls",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vmuls")(raw_tensor, scalar)
 
 
 @auto_cast_of_elewise
@@ -578,10 +576,9 @@ def vmaxs(raw_tensor, scalar):
     -------
     wrapped_tensor : max(raw_tensor, scalar)
     """
-    warnings.warn("te.lang.cce.vmaxs is deprecated, please replace it with tbe.dsl.vmaxs",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vmaxs(raw_tensor, scalar)
+    _warn_deprecated("te.lang.cce.vmaxs is deprecated, please replace it with tbe.dsl.vmaxs",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vmaxs")(raw_tensor, scalar)
 
 
 @auto_cast_of_elewise
@@ -600,10 +597,9 @@ def vmins(raw_tensor, scalar):
     -------
     wrapped_tensor : min(raw_tensor, scalar)
     """
-    warnings.warn("te.lang.cce.vmins is deprecated, please replace it with tbe.dsl.vmins",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vmins(raw_tensor, scalar)
+    _warn_deprecated("te.lang.cce.vmins is deprecated, please replace it with tbe.dsl.vmins",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vmins")(raw_tensor, scalar)
 
 
 @auto_cast_of_elewise
@@ -620,10 +616,9 @@ def vaxpy(lhs, rhs, scalar):
     -------
     wrapped_tensor : max(lhs , rhs)
     """
-    warnings.warn("te.lang.cce.vaxpy is deprecated, please replace it with tbe.dsl.vaxpy",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vaxpy(lhs, rhs, scalar)
+    _warn_deprecated("te.lang.cce.vaxpy is deprecated, please replace it with tbe.dsl.vaxpy",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vaxpy")(lhs, rhs, scalar)
 
 
 @auto_cast_of_elewise
@@ -639,10 +634,9 @@ def vmla(tensor_0, tensor_1, tensor_2):
     -------
     wrapped_tensor : X*tensor_1 + tensor_2
     """
-    warnings.warn("te.lang.cce.vmla is deprecated, please replace it with tbe.dsl.vmla",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vmla(tensor_0, tensor_1, tensor_2)
+    _warn_deprecated("te.lang.cce.vmla is deprecated, please replace it with tbe.dsl.vmla",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vmla")(tensor_0, tensor_1, tensor_2)
 
 
 @auto_cast_of_elewise
@@ -658,10 +652,9 @@ def vmadd(tensor_0, tensor_1, tensor_2):
     -------
     wrapped_tensor : tensor_0*tensor_2 + tensor_1
     """
-    warnings.warn("te.lang.cce.vmadd is deprecated, please replace it with tbe.dsl.vmadd",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vmadd(tensor_0, tensor_1, tensor_2)
+    _warn_deprecated("te.lang.cce.vmadd is deprecated, please replace it with tbe.dsl.vmadd",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vmadd")(tensor_0, tensor_1, tensor_2)
 
 
 def vcmp(lhs, rhs, operation='lt', mode='bool'):
@@ -685,10 +678,9 @@ def vcmp(lhs, rhs, operation='lt', mode='bool'):
     -------
     wrapped_tensor
     """
-    warnings.warn("te.lang.cce.vcmp is deprecated, please replace it with tbe.dsl.vcmp",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vcmp(lhs, rhs, operation, mode)
+    _warn_deprecated("te.lang.cce.vcmp is deprecated, please replace it with tbe.dsl.vcmp",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("vcmp")(lhs, rhs, operation, mode)
 
 
 def vsel(condition, lhs, rhs):
@@ -708,10 +700,9 @@ def vsel(condition, lhs, rhs):
     -------
     wrapped_tensor :
     """
-    warnings.warn("te.lang.cce.vsel is deprecated, please replace it with tbe.dsl.vsel",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vsel(condition, lhs, rhs)
+    _warn_deprecated("te.lang.cce.vsel is deprecated, please replace it with tbe.dsl.vsel",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("vsel")(condition, lhs, rhs)
 
 
 def vcmpsel(lhs, rhs=None, operation='lt', slhs=None, srhs=None):
@@ -734,10 +725,9 @@ def vcmpsel(lhs, rhs=None, operation='lt', slhs=None, srhs=None):
     -------
     wrapped_tensor
     """
-    warnings.warn("te.lang.cce.vcmpsel is deprecated, please replace it with tbe.dsl.vcmpsel",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vcmpsel(lhs, rhs, operation, slhs, srhs)
+    _warn_deprecated("te.lang.cce.vcmpsel is deprecated, please replace it with tbe.dsl.vcmpsel",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("vcmpsel")(lhs, rhs, operation, slhs, srhs)
 
 
 @auto_cast_of_elewise
@@ -753,10 +743,9 @@ def vmaddrelu(tensor_0, tensor_1, tensor_2):
     -------
     wrapped_tensor : relu(tensor_0*tensor_2 + tensor_1)
     """
-    warnings.warn("te.lang.cce.vmaddrelu is deprecated, please replace it with tbe.dsl.vmaddrelu",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vmaddrelu(tensor_0, tensor_1, tensor_2)
+    _warn_deprecated("te.lang.cce.vmaddrelu is deprecated, please replace it with tbe.dsl.vmaddrelu",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vmaddrelu")(tensor_0, tensor_1, tensor_2)
 
 
 def vaddrelu(lhs, rhs):
@@ -775,10 +764,9 @@ def vaddrelu(lhs, rhs):
     -------
     wrapped_tensor : relu (lhs + rhs)
     """
-    warnings.warn("te.lang.cce.vaddrelu is deprecated, please replace it with tbe.dsl.vaddrelu",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vaddrelu(lhs, rhs)
+    _warn_deprecated("te.lang.cce.vaddrelu is deprecated, please replace it with tbe.dsl.vaddrelu",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("vaddrelu")(lhs, rhs)
 
 
 def vsubrelu(lhs, rhs):
@@ -797,10 +785,9 @@ def vsubrelu(lhs, rhs):
     -------
     wrapped_tensor : relu (lhs - rhs)
     """
-    warnings.warn("te.lang.cce.vsubrelu is deprecated, please replace it with tbe.dsl.vsubrelu",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vsubrelu(lhs, rhs)
+    _warn_deprecated("te.lang.cce.vsubrelu is deprecated, please replace it with tbe.dsl.vsubrelu",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("vsubrelu")(lhs, rhs)
 
 
 @auto_cast_of_elewise
@@ -816,10 +803,9 @@ def vrelu(raw_tensor):
     -------
     wrapped_tensor : vrelu(raw_tensor)
     """
-    warnings.warn("te.lang.cce.vrelu is deprecated, please replace it with tbe.dsl.vrelu",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.vrelu(raw_tensor)
+    _warn_deprecated("te.lang.cce.vrelu is deprecated, please replace it with tbe.dsl.vrelu",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("vrelu")(raw_tensor)
 
 
 def vlrelu(raw_tensor, alpha=0):
@@ -834,20 +820,19 @@ def vlrelu(raw_tensor, alpha=0):
     -------
     wrapped_tensor : vlrelu(raw_tensor)
     """
-    warnings.warn("te.lang.cce.vlrelu is deprecated, please replace it with tbe.dsl.vlrelu",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    _warn_deprecated("te.lang.cce.vlrelu is deprecated, please replace it with tbe.dsl.vlrelu",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
 
     dtype = raw_tensor.dtype
     from te.platform import intrinsic_check_support
-    import tbe.dsl
     is_current_chip_support = intrinsic_check_support("Intrinsic_vlrelu")
     if not is_current_chip_support:
         if dtype == "int32":
             raw_tensor = cast_to(raw_tensor, "float32")
-            res = tbe.dsl.vlrelu(raw_tensor, alpha)
+            res = _get_dsl_func("vlrelu")(raw_tensor, alpha)
             return cast_to(res, "int32")
 
-    return tbe.dsl.vlrelu(raw_tensor, alpha)
+    return _get_dsl_func("vlrelu")(raw_tensor, alpha)
 
 
 def round_to(data, max_value, min_value):
@@ -866,10 +851,9 @@ def round_to(data, max_value, min_value):
     -------
     tensor : tvm.tensor ,elements in tensor is in range [min_value,max_value]
     """
-    warnings.warn("te.lang.cce.round_to is deprecated, please replace it with tbe.dsl.round_to",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.clip(data, max_value, min_value)
+    _warn_deprecated("te.lang.cce.round_to is deprecated, please replace it with tbe.dsl.round_to",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("clip")(data, max_value, min_value)
 
 
 def broadcast(var, shape, output_dtype=None):
@@ -888,10 +872,9 @@ def broadcast(var, shape, output_dtype=None):
     -------
     wrapped_tensor : broadcast tensor
     """
-    warnings.warn("te.lang.cce.broadcast is deprecated, please replace it with tbe.dsl.broadcast",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.broadcast(var, shape, output_dtype)
+    _warn_deprecated("te.lang.cce.broadcast is deprecated, please replace it with tbe.dsl.broadcast",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("broadcast")(var, shape, output_dtype)
 
 
 @auto_cast_of_reduce
@@ -908,10 +891,9 @@ def sum(raw_tensor, axis, keepdims=False):
     -------
     res : wrapped_tensor
     """
-    warnings.warn("te.lang.cce.sum is deprecated, please replace it with tbe.dsl.sum",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.reduce_sum(raw_tensor, axis, keepdims)
+    _warn_deprecated("te.lang.cce.sum is deprecated, please replace it with tbe.dsl.sum",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("reduce_sum")(raw_tensor, axis, keepdims)
 
 
 @auto_cast_of_reduce
@@ -928,13 +910,12 @@ def reduce_min(raw_tensor, axis, keepdims=False, priority_flag=False):
     -------
     res : wrapped_tensor
     """
-    warnings.warn("te.lang.cce.reduce_min is deprecated, please replace it with tbe.dsl.reduce_min",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
+    _warn_deprecated("te.lang.cce.reduce_min is deprecated, please replace it with tbe.dsl.reduce_min",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
     impl_mode = "high_performance"
     if priority_flag:
         impl_mode = "high_precision"
-    import tbe.dsl
-    return tbe.dsl.reduce_min(raw_tensor, axis, keepdims, impl_mode)
+    return _get_dsl_func("reduce_min")(raw_tensor, axis, keepdims, impl_mode)
 
 
 @auto_cast_of_reduce
@@ -952,13 +933,12 @@ def reduce_max(raw_tensor, axis, keepdims=False, priority_flag=False):
     -------
     res : wrapped_tensor
     """
-    warnings.warn("te.lang.cce.reduce_max is deprecated, please replace it with tbe.dsl.reduce_max",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
+    _warn_deprecated("te.lang.cce.reduce_max is deprecated, please replace it with tbe.dsl.reduce_max",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
     impl_mode = "high_performance"
     if priority_flag:
         impl_mode = "high_precision"
-    import tbe.dsl
-    return tbe.dsl.reduce_max(raw_tensor, axis, keepdims, impl_mode)
+    return _get_dsl_func("reduce_max")(raw_tensor, axis, keepdims, impl_mode)
 
 
 @auto_cast_of_reduce
@@ -974,11 +954,9 @@ def reduce_prod(raw_tensor, axis, keepdims=False):
     -------
     res : wrapped_tensor
     """
-    warnings.warn(
-        "te.lang.cce.reduce_prod is deprecated, please replace it with tbe.dsl.reduce_prod",
-         DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.reduce_prod(raw_tensor, axis, keepdims)
+    _warn_deprecated("te.lang.cce.reduce_prod is deprecated, please replace it with tbe.dsl.reduce_prod",
+                     STACKLEVEL_FOR_DSL_AUTOCAST)
+    return _get_dsl_func("reduce_prod")(raw_tensor, axis, keepdims)
 
 
 def split(data, split_dim, size_splits):
@@ -1000,20 +978,18 @@ def split(data, split_dim, size_splits):
     output_tensor_list: list
         the list of output tensors, output tensor type is TVM tensor.
     """
-    warnings.warn("te.lang.cce.split is deprecated, please replace it with tbe.dsl.split",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.split(data, split_dim, size_splits)
+    _warn_deprecated("te.lang.cce.split is deprecated, please replace it with tbe.dsl.split",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("split")(data, split_dim, size_splits)
 
 
 def split_compute_com(data, split_dim, size_splits):
     """
     Split a tensor into len(size_splits) tensors along one dimension
     """
-    warnings.warn("split_compute_com is deprecated, please replace it with the func split",
-                  DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.split(data, split_dim, size_splits)
+    _warn_deprecated("split_compute_com is deprecated, please replace it with the func split",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("split")(data, split_dim, size_splits)
 
 
 def split_schedule_com(data, split_dim, shape_list, tensor_list):
@@ -1037,8 +1013,8 @@ def split_schedule_com(data, split_dim, shape_list, tensor_list):
     build_list: list
         the list of input and output tensors, tensor type is TVM tensor.
     """
-    warnings.warn("te.lang.cce.split_schedule_com is deprecated",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    _warn_deprecated("te.lang.cce.split_schedule_com is deprecated",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
     from tbe.dsl.static_schedule.split_schedule import split_schedule_com
     return split_schedule_com(data, split_dim, shape_list, tensor_list)
 
@@ -1054,10 +1030,9 @@ def concat(raw_tensors, axis):
     -------
     concat tensor :
     """
-    warnings.warn("te.lang.cce.concat is deprecated, please replace it with tbe.dsl.concat",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.concat(raw_tensors, axis)
+    _warn_deprecated("te.lang.cce.concat is deprecated, please replace it with tbe.dsl.concat",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("concat")(raw_tensors, axis)
 
 
 def inplace_add(lhs, inplace_ids, rhs):
@@ -1078,11 +1053,9 @@ def inplace_add(lhs, inplace_ids, rhs):
     -------
     wrapped_tensor : computes lhs[inplace_ids, :] += rhs; return lhs.
     """
-    warnings.warn(
-        "te.lang.cce.inplace_add is deprecated, please replace it with tbe.dsl.inplace_add",
-         DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.inplace_add(lhs, inplace_ids, rhs)
+    _warn_deprecated("te.lang.cce.inplace_add is deprecated, please replace it with tbe.dsl.inplace_add",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("inplace_add")(lhs, inplace_ids, rhs)
 
 
 def inplace_sub(lhs, inplace_ids, rhs):
@@ -1103,11 +1076,9 @@ def inplace_sub(lhs, inplace_ids, rhs):
     -------
     wrapped_tensor : computes lhs[inplace_ids, :] -= rhs; return lhs.
     """
-    warnings.warn(
-        "te.lang.cce.inplace_sub is deprecated, please replace it with tbe.dsl.inplace_sub",
-         DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.inplace_sub(lhs, inplace_ids, rhs)
+    _warn_deprecated("te.lang.cce.inplace_sub is deprecated, please replace it with tbe.dsl.inplace_sub",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("inplace_sub")(lhs, inplace_ids, rhs)
 
 
 def inplace_update(lhs, inplace_ids, rhs):
@@ -1128,11 +1099,9 @@ def inplace_update(lhs, inplace_ids, rhs):
     -------
     wrapped_tensor : computes lhs[inplace_ids, :] = rhs; return lhs.
     """
-    warnings.warn(
-        "te.lang.cce.inplace_update is deprecated, please replace it with tbe.dsl.inplace_update",
-         DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.inplace_update(lhs, inplace_ids, rhs)
+    _warn_deprecated("te.lang.cce.inplace_update is deprecated, please replace it with tbe.dsl.inplace_update",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("inplace_update")(lhs, inplace_ids, rhs)
 
 
 def pooling2d(tensor_in, window, stride, pooling_mode, padding_mode="SAME",
@@ -1151,12 +1120,11 @@ def pooling2d(tensor_in, window, stride, pooling_mode, padding_mode="SAME",
     :ceil_mode : caffe round_mode params, 0:CEIL(default), 1:FLOOR
     :return: pooling result
     """
-    warnings.warn("te.lang.cce.pooling2d is deprecated, please replace it with tbe.dsl.pooling2d",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.pooling2d(tensor_in, window, stride, pooling_mode,
-                                       padding_mode, pad, dilation, data_mode,
-                                       ceil_mode, fusion_params, impl_mode)
+    _warn_deprecated("te.lang.cce.pooling2d is deprecated, please replace it with tbe.dsl.pooling2d",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("pooling2d")(tensor_in, window, stride, pooling_mode,
+                                      padding_mode, pad, dilation, data_mode,
+                                      ceil_mode, fusion_params, impl_mode)
 
 
 def pooling3d(tensor_in, window, stride, padding_mode="SAME",
@@ -1174,11 +1142,10 @@ def pooling3d(tensor_in, window, stride, padding_mode="SAME",
     :ceil_mode : caffe round_mode params, 0:CEIL(default), 1:FLOOR
     :return: pooling result
     """
-    warnings.warn("te.lang.cce.pooling3d is deprecated, please replace it with tbe.dsl.pooling3d",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.pooling3d(tensor_in, window, stride, padding_mode,
-                                       pads, pooling_mode, dilation, ceil_mode)
+    _warn_deprecated("te.lang.cce.pooling3d is deprecated, please replace it with tbe.dsl.pooling3d",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("pooling3d")(tensor_in, window, stride, padding_mode,
+                                      pads, pooling_mode, dilation, ceil_mode)
 
 
 def max_pooling3d_grad_grad(orig_input, orig_output, grad_grad, assist_tensor,
@@ -1200,19 +1167,18 @@ def max_pooling3d_grad_grad(orig_input, orig_output, grad_grad, assist_tensor,
     padding : str, the mode of padding, support SAME or VALID
     ceil_mode: reserved
     """
-    warnings.warn(
+    _warn_deprecated(
         "te.lang.cce.max_pooling3d_grad_grad is deprecated, please replace it with tbe.dsl.max_pooling3d_grad_grad",
-         DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.max_pooling3d_grad_grad(orig_input,
-                                          orig_output,
-                                          grad_grad,
-                                          assist_tensor,
-                                          ksize,
-                                          strides,
-                                          pads,
-                                          data_format,
-                                          padding)
+        STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("max_pooling3d_grad_grad")(orig_input,
+                                                    orig_output,
+                                                    grad_grad,
+                                                    assist_tensor,
+                                                    ksize,
+                                                    strides,
+                                                    pads,
+                                                    data_format,
+                                                    padding)
 
 
 def pooling3d_max_grad_grad(orig_input, orig_output, grad_grad, assist_tensor,
@@ -1235,19 +1201,17 @@ def pooling3d_max_grad_grad(orig_input, orig_output, grad_grad, assist_tensor,
     :padding : str, the mode of padding, support SAME or VALID
     :return: pooling result
     """
-    warnings.warn(
-        "pooling3d_max_grad_grad is deprecated, please replace it with max_pooling3d_grad_grad",
-        DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.max_pooling3d_grad_grad(orig_input,
-                                          orig_output,
-                                          grad_grad,
-                                          assist_tensor,
-                                          ksize,
-                                          strides,
-                                          pads,
-                                          data_format,
-                                          padding)
+    _warn_deprecated("pooling3d_max_grad_grad is deprecated, please replace it with max_pooling3d_grad_grad",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("max_pooling3d_grad_grad")(orig_input,
+                                                    orig_output,
+                                                    grad_grad,
+                                                    assist_tensor,
+                                                    ksize,
+                                                    strides,
+                                                    pads,
+                                                    data_format,
+                                                    padding)
 
 
 def auto_schedule(outs, option=None):
@@ -1264,11 +1228,9 @@ def auto_schedule(outs, option=None):
     sch: Schedule
         The computation schedule for the op.
     """
-    warnings.warn(
-        "te.lang.cce.auto_schedule is deprecated, please replace it with tbe.dsl.auto_schedule",
-         DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.auto_schedule(outs, option)
+    _warn_deprecated("te.lang.cce.auto_schedule is deprecated, please replace it with tbe.dsl.auto_schedule",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("auto_schedule")(outs, option)
 
 
 def cce_build_code(sch, config_map=None):
@@ -1294,10 +1256,9 @@ def cce_build_code(sch, config_map=None):
     -------
     None
     """
-    warnings.warn("te.lang.cce.cce_build_code is deprecated, please replace it with tbe.dsl.build",
-                DeprecationWarning, stacklevel=STACKLEVEL_FOR_DSL_NO_AUTOCAST)
-    import tbe.dsl
-    return tbe.dsl.build(sch, config_map)
+    _warn_deprecated("te.lang.cce.cce_build_code is deprecated, please replace it with tbe.dsl.build",
+                     STACKLEVEL_FOR_DSL_NO_AUTOCAST)
+    return _get_dsl_func("build")(sch, config_map)
 
 
 def tuple_sum(input_tensor_list, axis, keepdims=False):
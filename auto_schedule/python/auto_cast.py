@@ -17,13 +17,41 @@
 """
 auto_cast
 """
+import importlib
+
 from decorator import decorator
 
 from te import tvm
-from te.platform import intrinsic_check_support
 from te.utils.error_manager.error_manager_util import get_error_message
 from te.platform import get_soc_spec
 
+# the tbe functions used by auto cast, {(module name, function name): function}
+_TBE_FUNCS = {}
+
+
+def _get_tbe_func(module_name, func_name):
+    """
+    get the function of tbe or te_compute, it is resolved once. They are
+    imported lazily, tbe imports te and te_compute imports this module.
+    """
+    func = _TBE_FUNCS.get((module_name, func_name))
+    if func is None:
+        func = getattr(importlib.import_module(module_name), func_name)
+        _TBE_FUNCS[(module_name, func_name)] = func
+    return func
+
+
+def _is_all_tensor_supported(args, intr, support_table):
+    """
+    check the args are tensors with the same dtype supported by the intr,
+    then they are passed to the api without casting.
+    """
+    if not all(isinstance(arg, tvm.tensor.Tensor) for arg in args):
+        return False
+    dtype = args[0].dtype
+    return all(arg.dtype == dtype for arg in args) and \
+        support_table.check_intrinsic("Intrinsic_" + intr, dtype)
+
 
 @decorator
 def auto_cast_of_elewise(func, *args, **kwargs):
@@ -34,13 +62,14 @@ def auto_cast_of_elewise(func, *args, **kwargs):
     (On condition that the cast type is supported.
     If the cast type is not supported,raising a RuntimeError).
     """
-    from tbe.dsl.compute.cast import _cast
-    from tbe.dsl.compute.util import is_cast_support
-    from tbe.dsl.compute.util import judge_var
-    from tbe.dsl.compute.util import in_dynamic_and_static_unify
+    _cast = _get_tbe_func("tbe.dsl.compute.cast", "_cast")
+    judge_var = _get_tbe_func("tbe.dsl.compute.util", "judge_var")
+    in_dynamic_and_static_unify = _get_tbe_func("tbe.dsl.compute.util", "in_dynamic_and_static_unify")
     # dynamic not support auto_cast
     if in_dynamic_and_static_unify():
         return func(*args, **kwargs)
+    support_table = _get_tbe_func("te.lang.cce.te_compute.util", "get_soc_support_table")()
+    is_cast_support = support_table.is_cast_support
 
     def _check_args_type(args):
         if len(args) in (1, 2, 3):
@@ -60,14 +89,17 @@ def auto_cast_of_elewise(func, *args, **kwargs):
     _check_args_type(args)
 
     intr = func.__name__
-    intr = _intrinsic_check(intr)
+    intr = _intrinsic_check(intr, support_table)
+    # no cast is needed, skip the cast closures
+    if len(args) in (1, 2, 3) and _is_all_tensor_supported(args, intr, support_table):
+        return func(*args)
 
-    is_support_fp32 = intrinsic_check_support("Intrinsic_"+intr, "float32")
+    is_support_fp32 = support_table.check_intrinsic("Intrinsic_"+intr, "float32")
     if len(args) == 1:
         def _cast_one_input_tensor(args, intr, is_support_fp32):
             temp_tensor = args[0]
             dtype = temp_tensor.dtype
-            is_support_dtype = intrinsic_check_support("Intrinsic_"+intr, dtype)
+            is_support_dtype = support_table.check_intrinsic("Intrinsic_"+intr, dtype)
             if not is_support_dtype:
                 if is_support_fp32 and is_cast_support(dtype, "float32"):
                     temp_tensor = _cast(temp_tensor, "float32")
@@ -88,10 +120,8 @@ def auto_cast_of_elewise(func, *args, **kwargs):
 
                 lhs_t = lhs
                 rhs_t = rhs
-                is_support_ldtype = intrinsic_check_support("Intrinsic_"+intr,
-                                                            dtype_l)
-                is_support_rdtype = intrinsic_check_support("Intrinsic_"+intr,
-                                                            dtype_r)
+                is_support_ldtype = support_table.check_intrinsic("Intrinsic_"+intr, dtype_l)
+                is_support_rdtype = support_table.check_intrinsic("Intrinsic_"+intr, dtype_r)
                 if not is_support_ldtype \
                         or not is_support_rdtype or dtype_l != dtype_r:
                     if is_support_fp32 \
@@ -112,7 +142,7 @@ def auto_cast_of_elewise(func, *args, **kwargs):
             temp_tensor = args[0]
             scalar = args[1]
             dtype = temp_tensor.dtype
-            is_support_dtype = intrinsic_check_support("Intrinsic_"+intr, dtype)
+            is_support_dtype = support_table.check_intrinsic("Intrinsic_"+intr, dtype)
             if not is_support_dtype:
                 if is_support_fp32 \
                         and is_cast_support(dtype, "float32"):
@@ -156,8 +186,7 @@ def auto_cast_of_elewise(func, *args, **kwargs):
                                           f"dtype_1 is [{dtype_1}], dtype_2 is [{dtype_2}]"}
                     raise RuntimeError(dict_args, get_error_message(dict_args))
 
-                is_support_dtype0 = intrinsic_check_support("Intrinsic_"+intr,
-                                                            dtype_0)
+                is_support_dtype0 = support_table.check_intrinsic("Intrinsic_"+intr, dtype_0)
                 if not is_support_dtype0:
                     if is_support_fp32 \
                             and is_cast_support(dtype_0, "float32"):
@@ -184,8 +213,8 @@ def auto_cast_of_elewise(func, *args, **kwargs):
 
             lhs_t = lhs
             rhs_t = rhs
-            is_support_ldtype = intrinsic_check_support("Intrinsic_"+intr, dtype_l)
-            is_support_rdtype = intrinsic_check_support("Intrinsic_"+intr, dtype_r)
+            is_support_ldtype = support_table.check_intrinsic("Intrinsic_"+intr, dtype_l)
+            is_support_rdtype = support_table.check_intrinsic("Intrinsic_"+intr, dtype_r)
             if not is_support_ldtype \
                     or not is_support_rdtype or dtype_l != dtype_r:
                 if is_support_fp32 \
@@ -216,9 +245,9 @@ def auto_cast_of_elewise(func, *args, **kwargs):
     return func(*args, **kwargs)
 
 
-def _intrinsic_check(intr):
+def _intrinsic_check(intr, support_table):
     ret_intr = intr
-    if not intrinsic_check_support("Intrinsic_" + intr):
+    if not support_table.check_intrinsic("Intrinsic_" + intr):
         if intr == "vdiv":
             ret_intr = "vrec"
         elif intr == "vsqrt":
@@ -243,10 +272,10 @@ def auto_cast_of_reduce(func, *args, **kwargs):
     (On condition that the cast type is supported.
     If the cast type is not supported,raising a RuntimeError).
     '''
-    from tbe.dsl.compute.util import reduce_axis_check
-    from tbe.dsl.compute.util import auto_cast_tensor
-    from tbe.dsl.compute.util import dsl_support_dtype
-    from tbe.dsl.compute.util import in_dynamic_and_static_unify
+    reduce_axis_check = _get_tbe_func("tbe.dsl.compute.util", "reduce_axis_check")
+    auto_cast_tensor = _get_tbe_func("tbe.dsl.compute.util", "auto_cast_tensor")
+    dsl_support_dtype = _get_tbe_func("tbe.dsl.compute.util", "dsl_support_dtype")
+    in_dynamic_and_static_unify = _get_tbe_func("tbe.dsl.compute.util", "in_dynamic_and_static_unify")
     intr = func.__name__
 
     if intr == "sum":
@@ -312,8 +341,8 @@ def auto_cast_of_reduce(func, *args, **kwargs):
 
         # 1. reduce_max/min last v100 with priority_flag
         #    or v200, support float32
-        vcmax_support_fp32 = intrinsic_check_support("Intrinsic_vcmax",
-                                                     "float32")
+        support_table = _get_tbe_func("te.lang.cce.te_compute.util", "get_soc_support_table")()
+        vcmax_support_fp32 = support_table.check_intrinsic("Intrinsic_vcmax", "float32")
         support_fp32 = (vcmax_support_fp32 or priority_flag)
         if intr in ("reduce_max", "reduce_min") and \
                 is_last_axis and (not support_fp32):
@@ -341,9 +370,9 @@ def auto_cast_of_cast(func, *args, **kwargs):
     (On condition that the cast type is supported.
     If the cast type is not supported,raising a RuntimeError).
     '''
-    from tbe.dsl.compute.util import auto_cast_tensor
-    from tbe.dsl.compute.util import dsl_support_dtype
-    from tbe.dsl.compute.util import in_dynamic_and_static_unify
+    auto_cast_tensor = _get_tbe_func("tbe.dsl.compute.util", "auto_cast_tensor")
+    dsl_support_dtype = _get_tbe_func("tbe.dsl.compute.util", "dsl_support_dtype")
+    in_dynamic_and_static_unify = _get_tbe_func("tbe.dsl.compute.util", "in_dynamic_and_static_unify")
     if in_dynamic_and_static_unify():
         return func(*args, **kwargs)
     intr = func.__name__
@@ -33,9 +33,7 @@ from .util import auto_cast_tensor
 from .util import is_cast_support
 from .util import get_cast_type
 from .util import check_input_tensor_shape
-
-
-NAME_INDEX = [0]
+from .name_generator import next_name_index
 
 
 def _cast(raw_tensor, dst_dtype, is_auto_cast=True):
@@ -115,8 +113,7 @@ def _cast_op(input_tensor, output_dtype, op_type, is_auto_cast=True):
         dict_args = {"errCode": "E90003", "detailed_cause": f"operation {op_type} not support yet."}
         raise RuntimeError(dict_args, get_error_message(dict_args))
 
-    name = op_type.split("_")[-1] + "_" + str(NAME_INDEX[0])
-    NAME_INDEX[0] += 1
+    name = op_type.split("_")[-1] + "_" + str(next_name_index("cast_compute"))
 
     if not is_auto_cast:
         op_type = op_type + "|not_auto_cast"
@@ -17,10 +17,120 @@
 """
 cce diag function:we can use this function to build and generate llvm code on cpu
 """
+import time
+import hashlib
+from collections import OrderedDict
+
 import numpy as np
 from te import tvm
 from tbe.common.utils import shape_to_list
 
+# the recently built llvm modules, {sha256 of kernel name, tensors and lowered ir: module}
+_MODULE_CACHE = OrderedDict()
+MODULE_CACHE_SIZE = 32
+DEFAULT_RTOL = 1e-3
+US_PER_S = 1000000.0
+
+
+def _build(sch, tensor_list, kernel_name, print_ir, use_cache):
+    """
+    build the llvm module, the module of the same lowered ir and tensors is
+    built once while it is in the cache
+
+    Returns
+    -------
+    (module, True if the module is from cache)
+    """
+    lowered_ir = str(tvm.lower(sch, tensor_list, simple_mode=True))
+    if print_ir:
+        print(lowered_ir)
+    # the simple mode ir of an elementwise compute has no buffer dtype
+    tensor_descs = ["%s %s %s" % (tensor.op.name, tensor.dtype, shape_to_list(tensor.shape))
+                    for tensor in tensor_list]
+    ir_key = hashlib.sha256("\n".join([kernel_name] + tensor_descs + [lowered_ir]).encode()).hexdigest()
+    mod = _MODULE_CACHE.get(ir_key) if use_cache else None
+    if mod is not None:
+        _MODULE_CACHE.move_to_end(ir_key)
+        return mod, True
+    mod = tvm.build(sch, tensor_list, 'llvm', name=kernel_name)
+    if use_cache:
+        _MODULE_CACHE[ir_key] = mod
+        if len(_MODULE_CACHE) > MODULE_CACHE_SIZE:
+            _MODULE_CACHE.popitem(last=False)
+    return mod, False
+
+
+def clear_module_cache():
+    """
+    clear the built llvm modules
+    """
+    _MODULE_CACHE.clear()
+
+
+def _get_np_inputs(input_tensors, ref_input_func):
+    if ref_input_func is None:
+        return [np.random.uniform(size=shape_to_list(tensor.shape)).astype(tensor.dtype)
+                for tensor in input_tensors]
+    return ref_input_func(*input_tensors)
+
+
+def _check(np_outputs, np_inputs, ref_output_func, rtol):
+    """
+    check all outputs with the reference outputs, raise AssertionError if not close
+    """
+    if ref_output_func is None:
+        print(np_outputs)
+        return
+    ref_outputs = ref_output_func(*np_inputs)
+    if not isinstance(ref_outputs, (list, tuple)):
+        ref_outputs = [ref_outputs]
+    if len(ref_outputs) != len(np_outputs):
+        raise AssertionError('The reference output count %d is not the output count %d'
+                             % (len(ref_outputs), len(np_outputs)))
+    for index, (np_output, ref_output) in enumerate(zip(np_outputs, ref_outputs)):
+        np.testing.assert_allclose(np_output, ref_output, rtol=DEFAULT_RTOL if rtol is None else rtol,
+                                   err_msg='output %d' % index)
+    print('CHECK PASS')
+
+
+def _diag(input_tensors, output_tensors, config_map, np_inputs=None):
+    """
+    build, run and check the compute on cpu
+
+    Returns
+    -------
+    dict of cache_hit, build_seconds and mean_us, mean_us is None if not timed
+    """
+    ctx = tvm.context('llvm', 0)
+    if not ctx.exist:
+        raise RuntimeError('Only support diagnose on CPU now')
+    sch = tvm.create_schedule([x.op for x in output_tensors])
+    if not config_map.get("need_build", True):
+        if config_map.get("print_ir", True):
+            print(tvm.lower(sch, input_tensors + output_tensors, simple_mode=True))
+        return {"cache_hit": False, "build_seconds": None, "mean_us": None}
+    start_time = time.time()
+    mod, cache_hit = _build(sch, input_tensors + output_tensors, config_map.get("name", "cce_diag_op"),
+                            config_map.get("print_ir", True), config_map.get("use_cache", True))
+    build_seconds = time.time() - start_time
+
+    if np_inputs is None:
+        np_inputs = _get_np_inputs(input_tensors, config_map.get("ref_input_func"))
+    tvm_args = [tvm.nd.array(np_input, ctx) for np_input in np_inputs]
+    tvm_outputs = [tvm.nd.array(np.zeros(shape_to_list(tensor.shape), dtype=tensor.dtype), ctx)
+                   for tensor in output_tensors]
+    tvm_args += tvm_outputs
+    mod(*tvm_args)
+    _check([output.asnumpy() for output in tvm_outputs], np_inputs,
+           config_map.get("ref_output_func"), config_map.get("rtol"))
+
+    mean_us = None
+    if config_map.get("number", 0) > 0:
+        evaluator = mod.time_evaluator(mod.entry_name, ctx, number=config_map.get("number"),
+                                       repeat=config_map.get("repeat", 1))
+        mean_us = evaluator(*tvm_args).mean * US_PER_S
+    return {"cache_hit": cache_hit, "build_seconds": build_seconds, "mean_us": mean_us}
+
 
 def cce_diag(config_map=None):
     """
@@ -32,76 +142,90 @@ def cce_diag(config_map=None):
 
         key_words:
 
+            input_tensors : the input tensors
+
+            output_tensors : the output tensors, all of them are checked
+
             print_ir : if need print lower IR code, default is True
 
-            need_build : if need build, default is True
+            need_build : if need build, run and check, default is True
 
-            name : kernel name, default is cce_op
+            name : kernel name, default is cce_diag_op
 
             ref_input_func : the python reference input data function
 
-            ref_output_func : the python reference output data  function
+            ref_output_func : the python reference output data function,
+                              returns one output or a list of outputs
 
-            rtol : the relative tolerance
+            rtol : the relative tolerance, default is 1e-3
+
+            use_cache : if reuse the module of the same lowered IR, default is True
+
+            number : the run count of each time measure, default is 0 for no
+                     measure
+
+            repeat : the time measure count, default is 1
 
     Returns
     -------
-    None
+    dict of cache_hit, build_seconds and mean_us
     """
     # for pylint, otherwise "Dangerous default value {} as argument"
     if config_map is None:
         config_map = {}
 
-    def _build(sch, tensor_list, kernel_name='cce_diag_op'):
-        target = 'llvm'
-        mod = tvm.build(sch, tensor_list, target, name=kernel_name)
-        return mod
-
-    def _lower(sch, tensor_list):
-        print(tvm.lower(sch, tensor_list, simple_mode=True))
-
-    def _check(mod, input_tensors, output_tensors, ref_input_func, ref_output_func, rtol):
-        ctx = tvm.context('llvm', 0)
-        if not ctx.exist:
-            raise RuntimeError('Only support diagnose on CPU now')
-        np_inputs = []
-        tvm_inputs = []
-        tvm_outputs = []
-        if ref_input_func is None:
-            for tensor in input_tensors:
-                np_inputs.append(
-                    np.random.uniform(size=shape_to_list(tensor.shape)).astype(tensor.dtype))
-        else:
-            np_inputs = ref_input_func(*input_tensors)
-        for np_input in np_inputs:
-            tvm_inputs.append(tvm.nd.array(np_input, ctx))
+    return _diag(config_map["input_tensors"], config_map["output_tensors"], config_map)
 
 
-        for tensor in output_tensors:
-            tvm_outputs.append(
-                tvm.nd.array(np.zeros(shape_to_list(tensor.shape), dtype=tensor.dtype), ctx))
+def cce_diag_batch(compute_func, cases, config_map=None):
+    """
+    diagnose the compute of many shapes or input sets, the module of the same
+    lowered IR is built once. A failed case does not stop the others.
 
-        mod(*(tvm_inputs + tvm_outputs))
-        if ref_output_func is None:
-            print([output.asnumpy() for output in tvm_outputs])
-        else:
-            np_output = ref_output_func(*np_inputs)
-            if rtol is None:
-                np.testing.assert_allclose(tvm_outputs[0].asnumpy(), np_output, rtol=1e-3)
-            else:
-                np.testing.assert_allclose(tvm_outputs[0].asnumpy(), np_output, rtol=rtol)
-            print('CHECK PASS')
-
-    input_tensors = config_map["input_tensors"]
-    output_tensors = config_map["output_tensors"]
-    ref_input_func = config_map["ref_input_func"]
-    ref_output_func = config_map["ref_output_func"]
-    rtol = config_map["rtol"]
+    Parameters
+    ----------
+    compute_func : function of case args, returns (input_tensors, output_tensors)
 
-    sch = tvm.create_schedule([x.op for x in output_tensors])
-    if config_map["print_ir"]:
-        _lower(sch, input_tensors + output_tensors)
+    cases : list of case, the case is a tuple of args of compute_func, or a
+            dict of "args" and "inputs", the list of numpy inputs
 
-    mod = _build(sch, input_tensors + output_tensors, config_map["name"])
+    config_map : dict, the same as cce_diag without input_tensors and
+                 output_tensors, number is 10 and print_ir is False if not set
 
-    _check(mod, input_tensors, output_tensors, ref_input_func, ref_output_func, rtol)
+    Returns
+    -------
+    list of dict of args, passed, error, cache_hit, build_seconds and mean_us
+    """
+    if config_map is None:
+        config_map = {}
+    config_map = dict(config_map)
+    config_map.setdefault("number", 10)
+    config_map.setdefault("print_ir", False)
+    results = []
+    for case in cases:
+        if isinstance(case, dict):
+            case_args, np_inputs = tuple(case.get("args", ())), case.get("inputs")
+        else:
+            case_args, np_inputs = tuple(case), None
+        result = {"args": case_args, "passed": False, "error": None,
+                  "cache_hit": False, "build_seconds": None, "mean_us": None}
+        try:
+            input_tensors, output_tensors = compute_func(*case_args)
+            result.update(_diag(list(input_tensors), list(output_tensors), config_map, np_inputs))
+            result["passed"] = True
+        except Exception as error:  # the error of the case is reported in the table
+            result["error"] = "%s: %s" % (type(error).__name__, error)
+        finally:
+            pass
+        results.append(result)
+
+    print("%-40s %-6s %-6s %12s %12s" % ("args", "result", "cache", "build s", "run us"))
+    for result in results:
+        print("%-40s %-6s %-6s %12s %12s" % (
+            str(result.get("args")), "pass" if result.get("passed") else "fail",
+            "hit" if result.get("cache_hit") else "miss",
+            "-" if result.get("build_seconds") is None else "%.3f" % result.get("build_seconds"),
+            "-" if result.get("mean_us") is None else "%.2f" % result.get("mean_us")))
+        if result.get("error") is not None:
+            print("    %s" % result.get("error"))
+    return results
@@ -17,6 +17,7 @@ div compute
 """
 import warnings
 import math
+import threading
 
 from te import tvm
 from te.platform import cce_intrin as intrin
@@ -24,8 +25,11 @@ from te.platform import cce_params as param
 from te.platform import cce_util as util
 from te.platform import get_soc_spec
 
-OUTPUT_NAME_SUFFIX = [0]
-UB_NAME_SUFFIX = [0]
+from .name_generator import next_name_index
+
+# the ub scopes are shared by the op builds of all threads, the scope is
+# checked and registered under the lock
+_DECL_MEMORY_LOCK = threading.Lock()
 
 
 def compute_four2five(input_tensor, raw_shape_4D):
@@ -56,13 +60,13 @@ def convert_4d_to_5d_for_davinci(input_tensor, raw_shape_4D):
     """
     shape_n, shape_c, shape_h, shape_w = raw_shape_4D
     shape_c1 = (shape_c + 16 - 1) // 16
-    OUTPUT_NAME_SUFFIX[0] += 1
+    output_name_suffix = next_name_index("dim_conv_output") + 1
     return tvm.extern([(shape_n, shape_c1, shape_h, shape_w, 16)],
                       [input_tensor],
                       lambda ins, outs: _four2five_ir(ins[0], raw_shape_4D,
                                                       outs[0]),
                       dtype=[input_tensor.dtype],
-                      name="output_" + hex(OUTPUT_NAME_SUFFIX[0]))
+                      name="output_" + hex(output_name_suffix))
 
 
 def convert_4d_to_5d_for_protogenes(input_tensor, raw_shape_4D):
@@ -121,12 +125,12 @@ def convert_5d_to_4d_for_davinci(input_tensor, raw_shape_4D):
     convert 5d to 4d for DaVinci
     """
     shape_n, shape_c, shape_h, shape_w = raw_shape_4D
-    OUTPUT_NAME_SUFFIX[0] += 1
+    output_name_suffix = next_name_index("dim_conv_output") + 1
     return tvm.extern([(shape_n, shape_c, shape_h, shape_w)], [input_tensor],
                       lambda ins, outs: _five2four_ir(ins[0], raw_shape_4D,
                                                       outs[0]),
                       dtype=[input_tensor.dtype],
-                      name="output_" + hex(OUTPUT_NAME_SUFFIX[0]))
+                      name="output_" + hex(output_name_suffix))
 
 
 def convert_5d_to_4d_for_protogenes(input_tensor, raw_shape_4D):
@@ -149,23 +153,26 @@ def _decl_memory(buffer_scope):
     :return:
         type: node
     '''
-    func = tvm.get_global_func("tvm.info.mem.%s" % buffer_scope, True)
-    if func is not None:
-        return
-    # pylint: disable=protected-access, unused-variable
-    try:
-        @tvm.register_func("tvm.info.mem.%s" % buffer_scope)
-        def mem_info_ub_buffer():
-            return tvm.make.node("MemoryInfo",
-                                 unit_bits=32*8,
-                                 max_simd_bits=32*8,
-                                 max_num_bits=get_soc_spec("UB_SIZE")*8,
-                                 head_address=tvm.const(0, 'int32'))
-    except tvm._ffi.base.TVMError:
-        raise RuntimeError("declare memory failed!")
-
-
-def _allocate_ub(ib_expr, dtype, size, name):
+    with _DECL_MEMORY_LOCK:
+        func = tvm.get_global_func("tvm.info.mem.%s" % buffer_scope, True)
+        if func is not None:
+            return
+        # pylint: disable=protected-access, unused-variable
+        try:
+            @tvm.register_func("tvm.info.mem.%s" % buffer_scope)
+            def mem_info_ub_buffer():
+                return tvm.make.node("MemoryInfo",
+                                     unit_bits=32*8,
+                                     max_simd_bits=32*8,
+                                     max_num_bits=get_soc_spec("UB_SIZE")*8,
+                                     head_address=tvm.const(0, 'int32'))
+        except tvm._ffi.base.TVMError:
+            # it may be registered by the other module out of the lock
+            if tvm.get_global_func("tvm.info.mem.%s" % buffer_scope, True) is None:
+                raise RuntimeError("declare memory failed!")
+
+
+def _allocate_ub(ib_expr, dtype, size, name, ub_name_suffix):
     '''
     :param ib:
         desc: instance of ir_builder
@@ -178,6 +185,9 @@ def _allocate_ub(ib_expr, dtype, size, name):
     :param name:
         type: string
         desc: the name of allocated ub
+    :param ub_name_suffix:
+        type: int
+        desc: the suffix of ub scope, the same in one ir
     :return:
         desc: ub buffer
     '''
@@ -185,8 +195,8 @@ def _allocate_ub(ib_expr, dtype, size, name):
     # dtype: data type
     # size: buf size
     # name: buf name. Node suffix name must bu "local.UB"
-    name = name + ".local.UB" + hex(UB_NAME_SUFFIX[0])
-    scope = "local.UB" + hex(UB_NAME_SUFFIX[0])
+    name = name + ".local.UB" + hex(ub_name_suffix)
+    scope = "local.UB" + hex(ub_name_suffix)
     _decl_memory(scope)
     buf_var = ib_expr.allocate(dtype, (size,), name, scope=scope)
     return tvm.decl_buffer((size,), dtype, name, scope=scope, data=buf_var)
@@ -361,11 +371,11 @@ def _four2five_ir(input_tensor, shape_4d, output):
     vnchwconv_cube_col_size = vnchwconv_cube_buf_max // shape_c0
 
     ib_expr = tvm.ir_builder.create()
-    UB_NAME_SUFFIX[0] += 1
+    ub_name_suffix = next_name_index("dim_conv_ub") + 1
     input_ub = _allocate_ub(ib_expr, input_tensor.dtype, vnchwconv_cube_buf_max,
-                            "input_ub")
+                            "input_ub", ub_name_suffix)
     output_ub = _allocate_ub(ib_expr, output.dtype, vnchwconv_cube_buf_max,
-                             "output_ub")
+                             "output_ub", ub_name_suffix)
     addr_array = ib_expr.allocate("uint64", (32,), name="addr_array",
                                   scope=param.scope_reg)
     addr_array_buf = tvm.decl_buffer((32,), "uint64_t", "addr_array_buf",
@@ -541,11 +551,11 @@ def _five2four_ir(input_tensor, shape_4d, output):
     vnchwconv_cube_col_size = vnchwconv_cube_buf_max // shape_c0
 
     ib_expr = tvm.ir_builder.create()
-    UB_NAME_SUFFIX[0] += 1
+    ub_name_suffix = next_name_index("dim_conv_ub") + 1
     input_ub = _allocate_ub(ib_expr, input_tensor.dtype,
-                            vnchwconv_cube_buf_max, "input_ub")
+                            vnchwconv_cube_buf_max, "input_ub", ub_name_suffix)
     output_ub = _allocate_ub(ib_expr, output.dtype, vnchwconv_cube_buf_max,
-                             "output_ub")
+                             "output_ub", ub_name_suffix)
     addr_array = ib_expr.allocate("uint64", (32,), name="addr_array",
                                   scope=param.scope_reg)
     addr_array_buf = tvm.decl_buffer((32,), "uint64_t", "addr_array_buf",
@@ -570,7 +580,7 @@ def _five2four_ir(input_tensor, shape_4d, output):
 
     if hw_tail_size != 0 and hw_tail_size % shape_c0 != 0 and buf_cube_range > 1:
         output_head_ub = _allocate_ub(ib_expr, output.dtype, shape_c0*shape_c0,
-                                      "output_head_ub")
+                                      "output_head_ub", ub_name_suffix)
 
     def _five2four_intrin(ib_expr, c0_loop, c1_begin, c1_end):
         """
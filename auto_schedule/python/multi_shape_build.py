@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Copyright 2019-2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+multi shape build: build a dsl compute for many shape and dtype configurations
+in a process pool. Each configuration is built in its own directory, so the
+kernel_meta directories are isolated. The configurations with the same lowered
+IR are built once, the built kernels are recorded in a cache file in the
+output directory and reused by later builds with the same soc version and te
+version.
+"""
+import os
+import json
+import time
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+BUILD_CACHE_FILE = "build_cache.json"
+KERNEL_META_DIR = "kernel_meta"
+KERNEL_FILE_SUFFIX = ".o"
+STATUS_BUILT = "built"
+STATUS_CACHED = "cached"
+STATUS_FAILED = "failed"
+
+
+def _create_compute(compute_func, config):
+    """
+    create the compute and schedule of the configuration, the names are
+    counted in a new name scope, so the same configuration gets the same IR
+    """
+    import te.lang.cce as api
+    from te.lang.cce.te_compute.name_generator import name_scope
+    with name_scope():
+        input_tensors, output_tensors = compute_func(**config)
+    input_tensors = list(input_tensors)
+    output_tensors = list(output_tensors)
+    sch = api.auto_schedule(output_tensors)
+    return sch, input_tensors + output_tensors
+
+
+def _get_te_version():
+    """
+    get the version of the installed te, the path and modified time of the
+    te package if it has no version
+    """
+    import te
+    try:
+        from importlib import metadata
+        return metadata.version("te")
+    except ImportError:
+        te_file = os.path.realpath(te.__file__)
+        return getattr(te, "__version__", None) or "%s %d" % (te_file, os.path.getmtime(te_file))
+    finally:
+        pass
+
+
+def _lower_config(compute_func, config):
+    """
+    get the build key of the configuration, it is the sha256 of the soc
+    version, te version and lowered IR, run in the worker process
+    :return: (build key, error message)
+    """
+    from te import tvm
+    from te.platform import get_soc_spec
+    try:
+        sch, tensor_list = _create_compute(compute_func, config)
+        lowered_ir = str(tvm.lower(sch, tensor_list, simple_mode=True))
+    except Exception as error:  # the error of user compute is reported in the table
+        return None, "%s: %s" % (type(error).__name__, error)
+    finally:
+        pass
+    build_info = "\n".join([get_soc_spec("SOC_VERSION"), _get_te_version(), lowered_ir])
+    return hashlib.sha256(build_info.encode()).hexdigest(), None
+
+
+def _build_config(compute_func, config, kernel_name, build_dir):
+    """
+    build the configuration in build_dir, run in the worker process
+    :return: (compile seconds, kernel size, error message)
+    """
+    import te.lang.cce as api
+    os.makedirs(build_dir, exist_ok=True)
+    current_dir = os.getcwd()
+    start_time = time.time()
+    try:
+        # cce_build_code writes kernel_meta in the current directory
+        os.chdir(build_dir)
+        sch, tensor_list = _create_compute(compute_func, config)
+        api.cce_build_code(sch, {"print_ir": False, "name": kernel_name,
+                                 "tensor_list": tensor_list})
+    except Exception as error:  # the error of user compute is reported in the table
+        return time.time() - start_time, None, "%s: %s" % (type(error).__name__, error)
+    finally:
+        os.chdir(current_dir)
+    compile_seconds = time.time() - start_time
+    kernel_path = os.path.join(build_dir, KERNEL_META_DIR, kernel_name + KERNEL_FILE_SUFFIX)
+    if not os.path.isfile(kernel_path):
+        return compile_seconds, None, "%s is not generated" % kernel_path
+    return compile_seconds, os.path.getsize(kernel_path), None
+
+
+def _load_build_cache(cache_path):
+    try:
+        with open(cache_path) as cache_file:
+            build_cache = json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+    finally:
+        pass
+    # the kernel may be deleted after it is cached
+    return {build_key: item for build_key, item in build_cache.items()
+            if isinstance(item, dict) and os.path.isfile(item.get("kernel_path", ""))}
+
+
+def _save_build_cache(cache_path, build_cache):
+    tmp_cache_path = "%s.%d.tmp" % (cache_path, os.getpid())
+    with open(tmp_cache_path, "w") as cache_file:
+        json.dump(build_cache, cache_file, indent=4)
+    os.replace(tmp_cache_path, cache_path)
+
+
+def print_build_table(results):
+    """
+    print the result table of build_multi_shape
+    """
+    print("%-6s %-40s %-8s %12s %12s  %s" % ("index", "kernel", "status", "compile s", "kernel B", "config"))
+    for result in results:
+        print("%-6d %-40s %-8s %12s %12s  %s" % (
+            result.get("index"), result.get("kernel_name"), result.get("status"),
+            "-" if result.get("compile_seconds") is None else "%.2f" % result.get("compile_seconds"),
+            "-" if result.get("kernel_size") is None else result.get("kernel_size"),
+            result.get("config") if result.get("error") is None else result.get("error")))
+
+
+# 'pylint: disable=too-many-locals
+def build_multi_shape(compute_func, configs, output_dir, kernel_name_prefix="cce_op", jobs=0):
+    """
+    build the dsl compute for each configuration in a process pool
+
+    Parameters
+    ----------
+    compute_func : function
+        compute_func(**config) returns (input_tensors, output_tensors), it
+        must be defined at module level to run in the worker process
+
+    configs : list of dict
+        the shape and dtype configurations, like [{"shape": [16, 16], "dtype": "float16"}]
+
+    output_dir : str
+        the configuration i is built in output_dir/<kernel_name_prefix>_<i>
+
+    kernel_name_prefix : str
+        the kernel name of configuration i is <kernel_name_prefix>_<i>
+
+    jobs : int
+        the worker count, default is the cpu count
+
+    Returns
+    -------
+    list of dict of index, config, kernel_name, status, compile_seconds,
+    kernel_size, kernel_path, build_key and error. The status is built, cached
+    or failed. The cached configuration reuses the kernel of the built
+    configuration with the same build key, its kernel_name and kernel_path
+    are the ones of the built kernel, the entry of the kernel is named by
+    the kernel_name.
+    """
+    output_dir = os.path.realpath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    cache_path = os.path.join(output_dir, BUILD_CACHE_FILE)
+    build_cache = _load_build_cache(cache_path)
+    results = [{"index": index, "config": config,
+                "kernel_name": "%s_%d" % (kernel_name_prefix, index),
+                "status": STATUS_FAILED, "compile_seconds": None, "kernel_size": None,
+                "kernel_path": None, "build_key": None, "error": None}
+               for index, config in enumerate(configs)]
+
+    # tvm is not safe to fork after it is initialized, the workers are spawned
+    with ProcessPoolExecutor(max_workers=jobs if jobs else os.cpu_count(),
+                             mp_context=multiprocessing.get_context("spawn")) as executor:
+        lower_futures = [executor.submit(_lower_config, compute_func, config) for config in configs]
+        build_results = {}
+        for result, future in zip(results, lower_futures):
+            result["build_key"], result["error"] = future.result()
+            build_key = result.get("build_key")
+            if build_key is None or build_key in build_cache or build_key in build_results:
+                continue
+            build_dir = os.path.join(output_dir, result.get("kernel_name"))
+            build_results[build_key] = (result, executor.submit(
+                _build_config, compute_func, result.get("config"), result.get("kernel_name"), build_dir))
+
+        for build_key, (result, future) in build_results.items():
+            result["compile_seconds"], result["kernel_size"], result["error"] = future.result()
+            if result.get("error") is not None:
+                continue
+            result["status"] = STATUS_BUILT
+            result["kernel_path"] = os.path.join(output_dir, result.get("kernel_name"), KERNEL_META_DIR,
+                                                 result.get("kernel_name") + KERNEL_FILE_SUFFIX)
+            build_cache[build_key] = {"kernel_name": result.get("kernel_name"),
+                                    "kernel_path": result.get("kernel_path"),
+                                    "kernel_size": result.get("kernel_size"),
+                                    "compile_seconds": result.get("compile_seconds")}
+
+    for result in results:
+        if result.get("status") == STATUS_BUILT or result.get("build_key") is None:
+            continue
+        cached = build_cache.get(result.get("build_key"))
+        if cached is None:
+            built_result = build_results.get(result.get("build_key"))[0]
+            if built_result is not result:
+                result["error"] = "the same IR as %s failed to build" % built_result.get("kernel_name")
+            continue
+        result["status"] = STATUS_CACHED
+        result["kernel_name"] = cached.get("kernel_name")
+        result["kernel_size"] = cached.get("kernel_size")
+        result["kernel_path"] = cached.get("kernel_path")
+        result["compile_seconds"] = 0.0
+    _save_build_cache(cache_path, build_cache)
+    print_build_table(results)
+    return results
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Copyright 2019-2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+name generator of the tensors and buffers in dsl graph construction
+"""
+import threading
+from contextlib import contextmanager
+
+# the name generators of the op builds in current thread
+_LOCAL = threading.local()
+
+
+class NameGenerator:
+    """
+    The counters of name indexes, there is one counter for each kind of name.
+    """
+
+    def __init__(self):
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def next_index(self, kind):
+        """
+        get the next index of the kind, it starts from 0
+        """
+        with self._lock:
+            index = self._counters.get(kind, 0)
+            self._counters[kind] = index + 1
+        return index
+
+
+# used out of name_scope, it is shared by all threads
+_PROCESS_NAME_GENERATOR = NameGenerator()
+
+
+def _get_scope_stack():
+    stack = getattr(_LOCAL, "stack", None)
+    if stack is None:
+        stack = []
+        _LOCAL.stack = stack
+    return stack
+
+
+@contextmanager
+def name_scope():
+    """
+    the scope of one op build in current thread, the names in it are counted
+    from 0, so they do not depend on the other op builds. The nested scope
+    keeps counting in the outer scope, because they build the same graph.
+    """
+    stack = _get_scope_stack()
+    stack.append(stack[-1] if stack else NameGenerator())
+    try:
+        yield stack[-1]
+    finally:
+        stack.pop()
+
+
+def next_name_index(kind):
+    """
+    get the next name index of the kind in current op build, the index is
+    unique in the process if it is not in name_scope
+    :param kind: the kind of name, like "cast"
+    :return: int
+    """
+    stack = _get_scope_stack()
+    name_generator = stack[-1] if stack else _PROCESS_NAME_GENERATOR
+    return name_generator.next_index(kind)
@@ -17,6 +17,8 @@
 """
 common function
 """
+from collections import namedtuple
+
 P_NONE = "pattern_none"
 
 # 'pylint: disable=invalid-name
@@ -484,3 +486,91 @@ layernorm_width = {"layernorm_fp16_1980": 7.9,
 
 no_buffer_reused = ["l2_normalize_grad_fp16_1980",
                     "l2_normalize_grad_fp32_1980"]
+
+# the tag sequences of bn_update_bert_target are matched by this name
+BN_UPDATE_BERT_TARGET = "bn_update_bert_target"
+
+# the matched pattern and its properties, width and layernorm_width are None
+# if not defined
+PatternInfo = namedtuple("PatternInfo", ["name", "width", "layernorm_width", "no_buffer_reused"])
+
+
+class PatternIndex:
+    """
+    The index of the fused op tag sequences. The whole sequence is matched by
+    the hash of its tag tuple, the prefix is matched by a trie of tags.
+    """
+    # the key of the pattern info in the trie node, it is never a tag
+    _END = None
+
+    def __init__(self, patterns):
+        """
+        :param patterns: list of (pattern name, tag sequence), the first
+                         pattern is kept if the sequences are the same
+        """
+        self._sequences = {}
+        self._trie = {}
+        for name, tags in patterns:
+            tags = tuple(tags)
+            if tags in self._sequences:
+                continue
+            info = PatternInfo(name, width.get(name), layernorm_width.get(name),
+                               name in no_buffer_reused)
+            self._sequences[tags] = info
+            node = self._trie
+            for tag in tags:
+                node = node.setdefault(tag, {})
+            node[self._END] = info
+
+    def __len__(self):
+        return len(self._sequences)
+
+    def match(self, tags):
+        """
+        match the whole tag sequence
+        :param tags: the tag sequence of the compute graph
+        :return: PatternInfo, None if not matched
+        """
+        return self._sequences.get(tuple(tags))
+
+    def match_prefix(self, tags):
+        """
+        match the longest pattern which the tag sequence starts with
+        :param tags: the tag sequence of the compute graph
+        :return: PatternInfo, None if not matched
+        """
+        info = None
+        node = self._trie
+        for tag in tags:
+            node = node.get(tag)
+            if node is None:
+                break
+            info = node.get(self._END, info)
+        return info
+
+    def is_prefix(self, tags):
+        """
+        check the tag sequence is the prefix of any pattern, the graph
+        traversal can stop early if not
+        :param tags: the tag sequence of the compute graph
+        :return: bool
+        """
+        node = self._trie
+        for tag in tags:
+            node = node.get(tag)
+            if node is None:
+                return False
+        return True
+
+
+PATTERN_INDEX = PatternIndex(
+    list(data.items()) + [(BN_UPDATE_BERT_TARGET, tags) for tags in bn_update_bert_target])
+
+
+def match_pattern(tags):
+    """
+    match the tag sequence of the compute graph with all patterns in one lookup
+    :param tags: the tag sequence of the compute graph
+    :return: PatternInfo, None if not matched
+    """
+    return PATTERN_INDEX.match(tags)
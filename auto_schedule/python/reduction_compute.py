@@ -33,8 +33,7 @@ from ..api import reduce_prod
 from .util import refine_axis
 from .util import is_cast_support
 from .util import check_input_tensor_shape
-
-NAME_INDEX = [0]
+from .name_generator import next_name_index
 
 
 @decorator
@@ -187,8 +186,7 @@ def _tuple_reduce_op(input_tensor_list, axis, in_op, keepdims=False):
         if not res_reshape:
             res_reshape.append(1)
 
-        name = "reduce_" + str(NAME_INDEX[0])
-        NAME_INDEX[0] += 1
+        name = "reduce_" + str(next_name_index("reduce"))
 
         reduce_res = tvm.compute(res_reshape, compute_func, name=name)
         return reduce_res
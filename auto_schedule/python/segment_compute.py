@@ -17,7 +17,10 @@
 """
 segment compute
 """
+import hashlib
+import threading
 import warnings
+from collections import OrderedDict
 
 from te import tvm
 from te.utils.shape_util import shape_to_list
@@ -28,6 +31,18 @@ from .elewise_compute import __binary_elewise_op
 from .util import dtype_check_decorator
 from .util import check_input_tensor_shape
 
+# the default limit of enable_segment_ids_digest
+SEGMENT_TAG_IDS_LIMIT = 256
+# the count of the long segment ids kept for their digests
+SEGMENT_IDS_CACHE_SIZE = 64
+_SEGMENT_IDS_PREFIX = "#"
+# the digest is opt-in, the segment schedule which parses the ids of the tag
+# by int() must call get_segment_ids before it is enabled
+_SEGMENT_IDS_DIGEST = {"limit": None}
+# {digest of segment ids: segment ids}, the least recently used is dropped
+_SEGMENT_IDS = OrderedDict()
+_SEGMENT_IDS_LOCK = threading.Lock()
+
 
 @source_info_decorator()
 @dtype_check_decorator
@@ -157,6 +172,80 @@ def unsorted_segment_max(tensor, segment_ids, num_segments, init_value=0):
                         init_value, tensor.dtype, "segment_max")
 
 
+def _group_segment_ids(segment_ids, num_segments):
+    """
+    group the rows by segment id in one pass, the rows of segment i are
+    order[offsets[i]:offsets[i + 1]] in ascending order, the negative ids
+    are skipped
+    """
+    offsets = [0] * (num_segments + 1)
+    for segment_id in segment_ids:
+        if segment_id >= 0:
+            offsets[segment_id + 1] += 1
+    for i in range(num_segments):
+        offsets[i + 1] += offsets[i]
+    order = [0] * offsets[-1]
+    cursors = offsets[:-1]
+    for row, segment_id in enumerate(segment_ids):
+        if segment_id >= 0:
+            order[cursors[segment_id]] = row
+            cursors[segment_id] += 1
+    return order, offsets
+
+
+def enable_segment_ids_digest(limit=SEGMENT_TAG_IDS_LIMIT):
+    """
+    carry the digest in the segment_op|ids|num|init tag for the segment ids
+    longer than limit, the segment schedule must read the ids of the tag by
+    get_segment_ids. The digests of the last SEGMENT_IDS_CACHE_SIZE long ids
+    are kept in the process.
+    :param limit: None to serialize all ids into the tag, it is the default
+    """
+    _SEGMENT_IDS_DIGEST["limit"] = limit
+
+
+def _get_tag_segment_ids(segment_ids):
+    """
+    get the segment ids part of the tag, the long ids are replaced by digest
+    if enable_segment_ids_digest is called
+    """
+    str_segment_ids = ",".join([str(i) for i in segment_ids])
+    limit = _SEGMENT_IDS_DIGEST.get("limit")
+    if limit is None or len(segment_ids) <= limit:
+        return str_segment_ids
+    digest = _SEGMENT_IDS_PREFIX + hashlib.sha256(str_segment_ids.encode()).hexdigest()
+    with _SEGMENT_IDS_LOCK:
+        _SEGMENT_IDS[digest] = list(segment_ids)
+        _SEGMENT_IDS.move_to_end(digest)
+        while len(_SEGMENT_IDS) > SEGMENT_IDS_CACHE_SIZE:
+            _SEGMENT_IDS.popitem(last=False)
+    return digest
+
+
+def get_segment_ids(str_segment_ids):
+    """
+    get the segment ids from the segment ids part of the tag
+
+    Parameters
+    ----------
+    str_segment_ids : str
+        the ids joined by comma, or the digest of long ids
+
+    Returns
+    -------
+    list : segment ids
+    """
+    if str_segment_ids.startswith(_SEGMENT_IDS_PREFIX):
+        with _SEGMENT_IDS_LOCK:
+            segment_ids = _SEGMENT_IDS.get(str_segment_ids)
+            if segment_ids is not None:
+                _SEGMENT_IDS.move_to_end(str_segment_ids)
+        if segment_ids is None:
+            raise RuntimeError("segment ids of %s is not found" % str_segment_ids)
+        return list(segment_ids)
+    return [int(i) for i in str_segment_ids.split(",")]
+
+
 # 'pylint: disable=too-many-arguments, unused-argument
 def __segment_tensor_op(tensor, segment_ids, num_segments, init_value, output_dtype, segment_op):
     """
@@ -216,43 +305,36 @@ def __segment_op(tensor, segment_ids, num_segments, init_value, output_dtype, se
     if not isinstance(init_value, (int, float)):
         raise RuntimeError("the type of init_value must be int or float")
 
+    def __reduce_rows(rows, indices):
+        # fold the rows in the order of segment_ids
+        tmp = tensor[(rows[0],) + indices[1:]].astype(output_dtype)
+        for row in rows[1:]:
+            row_data = tensor[(row,) + indices[1:]].astype(output_dtype)
+            if segment_op in ["segment_sum", "segment_mean"]:
+                tmp = row_data + tmp
+            elif segment_op == "segment_prod":
+                tmp = row_data*tmp
+            elif segment_op == "segment_min":
+                tmp = tvm.min(row_data, tmp)
+            elif segment_op == "segment_max":
+                tmp = tvm.max(row_data, tmp)
+            else:
+                raise RuntimeError("operation %s not support yet" % segment_op)
+        if segment_op == "segment_mean":
+            tmp = tmp / tvm.const(len(rows), output_dtype)
+        return tmp
+
     def __segment_compute(indices):
         """compute_func of unsorted segment mean arithmetic operator
 
         """
-        unique_id = []
-        for i in segment_ids:
-            if i not in unique_id:
-                unique_id.append(i)
-
-        def __compute_outer_dim(i):
-            new_segment_id = list(segment_ids)[:]
-            if i in unique_id:
-                idx = new_segment_id.index(i)
-                new_segment_id[idx] = -1
-                tmp = tensor[(idx,) + indices[1:]].astype(output_dtype)
-                for _ in range(segment_ids.count(i) - 1):
-                    new_segment_id[idx] = -1
-                    idx = new_segment_id.index(i)
-                    if segment_op in ["segment_sum", "segment_mean"]:
-                        tmp = tensor[(idx,) + indices[1:]].astype(output_dtype) + tmp
-                    elif segment_op == "segment_prod":
-                        tmp = tensor[(idx,) + indices[1:]].astype(output_dtype)*tmp
-                    elif segment_op == "segment_min":
-                        tmp = tvm.min(tensor[(idx,) + indices[1:]].astype(output_dtype), tmp)
-                    elif segment_op == "segment_max":
-                        tmp = tvm.max(tensor[(idx,) + indices[1:]].astype(output_dtype), tmp)
-                    else:
-                        raise RuntimeError("operation %s not support yet" % segment_op)
-                if segment_op == "segment_mean":
-                    tmp = tmp / tvm.const(segment_ids.count(i), output_dtype)
-            else:
-                tmp = tvm.const(init_value, tensor.dtype)
-            return tmp
-
-        res = __compute_outer_dim(0)
-        for i in range(num_segments)[1:]:
-            res = tvm.select(indices[0] == i, __compute_outer_dim(i), res)
+        order, offsets = _group_segment_ids(segment_ids, num_segments)
+        # the segments without rows are init_value
+        res = tvm.const(init_value, tensor.dtype)
+        for i in range(num_segments):
+            if offsets[i] < offsets[i + 1]:
+                res = tvm.select(indices[0] == i,
+                                 __reduce_rows(order[offsets[i]:offsets[i + 1]], indices), res)
         return res
 
     shape = shape_to_list(tensor.shape)
@@ -293,7 +375,7 @@ def __segment_op(tensor, segment_ids, num_segments, init_value, output_dtype, se
     else:
         lambda_func = lambda *indices: __segment_compute(indices)
         shape[0] = num_segments
-        str_segment_ids = ",".join([str(i) for i in segment_ids])
+        str_segment_ids = _get_tag_segment_ids(segment_ids)
         with tvm.tag_scope(
                 segment_op + "|" + str_segment_ids + "|"
                 + str(num_segments) + "|" + str(init_value)):
@@ -21,6 +21,7 @@ util
 from decorator import decorator
 from te import tvm
 from te.platform import intrinsic_check_support
+from te.platform import get_soc_spec
 from te.platform.cce_conf import VERSION_CLOUD
 from te.platform.cce_conf import VERSION_MINI
 from te.platform.cce_conf import VERSION_SHISI
@@ -596,6 +597,111 @@ UNIFY_DSL_CHECK_SUPPORT_MAP = {
 }
 
 
+# the support table of each soc, {(soc version, core type): SocSupportTable}
+_SOC_SUPPORT_TABLES = {}
+
+
+def _get_soc_support_dtype(all_support_dtype, soc_ver):
+    soc_support_dtype = all_support_dtype.get(soc_ver)
+    if soc_support_dtype is None:
+        soc_support_dtype = all_support_dtype.get("AllSoc")
+    return soc_support_dtype
+
+
+def _get_dsl_name(dsl_name):
+    if dsl_name in ("reduce_sum", "sum"):
+        return "reduce_sum"
+    if dsl_name in ("round_half_up", "round_d"):
+        return "round_d"
+    return dsl_name
+
+
+class SocSupportTable:
+    """
+    The intrinsic and dtype support of one soc. The dsl support dtypes are
+    resolved when the table is built, the intrinsic and cast support are
+    resolved once on first use.
+    """
+
+    def __init__(self, soc_key):
+        self.soc_key = soc_key
+        soc_ver = pver().get_product_version()
+        # {(dsl name, is unify): (support dtype tuple, support dtype set)}
+        self.dsl_dtypes = {}
+        unify_check_support_map = dict(DSL_CHECK_SUPPORT_MAP)
+        unify_check_support_map.update(UNIFY_DSL_CHECK_SUPPORT_MAP)
+        for is_unify, check_support_map in ((False, DSL_CHECK_SUPPORT_MAP),
+                                            (True, unify_check_support_map)):
+            for dsl_name, all_support_dtype in check_support_map.items():
+                soc_support_dtype = _get_soc_support_dtype(all_support_dtype, soc_ver)
+                if soc_support_dtype is not None:
+                    self.dsl_dtypes[(dsl_name, is_unify)] = (
+                        tuple(soc_support_dtype), frozenset(soc_support_dtype))
+        # {(intrinsic, dtype): bool}
+        self.intrinsics = {}
+        # {(src dtype, dst dtype): bool}
+        self.casts = {}
+
+    def check_intrinsic(self, intrinsic, dtype=""):
+        """
+        check the intrinsic supports the dtype
+        """
+        is_support = self.intrinsics.get((intrinsic, dtype))
+        if is_support is None:
+            is_support = bool(intrinsic_check_support(intrinsic, dtype))
+            self.intrinsics[(intrinsic, dtype)] = is_support
+        return is_support
+
+    def is_cast_support(self, src_type, dst_type):
+        """
+        check the cast from src_type to dst_type is supported
+        """
+        if src_type == dst_type:
+            return True
+        is_support = self.casts.get((src_type, dst_type))
+        if is_support is None:
+            cast_type = get_cast_type(src_type, dst_type)
+            # Default round mode set as 'z'
+            is_support = self.check_intrinsic("Intrinsic_vconv", cast_type) or \
+                self.check_intrinsic("Intrinsic_vconv", cast_type + "z")
+            self.casts[(src_type, dst_type)] = is_support
+        return is_support
+
+    def get_dsl_dtypes(self, dsl_name):
+        """
+        get the (support dtype tuple, support dtype set) of the dsl
+        :return: None if the dsl is not supported
+        """
+        return self.dsl_dtypes.get((_get_dsl_name(dsl_name), in_dynamic_and_static_unify()))
+
+
+def get_soc_support_table():
+    """
+    get the support table of the current soc, the table is built once for
+    each soc version and core type, so setting another soc gets another table
+    """
+    soc_key = (get_soc_spec("SOC_VERSION"), get_soc_spec("AICORE_TYPE"))
+    support_table = _SOC_SUPPORT_TABLES.get(soc_key)
+    if support_table is None:
+        support_table = SocSupportTable(soc_key)
+        _SOC_SUPPORT_TABLES[soc_key] = support_table
+    return support_table
+
+
+def clear_soc_support_table():
+    """
+    clear the support tables, used when the soc spec is changed in place
+    """
+    _SOC_SUPPORT_TABLES.clear()
+
+
+def check_intrinsic_support(intrinsic, dtype=""):
+    """
+    the same as intrinsic_check_support, the result is resolved once per soc
+    """
+    return get_soc_support_table().check_intrinsic(intrinsic, dtype)
+
+
 def dsl_support_dtype(dsl_name):
     """
     dsl_support_dtype
@@ -603,27 +709,12 @@ def dsl_support_dtype(dsl_name):
     if not isinstance(dsl_name, str):
         return []
 
-    if dsl_name in ("reduce_sum", "sum"):
-        dsl_name = "reduce_sum"
-    if dsl_name in ("round_half_up", "round_d"):
-        dsl_name = "round_d"
-
-    if in_dynamic_and_static_unify() and dsl_name in UNIFY_DSL_CHECK_SUPPORT_MAP:
-        all_support_dtype = UNIFY_DSL_CHECK_SUPPORT_MAP.get(dsl_name)
-    else:
-        all_support_dtype = DSL_CHECK_SUPPORT_MAP.get(dsl_name)
-
-    if all_support_dtype is None:
+    dsl_dtypes = get_soc_support_table().get_dsl_dtypes(dsl_name)
+    if dsl_dtypes is None:
         return []
 
-    soc_ver = pver().get_product_version()
-    soc_support_dtype = all_support_dtype.get(soc_ver)
-    if soc_support_dtype is None:
-        soc_support_dtype = all_support_dtype.get("AllSoc")
-        if soc_support_dtype is None:
-            return []
-
-    return list(soc_support_dtype)
+    # a new list, the callers may append to it
+    return list(dsl_dtypes[0])
 
 
 def dsl_check_support(dsl_api, dtype=None):
@@ -635,28 +726,11 @@ def dsl_check_support(dsl_api, dtype=None):
     if (dtype is not None) and (not isinstance(dtype, str)):
         return False
 
-    dsl_name = dsl_api.split("te.lang.cce.")[-1]
-    if dsl_name in ("reduce_sum", "sum"):
-        dsl_name = "reduce_sum"
-    if dsl_name in ("round_half_up", "round_d"):
-        dsl_name = "round_d"
-
-    if in_dynamic_and_static_unify() and dsl_name in UNIFY_DSL_CHECK_SUPPORT_MAP:
-        all_support_dtype = UNIFY_DSL_CHECK_SUPPORT_MAP.get(dsl_name)
-    else:
-        all_support_dtype = DSL_CHECK_SUPPORT_MAP.get(dsl_name)
-
-    if all_support_dtype is None:
+    dsl_dtypes = get_soc_support_table().get_dsl_dtypes(dsl_api.split("te.lang.cce.")[-1])
+    if dsl_dtypes is None:
         return False
 
-    soc_ver = pver().get_product_version()
-    soc_support_dtype = all_support_dtype.get(soc_ver)
-    if soc_support_dtype is None:
-        soc_support_dtype = all_support_dtype.get("AllSoc")
-        if soc_support_dtype is None:
-            return False
-
-    if (dtype not in (None, "")) and (dtype not in soc_support_dtype):
+    if (dtype not in (None, "")) and (dtype not in dsl_dtypes[1]):
         return False
 
     return True
@@ -743,16 +817,7 @@ def is_cast_support(src_type, dst_type):
     """
     is_cast_support
     """
-    if src_type == dst_type:
-        return True
-
-    cast_type = get_cast_type(src_type, dst_type)
-
-    if intrinsic_check_support("Intrinsic_vconv", cast_type):
-        return True
-    else:
-        # Default round mode set as 'z'
-        return intrinsic_check_support("Intrinsic_vconv", cast_type + "z")
+    return get_soc_support_table().is_cast_support(src_type, dst_type)
 
 
 def get_cast_type(src_type, dst_type):
@@ -883,9 +948,9 @@ def auto_cast_tensor(tensor, intr, supported_types=None, is_auto_cast=True):
         intr_is_support_fp32 = False
         if supported_types is None:
             intrinsic = "Intrinsic_" + intr
-            intr_is_support_dtype = intrinsic_check_support(intrinsic, dtype)
-            intr_is_support_fp32 = intrinsic_check_support(intrinsic,
-                                                           "float32")
+            support_table = get_soc_support_table()
+            intr_is_support_dtype = support_table.check_intrinsic(intrinsic, dtype)
+            intr_is_support_fp32 = support_table.check_intrinsic(intrinsic, "float32")
         else:
             intr_is_support_dtype = (dtype in supported_types)
             intr_is_support_fp32 = ("float32" in supported_types)
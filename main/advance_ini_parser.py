@@ -28,6 +28,9 @@ class AdvanceIniArgs:
         self.atc_singleop_advance_option = ""
         self.performance_mode = 'False'
         self.compile_options = {}
+        # const value larger than it in bytes is stored out of acl_op.json
+        self.const_value_external_threshold = None
+        self.compress_test_data = 'False'
 
     def get_ascend_global_log_level(self):
         """
@@ -63,7 +66,9 @@ class AdvanceIniParser:
             ConstManager.ATC_SINGLEOP_ADVANCE_OPTION: self._init_atc_advance_cmd,
             ConstManager.PERFORMACE_MODE: self._init_performance_mode_flag,
             ConstManager.HOST_ARCH: self._init_host_arch,
-            ConstManager.TOOL_CHAIN: self._init_tool_chain
+            ConstManager.TOOL_CHAIN: self._init_tool_chain,
+            ConstManager.CONST_VALUE_EXTERNAL_THRESHOLD: self._init_const_value_external_threshold,
+            ConstManager.COMPRESS_TEST_DATA: self._init_compress_test_data_flag
         }
 
     @staticmethod
@@ -146,6 +151,19 @@ class AdvanceIniParser:
             return False
         return True
 
+    def get_compress_test_data_flag(self):
+        """
+        get compress test data flag.
+        """
+        return self.advance_ini_args.compress_test_data == ConstManager.TRUE_OR_FALSE_LIST[0]
+
+    def get_const_value_external_threshold(self):
+        """
+        get the size threshold in bytes of const value stored out of
+        acl_op.json, None if all const values are inline.
+        """
+        return self.advance_ini_args.const_value_external_threshold
+
     def get_compile_options(self):
         """
         get compile options.
@@ -287,6 +305,41 @@ class AdvanceIniParser:
                                   ' Please check and modify it in %s file.' % self.config_file)
             raise utils.OpTestGenException(ConstManager.OP_TEST_GEN_INVALID_PARAM_ERROR) from err
 
+    def _init_const_value_external_threshold(self):
+        """
+        get value of const_value_external_threshold.
+        """
+        if not self.config.has_option(
+                ConstManager.ADVANCE_SECTION,
+                ConstManager.CONST_VALUE_EXTERNAL_THRESHOLD):
+            return
+        get_threshold = self.config.get(
+            ConstManager.ADVANCE_SECTION,
+            ConstManager.CONST_VALUE_EXTERNAL_THRESHOLD).strip('"')
+        if get_threshold.isdigit():
+            self.advance_ini_args.const_value_external_threshold = int(get_threshold)
+        else:
+            utils.print_warn_log(
+                'The const_value_external_threshold option should be an '
+                'integer number of bytes, please modify it in %s file.'
+                % self.config_file)
+
+    def _init_compress_test_data_flag(self):
+        """
+        get value of compress_test_data.
+        """
+        if not self.config.has_option(
+                ConstManager.ADVANCE_SECTION, ConstManager.COMPRESS_TEST_DATA):
+            return
+        get_compress_flag = self.config.get(
+            ConstManager.ADVANCE_SECTION, ConstManager.COMPRESS_TEST_DATA)
+        if get_compress_flag in ConstManager.TRUE_OR_FALSE_LIST:
+            self.advance_ini_args.compress_test_data = get_compress_flag
+        else:
+            utils.print_warn_log(
+                'The compress_test_data option should be True or False, '
+                'please modify it in %s file.' % self.config_file)
+
     def _init_performance_mode_flag(self):
         """
         get value of performance_mode.
@@ -13,6 +13,7 @@ import argparse
 import time
 
 from op_test_frame.st.interface import utils
+from op_test_frame.st.interface import ms_op_worker
 from op_test_frame.st.interface.const_manager import ConstManager
 
 
@@ -48,12 +49,18 @@ class MsopstArgParser:
         self.expect_path = ''
         self.result_path = ''
         self.error_report = ''
+        self.rerun_failed = ''
+        # dict of case name and OpSTCase of previous run, it is also set to
+        # rerun_handle for CaseDesign and DataGenerator
+        self.rerun_case_info = None
+        self.jobs = 0
         args = parse.parse_args(sys.argv[1:])
         if sys.argv[1] == 'create':
             self.input_file = args.input_file
             self.model_path = args.model_path
             self.quiet = args.quiet
             self.output_path = args.output_path
+            self._check_jobs(args.jobs)
         elif sys.argv[1] == 'mi':
             if len(sys.argv) <= 2:
                 mi_parser.print_usage()
@@ -76,7 +83,9 @@ class MsopstArgParser:
         """
         create_parser.add_argument(
             "-i", "--input", dest="input_file", default="",
-            help="<Required> the input file, .ini or .py file", required=True)
+            help="<Required> the input file, .ini or .py file, or a directory "
+                 "of .ini files or merged ops info .json file for batch mode",
+            required=True)
         create_parser.add_argument(
             "-out", "--output", dest="output_path", default="",
             help="<Optional> the output path", required=False)
@@ -87,6 +96,11 @@ class MsopstArgParser:
             '-q', "--quiet", dest="quiet", action="store_true", default=False,
             help="<Optional> quiet mode, skip human-computer interactions",
             required=False)
+        create_parser.add_argument(
+            '-j', "--jobs", dest="jobs", default="0",
+            help="<Optional> the number of worker processes when the input is "
+                 "a directory or merged ops info .json file, default is the "
+                 "cpu count.", required=False)
 
     @staticmethod
     def _run_parser(run_parser):
@@ -126,6 +140,11 @@ class MsopstArgParser:
             help="<Optional> Generate error reports (.csv) for failed ST cases. "
                  "This option is available when the script for expected result verification is specified.",
             required=False)
+        run_parser.add_argument(
+            '-rerun', "--rerun-failed", dest="rerun_failed", default="",
+            help="<Optional> the st_report.json of previous run, only rerun the "
+                 "cases failed or mismatched with expect in it, and reuse its "
+                 "input and expect data.", required=False)
 
     @staticmethod
     def _mi_gen_parser(gen_json_parser, gen_testcase_parser):
@@ -187,6 +206,14 @@ class MsopstArgParser:
             help="<Optional> Generate error reports (.csv) for failed ST cases. "
                  "This option is available when the script for expected result verification is specified.",
             required=False)
+        compare_by_path_parser.add_argument(
+            "-out", "--output", dest="output_path", default="",
+            help="<Optional> the output path of compare summary, default is "
+                 "the result path", required=False)
+        compare_by_path_parser.add_argument(
+            '-j', "--jobs", dest="jobs", default="0",
+            help="<Optional> the number of worker processes, default is the "
+                 "cpu count.", required=False)
 
     @staticmethod
     def _check_file_valid(input_file, isdir=False):
@@ -207,6 +234,15 @@ class MsopstArgParser:
         """
         return self.output_path
 
+    def get_rerun_case_info(self):
+        """
+        get the failed cases of --rerun-failed, CaseDesign and DataGenerator
+        use them if rerun_case_info is not specified
+        :return: dict of case name and OpSTCase of previous run, None if
+        --rerun-failed is not specified
+        """
+        return self.rerun_case_info
+
     def _mi_parser(self, mi_parser):
         """
         parse mi cmd
@@ -277,15 +313,27 @@ class MsopstArgParser:
             self.result_path = self._check_file_valid(args.result_path, isdir=True)
             self.expect_path = self._check_file_valid(args.expect_path, isdir=True)
             self.error_report = args.error_report
+            self.output_path = args.output_path
+            self._check_jobs(args.jobs)
 
     def _check_run_args(self, args):
         self.input_file = args.input_file
         self._check_case_name_valid(args.case_name)
         self._check_soc_version(args.soc_version)
         self._check_device_id(args.device_id)
+        # the ms op runs in the persistent worker of the device
+        ms_op_worker.set_worker_device_id(self.device_id)
         self._gen_error_threshold(args.error_threshold)
         self.error_report = args.error_report
         self.config_file = args.config_file
+        if args.rerun_failed:
+            self.rerun_failed = os.path.realpath(
+                self._check_file_valid(args.rerun_failed))
+            # import here, the st report depends on numpy
+            from op_test_frame.st.interface import rerun_handle
+            self.rerun_case_info = rerun_handle.load_rerun_case_info(
+                self.rerun_failed)
+            rerun_handle.set_rerun_case_info(self.rerun_case_info)
         self.output_path = self._add_time_steamp(args.output_path)
 
     def _check_case_name_valid(self, case_name):
@@ -305,6 +353,13 @@ class MsopstArgParser:
             raise utils.OpTestGenException(ConstManager.OP_TEST_GEN_INVALID_DEVICE_ID_ERROR)
         self.device_id = device_id
 
+    def _check_jobs(self, jobs):
+        if not jobs.isdigit():
+            utils.print_error_log(
+                'please enter an integer number for jobs, now is %s.' % jobs)
+            raise utils.OpTestGenException(ConstManager.OP_TEST_GEN_INVALID_PARAM_ERROR)
+        self.jobs = int(jobs)
+
     def _gen_error_threshold(self, err_thr):
         if err_thr is None:
             err_thr = []
@@ -276,6 +276,9 @@ class AscendOpKernelParam:
         self.shape_size = shape_size
         self._hbm_pointer = hbm_pointer
         self._ascend_device = ascend_device
+        # the data file mapped by np_data, the mapping is dropped after
+        # copied to device and mapped again if needed
+        self._data_file_path = None
 
     @staticmethod
     def build_op_param_by_np_data(np_data):
@@ -294,14 +297,19 @@ class AscendOpKernelParam:
         np_dtype = dtype_trans.str_to_np_dtype(dtype)
         if not np_dtype:
             raise RuntimeError("dtype must in [%s]" % ",".join(dtype_trans.get_all_str_dtypes()))
-        np_data = np.fromfile(data_file_path, dtype=np_dtype)
         shape_size = shape_utils.calc_shape_size(shape)
         if shape_size < 0:
             raise RuntimeError("Shape size < 0")
-        if shape_size > len(np_data):
-            raise RuntimeError("Data size(%d) in data_file < shape size(%d)" % (len(np_data), shape_size))
-        np_data = np_data[:shape_size].reshape(shape)
-        return AscendOpKernelParam(np_data=np_data)
+        data_size = os.path.getsize(data_file_path) // np.dtype(np_dtype).itemsize
+        if shape_size > data_size:
+            raise RuntimeError("Data size(%d) in data_file < shape size(%d)" % (data_size, shape_size))
+        if shape_size == 0:
+            return AscendOpKernelParam(np_data=np.empty(shape, dtype=np_dtype))
+        # map only shape size elements, the pages are read when copied to device
+        np_data = np.memmap(data_file_path, dtype=np_dtype, mode="r", shape=(shape_size,)).reshape(shape)
+        op_param = AscendOpKernelParam(np_data=np_data)
+        op_param._data_file_path = data_file_path
+        return op_param
 
     def sync_from_device(self):
         """
@@ -312,12 +320,23 @@ class AscendOpKernelParam:
             np_data = np.frombuffer(byte_data, dtype=dtype_trans.str_to_np_dtype(self.dtype))
             np_data = np_data[:self.shape_size]
             self._np_data = np.reshape(np_data, self.shape)
+        elif self._np_data is None and self._data_file_path:
+            self._np_data = np.memmap(self._data_file_path, dtype=dtype_trans.str_to_np_dtype(self.dtype),
+                                      mode="r", shape=(self.shape_size,)).reshape(self.shape)
 
     def sync_to_device(self, ascend_device: AscendRTSApi):
         """
         sync_to_device
         """
         self._ascend_device = ascend_device
+        if self._data_file_path:
+            if self._np_data is None:
+                self.sync_from_device()
+            # copy from the mapped pages, then drop the mapping
+            self._hbm_pointer = self._ascend_device.copy_buffer_to_hbm(
+                ctypes.c_void_p(self._np_data.ctypes.data), self._np_data.nbytes)
+            self._np_data = None
+            return
         self._hbm_pointer = self._ascend_device.copy_bin_to_hbm(self._np_data.tobytes())
 
     def is_in_device(self):
@@ -9,7 +9,6 @@ Huawei Technologies Co., Ltd. All Rights Reserved © 2020
 """
 import json
 import os
-import time
 
 from op_test_frame.common import op_status
 from op_test_frame.st.interface import utils
@@ -26,6 +25,9 @@ class AtcTransformOm:
         self.compile_flag = compile_flag
         self.machine_type = arguments[0]
         self.report = arguments[1]
+        # the const value larger than it in bytes is stored out of acl_op.json
+        self.const_value_threshold = None
+        self.const_store = None
         self._check_output_path(output_path, testcase_list)
 
     @staticmethod
@@ -77,8 +79,29 @@ class AtcTransformOm:
             utils.print_info_log('Finish to set env for ATC & ACL.')
 
     @staticmethod
-    def _get_atc_cmd(soc_version, advance_args):
-        atc_cmd = ['atc', '--singleop=test_data/config/acl_op.json',
+    def _resolve_const_value_file(content, data_dir):
+        # atc only supports the inline const value, load the referenced value
+        # in the acl json list, so the written acl_op.json is not parsed again
+        for op_dic in content:
+            for desc_dic in op_dic.get('input_desc', []) + op_dic.get('output_desc', []):
+                const_ref = desc_dic.pop(ConstManager.CONST_VALUE_FILE, None)
+                if const_ref is not None:
+                    desc_dic[ConstManager.CONST_VALUE] = \
+                        utils.ConstDataStore.load_value(const_ref, data_dir)
+
+    @staticmethod
+    def _dump_acl_json_content(content, **kwargs):
+        try:
+            return str(json.dumps(content, sort_keys=True, **kwargs))
+        except TypeError:
+            utils.print_error_log("")
+        finally:
+            pass
+        return ""
+
+    @staticmethod
+    def _get_atc_cmd(soc_version, advance_args, acl_json_name=ConstManager.ACL_OP_JSON_FILE_NAME):
+        atc_cmd = ['atc', '--singleop=test_data/config/' + acl_json_name,
                    '--soc_version=' + soc_version, '--output=op_models']
         if advance_args is not None:
             atc_advance_cmd = advance_args.get_atc_advance_cmd()
@@ -89,6 +112,10 @@ class AtcTransformOm:
         """
         Prepare acl json content and write file
         """
+        return self._dump_acl_json_content(
+            self._get_acl_json_list(testcase_list, output_path, compile_flag), indent=2)
+
+    def _get_acl_json_list(self, testcase_list, output_path, compile_flag):
         content = []
         if compile_flag is not None:
             compile_dic = {'compile_flag': compile_flag}
@@ -98,13 +125,7 @@ class AtcTransformOm:
             # only append non-repetitive json struct
             if tmp_dic not in content:
                 content.append(tmp_dic)
-        try:
-            return str(json.dumps(content, sort_keys=True, indent=2))
-        except TypeError:
-            utils.print_error_log("")
-        finally:
-            pass
-        return ""
+        return content
 
     def add_op_st_stage_result(self, status=op_status.FAILED,
                                stage_name=None, result=None, cmd=None):
@@ -120,18 +141,34 @@ class AtcTransformOm:
         """
         Create acl_op.json
         """
-        acl_json_content = self.create_acl_op_json_content(
-            self.testcase_list, self.output_path, self.compile_flag)
         output_test_data_config_path = os.path.join(self.output_path + ConstManager.TEST_DATA_CONFIG_RELATIVE_PATH)
         if not os.path.exists(output_test_data_config_path):
             os.makedirs(output_test_data_config_path)
+        if self.const_value_threshold is not None:
+            self.const_store = utils.ConstDataStore(
+                output_test_data_config_path, self.const_value_threshold)
+        acl_json_list = self._get_acl_json_list(
+            self.testcase_list, self.output_path, self.compile_flag)
         utils.print_step_log("[%s] Generate acl_op.json for atc tools." % (os.path.basename(__file__)))
-        self._write_content_to_file(acl_json_content, os.path.join(output_test_data_config_path, 'acl_op.json'))
+        self._write_content_to_file(self._dump_acl_json_content(acl_json_list, indent=2), os.path.join(
+            output_test_data_config_path, ConstManager.ACL_OP_JSON_FILE_NAME))
+        if self.const_store is not None and self.const_store.ref_map:
+            utils.print_info_log(
+                "%d const values (%d bytes) are stored in %s, %d bytes are "
+                "deduplicated." % (len(self.const_store.ref_map), self.const_store.offset,
+                                   self.const_store.data_path, self.const_store.dedup_bytes))
+            # atc reads the inline values, only acl_op.json is smaller
+            self._resolve_const_value_file(acl_json_list, output_test_data_config_path)
+            self._write_content_to_file(
+                self._dump_acl_json_content(acl_json_list, separators=(',', ':')),
+                os.path.join(output_test_data_config_path, ConstManager.ACL_OP_ATC_JSON_FILE_NAME))
 
     def transform_acl_json_to_om(self, soc_version, advance_args):
         """
         Transform acl_op.json to om models.
         """
+        if advance_args is not None:
+            self.const_value_threshold = advance_args.get_const_value_external_threshold()
         # generate acl_op.json for atc tools.
         self.create_acl_op()
         # set log level env.
@@ -142,7 +179,11 @@ class AtcTransformOm:
         run_out_path = os.path.join(self.output_path, ConstManager.RUN_OUT)
         op_models_path = os.path.join(run_out_path, 'op_models')
         os.chdir(run_out_path)
-        atc_cmd = self._get_atc_cmd(soc_version, advance_args)
+        if self.const_store is not None and self.const_store.ref_map:
+            atc_cmd = self._get_atc_cmd(soc_version, advance_args,
+                                        ConstManager.ACL_OP_ATC_JSON_FILE_NAME)
+        else:
+            atc_cmd = self._get_atc_cmd(soc_version, advance_args)
         cmd_str = "cd %s && %s " % (run_out_path, " ".join(atc_cmd))
         utils.print_info_log("ATC command line: %s" % cmd_str)
         try:
@@ -185,7 +226,8 @@ class AtcTransformOm:
                     'shape': data_shape}
             # add is_const in acl_op.json
             utils.ConstInput.add_const_info_in_acl_json(desc_dic, res_desc_dic, output_path,
-                                                        testcase_struct.get(ConstManager.CASE_NAME), index)
+                                                        testcase_struct.get(ConstManager.CASE_NAME), index,
+                                                        self.const_store)
             # Add name field for input*.paramType = optional or dynamic scenarios.
             input_name = desc_dic.get('name')
             if input_name is not None:
@@ -225,11 +267,13 @@ class AtcTransformOm:
         return tmp_dic
 
     def _execute_atc_cmd(self, atc_cmd, cmd_str):
-        atc_start_time = time.time()
-        utils.execute_command(atc_cmd)
-        atc_end_time = time.time()
+        with self.report.tracer.span('atc_single_op_convert') as trace_span:
+            acl_op_json_path = os.path.join(self.output_path + ConstManager.ACL_OP_JSON_RELATIVE_PATH)
+            if os.path.isfile(acl_op_json_path):
+                trace_span.bytes_processed = os.path.getsize(acl_op_json_path)
+            utils.execute_command(atc_cmd)
         utils.print_info_log('Atc execute time: %f s.'
-                             % (atc_end_time - atc_start_time))
+                             % trace_span.get_duration())
         self.add_op_st_stage_result(op_status.SUCCESS,
                                     "atc_single_op_convert",
                                     None, cmd_str)
@@ -12,6 +12,7 @@ Huawei Technologies Co., Ltd. All Rights Reserved © 2020
 import os
 
 from op_test_frame.st.interface import utils
+from op_test_frame.st.interface import rerun_handle
 from op_test_frame.st.interface.subcase_design_fuzz import SubCaseDesignFuzz
 from op_test_frame.st.interface.subcase_design_cross import SubCaseDesignCross
 from op_test_frame.st.interface.const_manager import ConstManager
@@ -47,7 +48,8 @@ class CaseDesign:
     the class for design test case.
     """
 
-    def __init__(self, json_path_list, case_name_list, report):
+    def __init__(self, json_path_list, case_name_list, report,
+                 rerun_case_info=None):
         self.json_path_list = json_path_list.split(',')
         if case_name_list == 'all':
             self.case_name_list = None
@@ -56,6 +58,10 @@ class CaseDesign:
         self.current_json_path = ''
         self.case_name_to_json_file_map = {}
         self.report = report
+        # dict of case name and OpSTCase of previous run, for rerun failed,
+        # it is the cases of --rerun-failed if not specified
+        self.rerun_case_info = rerun_case_info if rerun_case_info is not None \
+            else rerun_handle.get_rerun_case_info()
 
     def check_argument_valid(self):
         """
@@ -113,11 +119,16 @@ class CaseDesign:
         # design sub test case by json file
         utils.print_step_log("[%s] Start to parser testcase json." % (os.path.basename(__file__)))
         case_list = self.generate_cases()
+        if self.rerun_case_info:
+            case_list = (rerun_handle.filter_rerun_cases(
+                case_list[0], self.rerun_case_info, self.report), case_list[1])
 
         if len(case_list[0]) == 0:
             case_info = 'all'
             if self.case_name_list:
                 case_info = str(self.case_name_list)
+            if self.rerun_case_info:
+                case_info = str(list(self.rerun_case_info.keys()))
             utils.print_error_log(
                 'There is no case to generate for %s. Please modify the case '
                 'name argument.' % case_info)
@@ -146,5 +157,6 @@ class CaseDesign:
                                                json_obj,
                                                total_case_in_file,
                                                self.report)
-        total_case_in_file = subcase_parse.subcase_generate()
+        with self.report.tracer.span('case_design', json_obj[ConstManager.CASE_NAME]):
+            total_case_in_file = subcase_parse.subcase_generate()
         return total_case_in_file
@@ -16,17 +16,19 @@ import copy
 import re
 import importlib
 
-from op_test_frame.st.interface.global_config_parser import GlobalConfig as GC
+from op_test_frame.st.interface.global_config_parser import LazyWhiteLists
 from op_test_frame.st.interface.const_manager import ConstManager
 from op_test_frame.st.interface import utils
 from op_test_frame.st.interface.model_parser import get_model_nodes
+from op_test_frame.st.interface.op_proto_index import get_op_proto_index
+from op_test_frame.st.interface.op_proto_index import parse_reg_op_lines
 
 
 class CaseGenerator:
     """
     the class for design test case.
     """
-    WHITE_LISTS = GC.instance().white_lists
+    WHITE_LISTS = LazyWhiteLists()
 
     def __init__(self, args):
         self.input_file_path = os.path.realpath(args.input_file)
@@ -117,9 +119,15 @@ class CaseGenerator:
                         value, op_info_key, support_list))
 
     @staticmethod
-    def _delete_comments(content):
-        no_comments_content = re.sub(r'//.*|/\*(\s|.)*?\*/', '', content)
-        return no_comments_content.strip()
+    def get_aicpu_op_proto_dir(op_file_path):
+        """
+        get the op proto directory of the aicpu operator
+        :param op_file_path: the .ini file of the aicpu operator
+        :return: the op proto directory
+        """
+        # search op_name.h upward through the ini file
+        return os.path.realpath(os.path.join(os.path.dirname(op_file_path),
+                                             '../../../op_proto'))
 
     @staticmethod
     def _check_op_proto_path_valid(path):
@@ -170,17 +178,30 @@ class CaseGenerator:
 
     def generate(self):
         """
-        generate case.json from .ini or .py file
+        generate case.json from .ini or .py file, or generate case.json for
+        each operator in a directory or merged ops info .json file
         """
         # check path valid
         self.check_argument_valid()
+        if self.is_batch_mode():
+            # import here, the batch generator depends on this module
+            from op_test_frame.st.interface.case_generator_batch import \
+                BatchCaseGenerator
+            BatchCaseGenerator(self.args).generate()
+            return
         if self.input_file_path.endswith(".ini"):
             # parse ini to json
             self._parse_ini_to_json()
         elif self.input_file_path.endswith(".py"):
             # parse .py to json
             self._parse_py_to_json()
+        self.generate_case_json()
 
+    def generate_case_json(self):
+        """
+        generate case.json from the parsed operator information
+        :return: the case.json path
+        """
         if self._is_aicpu_op():
             # generate aicpu base case of case.json
             base_case = self._generate_aicpu_base_case()
@@ -207,18 +228,40 @@ class CaseGenerator:
             pass
         utils.print_info_log(
             "Generate test case file %s successfully." % json_path)
+        return json_path
+
+    def set_op_info(self, op_file_path, op_type, op_info):
+        """
+        set the operator information parsed by the batch generator
+        :param op_file_path: the .ini or .json file defining the operator
+        :param op_type: the operator type
+        :param op_info: the operator information, like {"input0": {...}}
+        """
+        self.input_file_path = op_file_path
+        self.op_type = op_type
+        self.op_info = op_info
+
+    def is_batch_mode(self):
+        """
+        check the input is a directory or a merged ops info .json file
+        :return: bool
+        """
+        return os.path.isdir(self.input_file_path) or \
+            self.input_file_path.endswith(ConstManager.OPS_INFO_JSON_SUFFIX)
 
     def check_argument_valid(self):
         """
         check input argument valid
         """
-        if os.path.splitext(self.input_file_path)[-1] \
-                not in ConstManager.INPUT_SUFFIX_LIST:
+        if not self.is_batch_mode() and os.path.splitext(
+                self.input_file_path)[-1] not in ConstManager.INPUT_SUFFIX_LIST:
             utils.print_error_log(
-                'The file "%s" is invalid, only supports .ini or .py file. '
-                'Please modify it.' % self.input_file_path)
+                'The file "%s" is invalid, only supports .ini or .py file, '
+                'or a directory or .json file for batch mode. Please modify '
+                'it.' % self.input_file_path)
             raise utils.OpTestGenException(ConstManager.OP_TEST_GEN_INVALID_PATH_ERROR)
-        utils.check_path_valid(self.input_file_path)
+        utils.check_path_valid(self.input_file_path,
+                               os.path.isdir(self.input_file_path))
         utils.check_path_valid(self.output_path, True)
 
     def _get_attr_type_list_value(self, attr_type, default_value_str):
@@ -308,7 +351,11 @@ class CaseGenerator:
             raise utils.OpTestGenException(
                 ConstManager.OP_TEST_GEN_CONFIG_INVALID_OPINFO_FILE_ERROR)
 
-    def _parse_ini_to_json(self):
+    def parse_ini_ops_info(self):
+        """
+        parse all operators in the .ini file
+        :return: dict of operator type and operator information
+        """
         tbe_ops_info = {}
         with open(self.input_file_path) as ini_file:
             lines = ini_file.readlines()
@@ -321,6 +368,10 @@ class CaseGenerator:
                     self._get_tbe_ops_info(line, tbe_ops_info, index)
                 else:
                     self._get_op_info(index, line)
+        return tbe_ops_info
+
+    def _parse_ini_to_json(self):
+        tbe_ops_info = self.parse_ini_ops_info()
         if len(tbe_ops_info) != 1:
             utils.print_error_log(
                 'There are %d operator in file %s, only supports one operator '
@@ -418,7 +469,7 @@ class CaseGenerator:
         if 'format' in op_info:
             format_list = op_info["format"].split(",")
             self._check_op_info_list_valid(
-                format_list, list(self.WHITE_LISTS.format_map.keys()),
+                format_list, self.WHITE_LISTS.format_list,
                 op_info_key + '.format')
 
             if current_dtype_count != len(format_list):
@@ -606,6 +657,18 @@ class CaseGenerator:
                 self.op_info[attr_name]['type'] = \
                     ConstManager.OP_PROTO_PARSE_ATTR_TYPE_MAP.get(attr_tensor_type)
 
+    def _parse_aicpu_op_proto_lines(self, line_point_list):
+        # record the number of input and output.
+        input_count = 0
+        output_count = 0
+        for line in line_point_list:
+            # parse op_name and type of input or output.
+            input_count, output_count = \
+                self._parse_aicpu_input_output_info(
+                    line, input_count, output_count)
+            # parse op_name and type of attr.
+            self._parse_aicpu_attr(line)
+
     def _parse_aicpu_op_proto(self, file_path):
         # read op_name.h as an txt.
         op_name_h_text = utils.read_file(file_path)
@@ -615,32 +678,21 @@ class CaseGenerator:
             reg_op_info_str = reg_op_info_str.strip()
             if reg_op_info_str.startswith('REG_OP'):
                 # delete code comments in op_name.h and format.
-                no_comments_content = self._delete_comments(reg_op_info_str)
-                new_line = no_comments_content.replace('\n', ConstManager.EMPTY)\
-                    .replace('\r', ConstManager.EMPTY) \
-                    .replace('\t', ConstManager.EMPTY)
-                pattern = re.compile(ConstManager.SPACE)
-                line = pattern.sub(ConstManager.EMPTY, new_line)
-                line_point_list = line.split(').')
-                # record the number of input and output.
-                input_count = 0
-                output_count = 0
-                for line in line_point_list:
-                    line = line.strip()
-                    # parse op_name and type of input or output.
-                    input_count, output_count = \
-                        self._parse_aicpu_input_output_info(
-                            line, input_count, output_count)
-                    # parse op_name and type of attr.
-                    self._parse_aicpu_attr(line)
+                self._parse_aicpu_op_proto_lines(
+                    parse_reg_op_lines(reg_op_info_str))
                 return True
         return False
 
     def _find_aicpu_op_proto_path(self):
-        # search op_name.h upward through the ini file
-        op_proto_path = os.path.realpath(
-            os.path.join(os.path.dirname(self.input_file_path),
-                         '../../../op_proto'))
+        op_proto_path = self.get_aicpu_op_proto_dir(self.input_file_path)
+        # the REG_OP of all headers are indexed, find the op in O(1)
+        op_proto = get_op_proto_index(op_proto_path).get(self.op_type)
+        if op_proto:
+            utils.print_info_log("Obtain operator information from %s at "
+                                 "offset %d." % (op_proto.get('path'),
+                                                 op_proto.get('offset')))
+            self._parse_aicpu_op_proto_lines(op_proto.get('lines'))
+            return
         op_proto_file_name = utils.fix_name_lower_with_under(self.op_type)\
                              + '.h'
         op_proto_file_path = os.path.join(op_proto_path, op_proto_file_name)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Function:
+BatchCaseGenerator class.
+This class mainly involves generating case.json for all operators defined
+in a directory of .ini files or a merged ops info .json file.
+Copyright Information:
+Huawei Technologies Co., Ltd. All Rights Reserved © 2021
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from op_test_frame.st.interface.case_generator import CaseGenerator
+from op_test_frame.st.interface.op_proto_index import get_op_proto_index
+from op_test_frame.st.interface.model_parser import prepare_model_node_index
+from op_test_frame.st.interface.const_manager import ConstManager
+from op_test_frame.st.interface import utils
+
+
+def _generate_op_case(args, op_file_path, op_type, op_info):
+    """
+    generate case.json for one operator, run in the worker process
+    :return: (op_type, op_file_path, case json path, error code)
+    """
+    try:
+        case_generator = CaseGenerator(args)
+        case_generator.set_op_info(op_file_path, op_type, op_info)
+        return op_type, op_file_path, case_generator.generate_case_json(), None
+    except utils.OpTestGenException as error:
+        return op_type, op_file_path, None, error.error_info
+    except (KeyError, ValueError, TypeError, AttributeError) as error:
+        utils.print_error_log(
+            'Failed to generate case json for "%s". %s' % (op_type, str(error)))
+        return op_type, op_file_path, None, \
+            ConstManager.OP_TEST_GEN_CONFIG_INVALID_OPINFO_FILE_ERROR
+    except Exception as error:  # one failed operator does not stop the batch
+        utils.print_error_log(
+            'Failed to generate case json for "%s". %s: %s'
+            % (op_type, type(error).__name__, str(error)))
+        return op_type, op_file_path, None, ConstManager.OP_TEST_GEN_UNKNOWN_ERROR
+    finally:
+        pass
+
+
+class BatchCaseGenerator:
+    """
+    the class for design test case of all operators in batch.
+    """
+
+    def __init__(self, args):
+        self.input_path = os.path.realpath(args.input_file)
+        self.output_path = os.path.realpath(args.output_path)
+        self.jobs = args.jobs if args.jobs else os.cpu_count()
+        self.args = args
+        # list of (op_file_path, op_type, op_info)
+        self.op_list = []
+        self.op_file_map = {}
+        self.parse_failed_list = []
+
+    @staticmethod
+    def _format_json_op_info(op_info):
+        # the same as .ini, the spaces in value are removed
+        re_compile = re.compile(' ')
+        new_op_info = {}
+        for key, value in op_info.items():
+            if not isinstance(value, dict):
+                continue
+            new_op_info[key] = {
+                item_key: re_compile.sub('', item_value)
+                if isinstance(item_value, str) else item_value
+                for item_key, item_value in value.items()}
+        return new_op_info
+
+    def generate(self):
+        """
+        parse all operators and generate case.json for each of them
+        """
+        if os.path.isdir(self.input_path):
+            for op_file_path in self._get_ini_file_list():
+                self._parse_ini_file(op_file_path)
+        else:
+            self._parse_ops_info_json(self.input_path)
+        if not self.op_list:
+            utils.print_error_log(
+                'There is no operator found in %s. Please modify it.'
+                % self.input_path)
+            raise utils.OpTestGenException(
+                ConstManager.OP_TEST_GEN_CONFIG_INVALID_OPINFO_FILE_ERROR)
+        utils.print_info_log(
+            'Start to generate case json for %d operators with %d workers.'
+            % (len(self.op_list), self.jobs))
+        # load the white lists and op proto index before fork, the workers
+        # share them
+        _ = CaseGenerator.WHITE_LISTS
+        for op_proto_path in self._get_aicpu_op_proto_dirs():
+            get_op_proto_index(op_proto_path)
+        if self.args.model_path != "":
+            # parse the model once, the workers get nodes from the index
+            prepare_model_node_index(self.args)
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            futures = [executor.submit(_generate_op_case, self.args, op_file_path,
+                                       op_type, op_info)
+                       for op_file_path, op_type, op_info in self.op_list]
+            results = [self._get_op_result(future, op_file_path, op_type)
+                       for future, (op_file_path, op_type, _)
+                       in zip(futures, self.op_list)]
+        self._print_summary(results)
+
+    @staticmethod
+    def _get_op_result(future, op_file_path, op_type):
+        # the worker process may exit without a result, such as killed
+        try:
+            return future.result()
+        except Exception as error:
+            utils.print_error_log(
+                'Failed to generate case json for "%s". %s: %s'
+                % (op_type, type(error).__name__, str(error)))
+            return op_type, op_file_path, None, ConstManager.OP_TEST_GEN_UNKNOWN_ERROR
+        finally:
+            pass
+
+    def _get_aicpu_op_proto_dirs(self):
+        op_proto_dirs = set()
+        for op_file_path, _, op_info in self.op_list:
+            if op_info.get('opInfo', {}).get('kernelSo'):
+                op_proto_dirs.add(CaseGenerator.get_aicpu_op_proto_dir(op_file_path))
+        return sorted(op_proto_dirs)
+
+    def _get_ini_file_list(self):
+        ini_file_list = []
+        for root, _, files in os.walk(self.input_path, followlinks=True):
+            for file_name in files:
+                if file_name.endswith(ConstManager.INI_FILE):
+                    ini_file_list.append(os.path.join(root, file_name))
+        ini_file_list.sort()
+        return ini_file_list
+
+    def _add_op(self, op_file_path, op_type, op_info):
+        if op_type in self.op_file_map:
+            utils.print_warn_log(
+                'The operator "%s" in %s is already defined in %s, skip it.'
+                % (op_type, op_file_path, self.op_file_map.get(op_type)))
+            return
+        self.op_file_map[op_type] = op_file_path
+        self.op_list.append((op_file_path, op_type, op_info))
+
+    def _parse_ini_file(self, op_file_path):
+        case_generator = CaseGenerator(self.args)
+        case_generator.set_op_info(op_file_path, "", {})
+        try:
+            tbe_ops_info = case_generator.parse_ini_ops_info()
+        except (utils.OpTestGenException, OSError, UnicodeDecodeError):
+            utils.print_warn_log('Failed to parse %s, skip it.' % op_file_path)
+            self.parse_failed_list.append(op_file_path)
+            return
+        finally:
+            pass
+        for op_type, op_info in tbe_ops_info.items():
+            self._add_op(op_file_path, op_type, op_info)
+
+    def _parse_ops_info_json(self, op_file_path):
+        ops_info = utils.load_json_file(op_file_path)
+        if not isinstance(ops_info, dict):
+            utils.print_error_log(
+                'The file %s is not a valid ops info json, it should be like '
+                '{"op_type": {"input0": {...}}}. Please modify it.'
+                % op_file_path)
+            raise utils.OpTestGenException(
+                ConstManager.OP_TEST_GEN_CONFIG_INVALID_OPINFO_FILE_ERROR)
+        for op_type, op_info in ops_info.items():
+            if not isinstance(op_info, dict):
+                continue
+            self._add_op(op_file_path, op_type,
+                         self._format_json_op_info(op_info))
+
+    def _print_summary(self, results):
+        failed_results = [result for result in results if result[2] is None]
+        summary_txt = """========================================================================
+- operator count: %d
+- success count: %d
+- failed count: %d
+- output path: %s
+""" % (len(results), len(results) - len(failed_results),
+       len(failed_results), self.output_path)
+        if failed_results:
+            summary_txt += "- failed operators:\n"
+            for op_type, op_file_path, _, error_code in failed_results:
+                summary_txt += "  %-40s error code: %-6s %s\n" % (
+                    op_type, error_code, op_file_path)
+        if self.parse_failed_list:
+            summary_txt += "- unparsed files:\n"
+            for op_file_path in self.parse_failed_list:
+                summary_txt += "  %s\n" % op_file_path
+        summary_txt += "========================================================================"
+        print(summary_txt)
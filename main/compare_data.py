@@ -22,6 +22,8 @@ import os
 import numpy as np
 
 from op_test_frame.st.interface import utils
+from op_test_frame.st.interface import precision_info
+from op_test_frame.st.interface import precision_metrics
 from op_test_frame.st.interface.const_manager import ConstManager
 
 
@@ -29,13 +31,18 @@ class CompareData:
     """
     class CompareData
     """
-    def __init__(self, op_params, err_thr, error_report, run_dir):
+    def __init__(self, op_params, err_thr, error_report, run_dir, standard=None):
         self.op_params = op_params
         self.real_data = None
         self.data_compare = None
         self.err_thr = err_thr
         self.error_report = error_report
         self.run_dir = run_dir
+        # the standard decides the result, it is the err_thr if not specified
+        self.standard = standard if standard else precision_info.PrecisionStandard.from_err_thr(err_thr)
+        # all precision metrics computed in one pass, for triage
+        self.metrics = None
+        self.precision_result = None
 
     @staticmethod
     def _cal_relative_diff(real_data, expect_data, diff_thd, type_str='fp16'):
@@ -51,21 +58,12 @@ class CompareData:
             rate_diff = diff / (float(max(abs(real_data), abs(expect_data))) + 10e-10)
         return rate_diff
 
-    @staticmethod
-    def _cal_relative_diff_np(real_data, expect_data, diff_thd):
-        uint_data = np.abs(np.subtract(real_data, expect_data))
-        max_data = np.maximum(np.abs(real_data), (np.abs(expect_data)))
-        diff_data = float((1.0 / (1 << 14)) / diff_thd)
-        data_add = np.add(np.maximum(max_data, diff_data), 10e-10)
-        result = np.where(uint_data < diff_thd, uint_data, uint_data / data_add)
-        return result
-
     def compare(self, npu_output, cpu_output):
         """
         compare
         """
-        self.real_data = npu_output.flatten()
-        self.data_compare = cpu_output.flatten()
+        self.real_data = npu_output.reshape(-1)
+        self.data_compare = cpu_output.reshape(-1)
         if self.real_data.size == 0 and self.real_data.size == self.data_compare.size:
             utils.print_info_log(
                 'The npu_output is [],and it is same as bm_output, the result of data_compare is \"Pass\"')
@@ -113,38 +111,26 @@ class CompareData:
         real_data_size = int(end - start + 1) if end != start else 1
         return start, end, real_data_size
 
-    def _check_overflows_count(self):
-        overflows_count = self.data_compare[np.isinf(self.data_compare)].size + self.data_compare[
-            np.isnan(self.data_compare)].size
-        if overflows_count > 0:
-            utils.print_info_log('Overflow,size:%s,benchmark_output:%s, %s' % (
-                overflows_count, self.data_compare[np.isinf(self.data_compare)][0:10],
-                self.data_compare[np.isnan(self.data_compare)][0:10]))
-
     def _get_compare_result(self):
-        diff_thd, pct_thd, max_diff_hd = self.err_thr[0], self.err_thr[1], 0.1
-        max_error = 0
-        result = "Failed"
+        diff_thd, pct_thd, max_diff_thd = self.standard.to_err_thr()
+        metrics, self.precision_result = precision_metrics.compare_precision(
+            self.real_data, self.data_compare, self.standard, keep_all_errors=self.error_report == 'true')
         if self.real_data.size != self.data_compare.size:
             utils.print_error_log(
                 'Error,the size of npu output[%s] and benchmark[%s] is not equal.' % (
                     self.real_data.size, self.data_compare.size))
-            return result, 0.0, max_error
+            return "Failed", 0.0, 0
         start, end, real_data_size = self._get_data_size()
-        self._check_overflows_count()
-        utils.print_info_log('total_count:%s; max_diff_thd:%s;' % (real_data_size, max_diff_hd))
-        try:
-            diff_abs = np.abs(np.subtract(self.real_data.astype(np.float32), self.data_compare.astype(np.float32)))
-        except MemoryError:
-            return result, 0.0, max_error
-        finally:
-            pass
+        self.metrics = metrics.to_json_obj()
+        if self.metrics.get("expect_nan_inf"):
+            utils.print_info_log('Overflow,size:%s' % self.metrics.get("expect_nan_inf"))
+        utils.print_info_log('total_count:%s; max_diff_thd:%s;' % (real_data_size, max_diff_thd))
         self._display_output(start, end, diff_thd)
-        result, err_list, error_percent = self._get_error_percent(
-            [diff_abs, diff_thd, max_diff_hd], real_data_size, pct_thd)
+        result = "Pass" if self.precision_result.is_success() else "Failed"
+        self._display_result([diff_thd, pct_thd, max_diff_thd], result)
         if result == "Failed":
-            self._display_error_output(err_list)
-        return result, error_percent, max_error
+            self._display_error_output(metrics.get_error_elements())
+        return result, self.metrics.get("pass_rate") * 100, self.metrics.get("max_error")
 
     def _display_output(self, start, end, diff_thd):
         utils.print_info_log(
@@ -155,58 +141,50 @@ class CompareData:
             '---------------------------------------------------------------------------------------')
         real_data_size = int(end - start)
         if real_data_size <= 20:
-            for index in range(real_data_size + 1):
-                self._display_data_by_index(index, start, diff_thd)
+            self._display_data_range(start, real_data_size + 1, diff_thd)
         else:
-            for index in range(10):
-                self._display_data_by_index(index, start, diff_thd)
+            self._display_data_range(start, 10, diff_thd)
             dot_3 = '...'
             utils.print_info_log('{dot:<15} {dot:<15} {dot:<15} {dot:<15} {dot:<15}'.format(dot=dot_3))
-            for i in range(real_data_size - 10 + 1, real_data_size + 1):
-                self._display_data_by_index(i, start, diff_thd)
+            self._display_data_range(start + real_data_size - 10 + 1, 10, diff_thd)
 
-    def _display_data_by_index(self, index, start, diff_thd):
-        index = index + start
+    def _display_data_range(self, start, count, diff_thd):
+        # the data may be read from file, so the range is read once
+        expect_data = self.data_compare[start:start + count]
+        real_data = self.real_data[start:start + count]
+        for offset, (expect_value, real_value) in enumerate(zip(expect_data, real_data)):
+            self._display_data(start + offset, expect_value, real_value, diff_thd)
+
+    def _display_data(self, index, expect_value, real_value, diff_thd):
         data_index = '%08d' % (index + 1)
-        expect_out = '%.7f' % self.data_compare[index]
-        real_out = '%.7f' % self.real_data[index]
-        fp_diff = '%.7f' % abs(np.float64(self.data_compare[index]) - np.float64(self.real_data[index]))
-        rate_diff = '%.7f' % self._cal_relative_diff(self.data_compare[index], self.real_data[index], diff_thd)
+        expect_out = '%.7f' % expect_value
+        real_out = '%.7f' % real_value
+        fp_diff = '%.7f' % abs(np.float64(expect_value) - np.float64(real_value))
+        rate_diff = '%.7f' % self._cal_relative_diff(expect_value, real_value, diff_thd)
         utils.print_info_log('{:<15} {:<15} {:<15} {:<15} {:<15}'.format(data_index, expect_out, real_out,
                                                                          fp_diff, rate_diff))
 
-    def _get_error_percent(self, diff_list, split_count, pct_thd):
-        diff_index = np.where(diff_list[0] > 0)
-        rdiff = self._cal_relative_diff_np(self.real_data[diff_index].astype(np.float32),
-                                           self.data_compare[diff_index].astype(np.float32),
-                                           diff_list[1])
-        err_diff = rdiff[rdiff > diff_list[1]]
-        diff_idx_list = diff_index[0]
-        err_idx = diff_idx_list[np.where(rdiff > diff_list[1])]
-
-        fulfill_num = split_count - err_diff.size
-        fulfill_percent = float(fulfill_num) / float(split_count)
-        pct_thd = 1 - pct_thd
-        result = "Pass" if (fulfill_percent >= pct_thd) else "Failed"
-        if len(err_diff) > 0:
-            max_error = max(err_diff)
-            if max(err_diff) >= diff_list[2]:
-                result = "Failed"
+    def _display_result(self, err_thr, result):
         utils.print_info_log(
             '---------------------------------------------------------------------------------------')
         utils.print_info_log('{:<15} {:<15} {:<15} {:<15}'.format('DiffThd', 'PctThd', 'PctRlt', 'Result'))
         utils.print_info_log(
             '---------------------------------------------------------------------------------------')
-        utils.print_info_log('{:<15.4f} {:<15.2%} {:<15.6%} {:<15}'.format(diff_list[1], float(pct_thd),
-                                                                           fulfill_percent, result))
-        if len(err_diff) > 0:
+        utils.print_info_log('{:<15.4f} {:<15.2%} {:<15.6%} {:<15}'.format(err_thr[0], 1 - float(err_thr[1]),
+                                                                           self.metrics.get("pass_rate"), result))
+        if self.metrics.get("error_count"):
             utils.print_info_log(
                 'Maximum error is: %s. Tolerance threshold is: %s.' % (
-                    max_error, diff_list[2]))
-        return result, [err_idx, err_diff], fulfill_percent * 100
+                    self.metrics.get("max_error"), err_thr[2]))
+        utils.print_info_log(
+            'Precision metrics: cosine_similarity:%.6f; rmse:%.6g; max_abs_error:%.6g; '
+            'max_rel_error:%.6g; nan_inf_mismatch:%d; %s %s' % (
+                self.metrics.get("cosine_similarity"), self.metrics.get("rmse"),
+                self.metrics.get("max_abs_error"), self.metrics.get("max_rel_error"),
+                self.metrics.get("nan_inf_mismatch"), self.precision_result.status,
+                self.precision_result.err_msg or ""))
 
     def _display_error_output(self, err_list):
-        err_idx, relative_diff = err_list
         # Get err report path
         csv_path = self._get_err_report_path()
         # If error_report is true, write header to .csv
@@ -218,20 +196,20 @@ class CompareData:
                                                                          'FpDiff', 'RateDiff'))
         utils.print_info_log('---------------------------------------------------------------------------------------')
         # Show Error line and if error_report is true, write error line to .csv
-        self._show_and_write_err_report(err_idx, relative_diff, csv_path)
+        self._show_and_write_err_report(err_list, csv_path, self.metrics.get("error_count"))
         utils.print_info_log('---------------------------------------------------------------------------------------')
 
-    def _show_and_write_err_report(self, err_idx, relative_diff, csv_path):
-        count = 0
-        len_err = len(err_idx)
+    def _show_and_write_err_report(self, err_list, csv_path, len_err):
+        # the error values are kept by the metrics, the data is not read again
+        (err_idx, relative_diff, real_values, expect_values), positions = err_list
         err_data = []
-        for i in err_idx:
-            count += 1
+        for i, diff, real_value, expect_value, count in zip(
+                err_idx, relative_diff, real_values, expect_values, positions):
             data_index = '%08d' % (i + 1)
-            expect_out = '%.7f' % self.data_compare[i]
-            real_out = '%.7f' % self.real_data[i]
-            fp_diff = '%.7f' % abs(np.float64(self.data_compare[i]) - np.float64(self.real_data[i]))
-            rate_diff = '%.7f' % float(relative_diff[count - 1])
+            expect_out = '%.7f' % expect_value
+            real_out = '%.7f' % real_value
+            fp_diff = '%.7f' % abs(np.float64(expect_value) - np.float64(real_value))
+            rate_diff = '%.7f' % float(diff)
             if len_err <= 20 or count < 10 or count > len_err - 10:
                 utils.print_info_log('{:<15} {:<15} {:<15} {:<15} {:<15}'.format(data_index, expect_out, real_out,
                                                                                  fp_diff, rate_diff))
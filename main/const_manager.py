@@ -82,6 +82,9 @@ class ConstManager:
     TESTCASE_PY_RELATIVE_PATH = "/src/test_{op_name}.py"
     PYTEST_INI_RELATIVE_PATH = "/src/pytest.ini"
     INPUT_SUFFIX_LIST = ['.ini', '.py']
+    OPS_INFO_JSON_SUFFIX = '.json'
+    INI_FILE = '.ini'
+    HEADER_FILE = '.h'
     BIN_FILE = '.bin'
     PY_FILE = '.py'
     FILE_AUTHORITY = stat.S_IWUSR | stat.S_IRUSR | stat.S_IXUSR
@@ -94,6 +97,8 @@ class ConstManager:
     ASCEND_SLOG_PRINT_TO_STDOUT = 'ascend_slog_print_to_stdout'
     ATC_SINGLEOP_ADVANCE_OPTION = 'atc_singleop_advance_option'
     PERFORMACE_MODE = 'performance_mode'
+    CONST_VALUE_EXTERNAL_THRESHOLD = 'const_value_external_threshold'
+    COMPRESS_TEST_DATA = 'compress_test_data'
     HOST_ARCH = 'host_arch'
     TOOL_CHAIN = 'tool_chain'
 
@@ -189,6 +194,9 @@ class ConstManager:
 
     # ---------------------------GlobalConfig--------------------------
     WHITE_LIST_FILE_NAME = "white_list_config.json"
+    MSOPST_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.msopst')
+    WHITE_LIST_CACHE_PATH = os.path.join(MSOPST_CACHE_DIR, 'white_list_config.cache')
+    OP_PROTO_INDEX_FILE_NAME = 'op_proto_index_%s.json'
     FORMAT_ENUM_MAP = "FORMAT_ENUM_MAP"  # FORMAT_ENUM_MAP the map according to graph/types.h
     DTYPE_LIST = "DTYPE_LIST"
     MINDSPORE_DTYPE_LIST = "MINDSPORE_DTYPE_LIST"
@@ -197,11 +205,22 @@ class ConstManager:
 
     # ----------------------------model_parser---------------------------
     GET_MODEL_NODES_FUNC = 'get_model_nodes'
+    GET_ALL_MODEL_NODES_FUNC = 'get_all_model_nodes'
+    MODEL_NODE_INDEX_FILE_NAME = 'model_node_index_%s_%s.json'
+    # the arguments which do not change the nodes parsed from the model
+    MODEL_INDEX_IGNORED_ARGS = ('input_file', 'model_path', 'output_path', 'quiet', 'jobs')
+    MODEL_HASH_FILE_NAME = 'model_hash_%s.json'
+    MODEL_HASH_CHUNK_SIZE = 16 * 1024 * 1024
     GET_SHAPE_FUNC = 'get_shape'
     CHANGE_SHAPE_FUNC = 'change_shape'
     FILE_NAME_SUFFIX = '_model_parser'
     FRAMEWORK_CONFIG_PATH = './framework/framework.json'
 
+    # ----------------------------data_file---------------------------
+    DATA_COMPRESS_CHUNK_SIZE = 4 * 1024 * 1024
+    DATA_COMPRESS_LEVEL = 1
+    BYTES_PER_MB = 1024 * 1024
+
     # ----------------------------CaseDesign--------------------------
     OP = 'op'
     INPUT_DESC = 'input_desc'
@@ -215,6 +234,13 @@ class ConstManager:
     REQUIRED_KEYS = [OP, INPUT_DESC, OUTPUT_DESC, CASE_NAME]
     ERROR_THRESHOLD = "error_threshold"
     DEFAULT_ERROR_THRESHOLD = [0.01, 0.05]
+    DEFAULT_MAX_DIFF_THRESHOLD = 0.1
+    PRECISION_CHUNK_SIZE = 1024 * 1024
+    MIN_RELATIVE_DENOMINATOR = 1e-10
+    # the count of the first and the last error elements to display
+    ERROR_DISPLAY_COUNT = 10
+    COMPARE_SUMMARY_JSON_FILE_NAME = 'compare_summary.json'
+    COMPARE_SUMMARY_CSV_FILE_NAME = 'compare_summary.csv'
     # --------------------------CaseGenerator---------------
     INI_INPUT = 'input'
     INI_OUTPUT = 'output'
@@ -227,6 +253,12 @@ class ConstManager:
     # dynamic shape scenario add keys as follows
     SHAPE_RANGE = 'shape_range'
     TYPICAL_SHAPE = 'typical_shape'
+    # all typical shapes of the case, swept with one compiled kernel
+    TYPICAL_SHAPE_SWEEP = 'typical_shape_sweep'
+    # count of shapes generated in shape_range for the sweep
+    SHAPE_SWEEP_COUNT = 'shape_sweep_count'
+    SHAPE_SWEEP_UNBOUNDED_FACTOR = 16
+    SHAPE_SWEEP_CASE_SUFFIX = '_shape'
     # Two dynamic scenarios: shape value is -1 or -2
     SHAPE_DYNAMIC_SCENARIOS_ONE = -1
     SHAPE_DYNAMIC_SCENARIOS_TWO = -2
@@ -235,6 +267,11 @@ class ConstManager:
     VALUE = 'value'
     IS_CONST = 'is_const'
     CONST_VALUE = 'const_value'
+    CONST_VALUE_FILE = 'const_value_file'
+    CONST_DATA_FILE_NAME = 'const_data.bin'
+    INPUT_STORE_DIR = 'input_store'
+    ACL_OP_JSON_FILE_NAME = 'acl_op.json'
+    ACL_OP_ATC_JSON_FILE_NAME = 'acl_op_atc.json'
     TEN_MB = 10 * 1024 * 1024
     MAX_NAME_LENGTH = 256
 
@@ -280,6 +317,8 @@ class ConstManager:
     TASK_DURATION_INDEX = 2
     TASK_ID_INDEX = 3
     OP = 'op'
+    # the output of command is read by chunk, see CommandExecutor
+    STREAM_READ_SIZE = 64 * 1024
 
     # -----------------Error report------------------------
     ERR_REPORT_HEADER = ['Index', 'ExpectOut', 'RealOut', 'FpDiff', 'RateDiff']
@@ -289,6 +328,11 @@ class ConstManager:
     # -----------------MsOpRunner------------------------
     TEST_PY = 'test_{op_name}.py'
     NEXT_LINE = '\n    '
+    MS_WORKER_AUTHKEY_LENGTH = 32
+    MS_WORKER_START_TIMEOUT = 300
+    MS_WORKER_CASE_TIMEOUT = 600
+    MS_WORKER_RUN_TIMEOUT = 3600
+    MS_WORKER_POLL_INTERVAL = 0.5
     # ------------------AdvanceIniArgs---------------------
     ADVANCE_SECTION = 'RUN'
     ASCEND_GLOBAL_LOG_LEVEL_LIST = ['0', '1', '2', '3', '4']
@@ -303,6 +347,11 @@ class ConstManager:
     EXPECT_SUCCESS = "success"
     EXPECT_FAILED = "failed"
 
+    # --------------------st_trace-----------------------
+    ST_TRACE_FILE_NAME = "st_trace.json"
+    TRACE_TOP_N = 10
+    US_PER_SECOND = 1000000
+
     def get_op_name(self):
         """
         get operator name
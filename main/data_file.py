@@ -0,0 +1,315 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Function:
+This file mainly involves the compressed test data file. The data is split
+into fixed size blocks compressed by zlib, the block offsets are stored at
+the end of the file, so a range of the data can be read without
+decompressing the whole file. The raw .bin file is read as before.
+File layout:
+MAGIC | chunk size(uint32) | raw size(uint64) | blocks | block offsets(uint64 * (n + 1))
+| index offset(uint64) | MAGIC
+Copyright Information:
+Huawei Technologies Co., Ltd. All Rights Reserved © 2021
+"""
+
+import os
+import time
+import zlib
+import shutil
+import struct
+
+import numpy as np
+
+from op_test_frame.st.interface import utils
+from op_test_frame.st.interface.const_manager import ConstManager
+
+_MAGIC = b'MSOPSTZ1'
+_HEADER = struct.Struct('<IQ')
+_FOOTER = struct.Struct('<Q')
+_OFFSET = struct.Struct('<Q')
+
+
+class DataCompressStats:
+    """
+    The class for statistics of compressing and decompressing test data.
+    """
+
+    def __init__(self):
+        self.file_cnt = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+        self.compress_seconds = 0.0
+        self.decompress_bytes = 0
+        self.decompress_seconds = 0.0
+
+    @staticmethod
+    def _get_throughput(data_bytes, seconds):
+        if seconds <= 0:
+            return 0.0
+        return data_bytes / ConstManager.BYTES_PER_MB / seconds
+
+    def add_compress(self, raw_bytes, stored_bytes, seconds):
+        """
+        add the statistics of a compressed file
+        """
+        self.file_cnt += 1
+        self.raw_bytes += raw_bytes
+        self.stored_bytes += stored_bytes
+        self.compress_seconds += seconds
+
+    def add_decompress(self, raw_bytes, seconds):
+        """
+        add the statistics of a decompressed file
+        """
+        self.decompress_bytes += raw_bytes
+        self.decompress_seconds += seconds
+
+    def to_json_obj(self):
+        """
+        generate json
+        :return: json
+        """
+        return {
+            "file count": self.file_cnt,
+            "raw bytes": self.raw_bytes,
+            "stored bytes": self.stored_bytes,
+            "compression ratio": self.raw_bytes / self.stored_bytes if self.stored_bytes else 0.0,
+            "compress seconds": self.compress_seconds,
+            "compress MB/s": self._get_throughput(self.raw_bytes, self.compress_seconds),
+            "decompress seconds": self.decompress_seconds,
+            "decompress MB/s": self._get_throughput(self.decompress_bytes, self.decompress_seconds)
+        }
+
+
+def is_compressed(file_path):
+    """
+    check the file is a compressed data file
+    :param file_path: the data file path
+    :return: True if the file starts with the magic
+    """
+    try:
+        with open(file_path, 'rb') as data_file:
+            return data_file.read(len(_MAGIC)) == _MAGIC
+    except OSError:
+        return False
+    finally:
+        pass
+
+
+def _write_compressed(raw_bytes, file_path, chunk_size):
+    raw_view = memoryview(raw_bytes).cast('B')
+    offsets = []
+    with os.fdopen(os.open(file_path, ConstManager.WRITE_FLAGS | os.O_TRUNC,
+                           ConstManager.WRITE_MODES), 'wb') as data_file:
+        data_file.write(_MAGIC)
+        data_file.write(_HEADER.pack(chunk_size, len(raw_view)))
+        offset = len(_MAGIC) + _HEADER.size
+        for start in range(0, len(raw_view), chunk_size):
+            block = zlib.compress(raw_view[start:start + chunk_size],
+                                  ConstManager.DATA_COMPRESS_LEVEL)
+            offsets.append(offset)
+            data_file.write(block)
+            offset += len(block)
+        offsets.append(offset)
+        for block_offset in offsets:
+            data_file.write(_OFFSET.pack(block_offset))
+        data_file.write(_FOOTER.pack(offset))
+        data_file.write(_MAGIC)
+        return data_file.tell()
+
+
+def save_data(data, file_path, compress=False, stats=None):
+    """
+    save the numpy data to file
+    :param data: the numpy data
+    :param file_path: the data file path
+    :param compress: True to save the compressed data file
+    :param stats: DataCompressStats object
+    """
+    if not compress:
+        data.tofile(file_path)
+        os.chmod(file_path, ConstManager.WRITE_MODES)
+        return
+    start_time = time.time()
+    stored_bytes = _write_compressed(np.ascontiguousarray(data), file_path,
+                                     ConstManager.DATA_COMPRESS_CHUNK_SIZE)
+    if stats is not None:
+        stats.add_compress(data.nbytes, stored_bytes, time.time() - start_time)
+
+
+def compress_file(file_path, stats=None):
+    """
+    compress the raw data file in place, the compressed file is not changed
+    :param file_path: the data file path
+    :param stats: DataCompressStats object
+    """
+    if is_compressed(file_path):
+        return
+    start_time = time.time()
+    raw_data = np.fromfile(file_path, np.uint8)
+    tmp_file_path = '%s.%d.tmp' % (file_path, os.getpid())
+    stored_bytes = _write_compressed(raw_data, tmp_file_path,
+                                     ConstManager.DATA_COMPRESS_CHUNK_SIZE)
+    # replace the link instead of writing through it
+    os.replace(tmp_file_path, file_path)
+    if stats is not None:
+        stats.add_compress(raw_data.nbytes, stored_bytes, time.time() - start_time)
+
+
+class CompressedDataReader:
+    """
+    The class for reading the compressed data file by block.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.data_file = open(file_path, 'rb')
+        try:
+            self._read_index()
+        except (OSError, ValueError, struct.error) as error:
+            self.data_file.close()
+            utils.print_error_log(
+                'The compressed data file %s is truncated or corrupt: %s'
+                % (file_path, error))
+            raise utils.OpTestGenException(
+                ConstManager.OP_TEST_GEN_READ_FILE_ERROR) from error
+
+    def _read_index(self):
+        header = self.data_file.read(len(_MAGIC) + _HEADER.size)
+        self.chunk_size, self.raw_size = _HEADER.unpack(header[len(_MAGIC):])
+        if not self.chunk_size:
+            raise ValueError('the chunk size is 0')
+        self.data_file.seek(-(_FOOTER.size + len(_MAGIC)), os.SEEK_END)
+        index_offset, = _FOOTER.unpack(self.data_file.read(_FOOTER.size))
+        block_cnt = (self.raw_size + self.chunk_size - 1) // self.chunk_size
+        self.data_file.seek(index_offset)
+        index = self.data_file.read(_OFFSET.size * (block_cnt + 1))
+        if len(index) != _OFFSET.size * (block_cnt + 1):
+            raise ValueError('the block index is incomplete')
+        self.offsets = [item[0] for item in _OFFSET.iter_unpack(index)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        close the data file
+        """
+        self.data_file.close()
+
+    def read_block(self, block_index):
+        """
+        read and decompress one block
+        :param block_index: the block index
+        :return: the raw bytes of the block
+        """
+        self.data_file.seek(self.offsets[block_index])
+        return zlib.decompress(self.data_file.read(
+            self.offsets[block_index + 1] - self.offsets[block_index]))
+
+    def read(self, start=0, size=None):
+        """
+        read the raw bytes in range, only the blocks in range are decompressed
+        :param start: the start byte of raw data
+        :param size: the byte count, None for all bytes after start
+        :return: bytearray of raw data
+        """
+        end = self.raw_size if size is None else min(start + size, self.raw_size)
+        raw_bytes = bytearray(max(end - start, 0))
+        pos = start
+        while pos < end:
+            block_index = pos // self.chunk_size
+            block_start = block_index * self.chunk_size
+            block = self.read_block(block_index)
+            copy_end = min(end, block_start + len(block))
+            raw_bytes[pos - start:copy_end - start] = block[pos - block_start:copy_end - block_start]
+            pos = copy_end
+        return raw_bytes
+
+
+def load_data_range(file_path, dtype, start, count, stats=None):
+    """
+    load part of the numpy data, used to compare the large data by chunk
+    :param file_path: the data file path
+    :param dtype: the numpy data type
+    :param start: the start element index
+    :param count: the element count
+    :param stats: DataCompressStats object
+    :return: the flatten numpy data
+    """
+    item_size = np.dtype(dtype).itemsize
+    if not is_compressed(file_path):
+        return np.fromfile(file_path, dtype, count=count, offset=start * item_size)
+    start_time = time.time()
+    with CompressedDataReader(file_path) as reader:
+        raw_bytes = reader.read(start * item_size, count * item_size)
+    if stats is not None:
+        stats.add_decompress(len(raw_bytes), time.time() - start_time)
+    return np.frombuffer(raw_bytes, dtype)
+
+
+class DataFileArray:
+    """
+    The class for the flatten numpy data of a raw or compressed data file.
+    The elements are read by load_data_range when they are indexed, so the
+    large data is compared chunk by chunk without loading the whole file.
+    """
+
+    def __init__(self, file_path, dtype, stats=None):
+        self.file_path = file_path
+        self.dtype = np.dtype(dtype)
+        self.size = get_data_size(file_path) // self.dtype.itemsize
+        self.stats = stats
+
+    def reshape(self, shape):
+        """
+        the data is flatten, only reshape(-1) is supported
+        """
+        if shape != -1:
+            raise ValueError('The data of %s can only be reshaped to -1.' % self.file_path)
+        return self
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.size)
+            if step != 1:
+                raise ValueError('The data of %s can not be read by step %d.' % (self.file_path, step))
+            return load_data_range(self.file_path, self.dtype, start, max(stop - start, 0), self.stats)
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError('The index %d is out of the data size %d.' % (index, self.size))
+        return load_data_range(self.file_path, self.dtype, index, 1, self.stats)[0]
+
+
+def get_data_size(file_path):
+    """
+    get the raw data size of the data file
+    :param file_path: the data file path
+    :return: the byte count of raw data
+    """
+    if not is_compressed(file_path):
+        return os.path.getsize(file_path)
+    with CompressedDataReader(file_path) as reader:
+        return reader.raw_size
+
+
+def copy_raw_data(src_path, dst_path):
+    """
+    copy the data file, the compressed file is decompressed, because the acl
+    runner only reads the raw data
+    :param src_path: the source data file
+    :param dst_path: the destination data file
+    """
+    if not is_compressed(src_path):
+        shutil.copyfile(src_path, dst_path)
+        return
+    with CompressedDataReader(src_path) as reader, \
+            os.fdopen(os.open(dst_path, ConstManager.WRITE_FLAGS | os.O_TRUNC,
+                              ConstManager.WRITE_MODES), 'wb') as dst_file:
+        for block_index in range(len(reader.offsets) - 1):
+            dst_file.write(reader.read_block(block_index))
@@ -13,11 +13,15 @@ import os
 import importlib
 import functools
 import time
+import json
+import hashlib
 
 import numpy as np
 
 from op_test_frame.st.interface import utils
 from op_test_frame.st.interface import dynamic_handle
+from op_test_frame.st.interface import rerun_handle
+from op_test_frame.st.interface import data_file
 from op_test_frame.st.interface.const_manager import ConstManager
 
 
@@ -26,9 +30,17 @@ class DataGenerator:
     The class for data generator.
     """
 
-    def __init__(self, case_list, output_path, cmd_mi, report):
+    def __init__(self, case_list, output_path, cmd_mi, report,
+                 rerun_case_info=None, compress_data=False):
         self.case_list = case_list
         self.report = report
+        # the expect data is only read by result compare, it can be
+        # compressed, the input data is read by the acl runner as raw data.
+        self.compress_data = compress_data
+        # dict of case name and OpSTCase of previous run, for rerun failed,
+        # it is the cases of --rerun-failed if not specified
+        self.rerun_case_info = rerun_case_info if rerun_case_info is not None \
+            else rerun_handle.get_rerun_case_info()
         if cmd_mi:
             self.output_path = os.path.join(output_path, 'run', 'out',
                                             'test_data', 'data')
@@ -36,6 +48,13 @@ class DataGenerator:
             op_name_path = os.path.join(output_path, case_list[0]['op'])
             self.output_path = os.path.join(output_path, op_name_path, 'run',
                                             'out', 'test_data', 'data')
+        # the identical input is generated once in the store, the input
+        # file of each case is linked to it.
+        self.input_store_path = os.path.join(self.output_path, ConstManager.INPUT_STORE_DIR)
+        # {spec key: (store file path, dtype, shape)}
+        self.input_store = {}
+        self.shared_input_cnt = 0
+        self.shared_input_bytes = 0
 
     @staticmethod
     def gen_data(data_shape, min_value, max_value, dtype,
@@ -142,6 +161,34 @@ class DataGenerator:
         data.tofile(file_path)
         os.chmod(file_path, ConstManager.WRITE_MODES)
 
+    @staticmethod
+    def _get_input_spec_key(input_index, input_shape, input_desc):
+        # the inputs of different cases with the same index and spec have the
+        # same data, the inputs of one case are always generated separately,
+        # like x1 and x2 of sub. The format and attrs are not considered.
+        value = input_desc.get('value')
+        if isinstance(value, str):
+            value = os.path.realpath(value)
+        spec = [input_index, list(input_shape), input_desc.get('type'), input_desc.get('value_range'),
+                input_desc.get('data_distribute'), value]
+        try:
+            spec_str = json.dumps(spec, sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        finally:
+            pass
+        return hashlib.sha256(spec_str.encode()).hexdigest()
+
+    @staticmethod
+    def _link_data(src_path, dst_path):
+        # hardlink first, the file is kept if the store is deleted
+        try:
+            os.link(src_path, dst_path)
+        except OSError:
+            os.symlink(src_path, dst_path)
+        finally:
+            pass
+
     @staticmethod
     def _get_expect_result_tensors(module, expect_func, calc_func_params_tmp):
         func = getattr(module, expect_func)
@@ -181,49 +228,102 @@ class DataGenerator:
                 utils.print_info_log("There are no inputs. Skip generating input data.")
                 return
             case_name = case.get('case_name')
-            utils.print_info_log(
-                'Start to generate the input data for %s.' % case_name)
-            param_info = ""
-            # get intput  and output param
-            param_info_list, calc_func_params_tmp = \
-                self._generate_params_desc(case, case_name)
-            # get attr param
-            if case.get('attr'):
-                for _, attr in enumerate(case.get('attr')):
-                    attr_name = attr.get('name')
-                    param_info_list.append("{attr_name}".format(
-                        attr_name=attr_name))
-                    calc_func_params_tmp.update(
-                        {attr_name: attr.get('value')})
-            if case.get("calc_expect_func_file") \
-                    and case.get("calc_expect_func_file_func"):
-                param_info += ', '.join(param_info_list)
-                utils.print_info_log(
-                    '-------------------------------->>>>>> Expect function information <<<<<<-----------------------')
-                utils.print_info_log(
-                    "The parameter information passed by user's cases is: %s(%s)."
-                    % (case.get("calc_expect_func_file_func"), param_info))
-                utils.print_info_log("Please ensure that the above parameters "
-                                     "in the expected function are consistent.")
-                utils.print_info_log(
-                    '------------------------------------------------------------------------------------------------')
-            expect_data_paths = self._generate_expect_data(
-                case, calc_func_params_tmp)
-            # deal with report
-            case_report = self.report.get_case_report(case_name)
-            case_report.trace_detail.st_case_info.input_data_paths = \
-                self.output_path
-            if expect_data_paths:
-                case_report.trace_detail.st_case_info.expect_data_paths = \
-                    expect_data_paths
-                utils.print_info_log(
-                    'Finish to generator the expect output data for '
-                    '%s.' % case_name)
+            with self.report.tracer.span('generate_data', case_name) as trace_span:
+                if not self._reuse_previous_data(case, case_name):
+                    self._generate_case_data(case, case_name)
+                trace_span.bytes_processed = self._get_case_data_bytes(
+                    case, case_name)
         gen_data_end = time.time()
         utils.print_info_log('Generate data execute time: %f s.'
                              % (gen_data_end - gen_data_start))
+        if self.shared_input_cnt:
+            utils.print_info_log(
+                '%d inputs (%d bytes) are shared with identical inputs in %s.'
+                % (self.shared_input_cnt, self.shared_input_bytes, self.input_store_path))
         utils.print_info_log("Generate data for testcase in %s." % self.output_path)
 
+    def _generate_case_data(self, case, case_name):
+        utils.print_info_log(
+            'Start to generate the input data for %s.' % case_name)
+        param_info = ""
+        # get intput  and output param
+        param_info_list, calc_func_params_tmp = \
+            self._generate_params_desc(case, case_name)
+        # get attr param
+        if case.get('attr'):
+            for _, attr in enumerate(case.get('attr')):
+                attr_name = attr.get('name')
+                param_info_list.append("{attr_name}".format(
+                    attr_name=attr_name))
+                calc_func_params_tmp.update(
+                    {attr_name: attr.get('value')})
+        if case.get("calc_expect_func_file") \
+                and case.get("calc_expect_func_file_func"):
+            param_info += ', '.join(param_info_list)
+            utils.print_info_log(
+                '-------------------------------->>>>>> Expect function information <<<<<<-----------------------')
+            utils.print_info_log(
+                "The parameter information passed by user's cases is: %s(%s)."
+                % (case.get("calc_expect_func_file_func"), param_info))
+            utils.print_info_log("Please ensure that the above parameters "
+                                 "in the expected function are consistent.")
+            utils.print_info_log(
+                '------------------------------------------------------------------------------------------------')
+        expect_data_paths = self._generate_expect_data(
+            case, calc_func_params_tmp)
+        # deal with report
+        case_report = self.report.get_case_report(case_name)
+        case_report.trace_detail.st_case_info.input_data_paths = \
+            self.output_path
+        if expect_data_paths:
+            case_report.trace_detail.st_case_info.expect_data_paths = \
+                expect_data_paths
+            utils.print_info_log(
+                'Finish to generator the expect output data for '
+                '%s.' % case_name)
+
+    def _get_case_data_bytes(self, case, case_name):
+        data_paths = [os.path.join(self.output_path, case_name + '_input_' + str(index) + '.bin')
+                      for index in range(len(case.get('input_desc')))]
+        case_info = self.report.get_case_report(case_name).trace_detail.st_case_info
+        if case_info.expect_data_paths:
+            data_paths.extend(case_info.expect_data_paths)
+        return sum(data_file.get_data_size(path) for path in data_paths if os.path.isfile(path))
+
+    def _reuse_previous_data(self, case, case_name):
+        """
+        copy input and expect data of previous run for rerun failed case
+        :return: True if the data of previous run is reused
+        """
+        if not self.rerun_case_info:
+            return False
+        previous_case_info = self.rerun_case_info.get(case_name)
+        input_paths = rerun_handle.get_previous_input_paths(
+            previous_case_info, case)
+        expect_paths = previous_case_info.expect_data_paths \
+            if previous_case_info else None
+        if not input_paths or (expect_paths and not all(
+                os.path.isfile(path) for path in expect_paths)):
+            utils.print_warn_log(
+                'The data of previous run for %s is incomplete, generate it '
+                'again.' % case_name)
+            return False
+        utils.print_info_log(
+            'Reuse the data of previous run in %s for %s.'
+            % (previous_case_info.input_data_paths, case_name))
+        for input_path in input_paths:
+            rerun_handle.copy_previous_data(input_path, self.output_path)
+        case_report = self.report.get_case_report(case_name)
+        case_report.trace_detail.st_case_info.input_data_paths = \
+            self.output_path
+        if expect_paths:
+            expect_data_dir = os.path.join(self.output_path, 'expect')
+            utils.make_dirs(expect_data_dir)
+            case_report.trace_detail.st_case_info.expect_data_paths = [
+                rerun_handle.copy_previous_data(path, expect_data_dir)
+                for path in expect_paths]
+        return True
+
     def _gen_op_iput_data(self, input_shape, input_desc):
         range_min, range_max = input_desc.get('value_range')
         dtype = input_desc.get('type')
@@ -248,7 +348,7 @@ class DataGenerator:
             pass
         return data
 
-    def _get_input_dict_with_data(self, input_desc, file_path, input_shape):
+    def _get_input_dict_with_data(self, input_index, input_desc, file_path, input_shape):
         """
         Data generation modes in two scenarios are considered.s:
         1.Trans data 2.constant data
@@ -259,7 +359,7 @@ class DataGenerator:
         if is_const_distribute:
             input_dic = self._get_const_data_input_dict(input_desc, file_path, input_shape)
         else:
-            input_dic = self._get_trans_data_input_dict(input_desc, file_path, input_shape)
+            input_dic = self._get_trans_data_input_dict(input_index, input_desc, file_path, input_shape)
         return input_dic
 
     def _get_const_data_input_dict(self, input_desc, file_path, input_shape):
@@ -275,22 +375,20 @@ class DataGenerator:
         }
         return input_dic
 
-    def _get_trans_data_input_dict(self, input_desc, file_path, input_shape):
+    def _get_trans_data_input_dict(self, input_index, input_desc, file_path, input_shape):
         if os.path.exists(file_path):
             utils.print_error_log(
                 'The file %s already exists, please delete it then'
                 ' retry.' % file_path)
             raise utils.OpTestGenException(
                 ConstManager.OP_TEST_GEN_WRITE_FILE_ERROR)
-        data = self._gen_input_data(input_shape, input_desc, file_path)
-        input_dic = {
-            'value': data,
-            'dtype': input_desc.get('type'),
-            'shape': input_shape,
-            'format': input_desc.get('format')
-        }
+        spec_key = self._get_input_spec_key(input_index, input_shape, input_desc)
         try:
-            self._save_data(data, file_path)
+            if spec_key in self.input_store:
+                data = self._load_shared_data(spec_key, file_path)
+            else:
+                data = self._gen_input_data(input_shape, input_desc, file_path)
+                self._save_shared_data(data, spec_key, file_path)
         except OSError as error:
             utils.print_warn_log(
                 'Failed to generate data for %s. %s' % (
@@ -298,8 +396,36 @@ class DataGenerator:
             raise utils.OpTestGenException(ConstManager.OP_TEST_GEN_WRITE_FILE_ERROR) from error
         finally:
             pass
+        input_dic = {
+            'value': data,
+            'dtype': input_desc.get('type'),
+            'shape': input_shape,
+            'format': input_desc.get('format')
+        }
         return input_dic
 
+    def _save_shared_data(self, data, spec_key, file_path):
+        if spec_key is None:
+            self._save_data(data, file_path)
+            return
+        store_file_path = os.path.join(self.input_store_path, spec_key[:32] + '.bin')
+        if not os.path.isdir(self.input_store_path):
+            utils.make_dirs(self.input_store_path)
+        if os.path.exists(store_file_path):
+            # generated by previous run, the linked files are not changed
+            os.remove(store_file_path)
+        self._save_data(data, store_file_path)
+        self._link_data(store_file_path, file_path)
+        self.input_store[spec_key] = (store_file_path, str(data.dtype), data.shape)
+
+    def _load_shared_data(self, spec_key, file_path):
+        store_file_path, dtype, shape = self.input_store.get(spec_key)
+        self._link_data(store_file_path, file_path)
+        data = np.fromfile(store_file_path, dtype=dtype).reshape(shape)
+        self.shared_input_cnt += 1
+        self.shared_input_bytes += data.nbytes
+        return data
+
     def _get_input_desc_and_gen_data(
             self, case, case_name, calc_func_params_tmp, param_info_list):
         """
@@ -314,7 +440,7 @@ class DataGenerator:
             file_path = os.path.join(
                 self.output_path,
                 case_name + '_input_' + str(index) + '.bin')
-            input_dict = self._get_input_dict_with_data(input_desc, file_path, input_shape)
+            input_dict = self._get_input_dict_with_data(index, input_desc, file_path, input_shape)
             if input_desc.get('name'):
                 input_name = input_desc.get('name')
                 calc_func_params_tmp.update(
@@ -391,7 +517,8 @@ class DataGenerator:
                     case.get('case_name'), str(idx), output_dtype)
                 expect_data_path = os.path.join(expect_data_dir,
                                                 expect_data_name)
-                expect_result_tensor.tofile(expect_data_path)
+                data_file.save_data(expect_result_tensor, expect_data_path,
+                                    self.compress_data, self.report.compress_stats)
                 utils.print_info_log("Successfully generated expect "
                                      "data:%s." % expect_data_path)
                 expect_data_paths.append(expect_data_path)
@@ -6,6 +6,8 @@ This method mainly handle the dynamic scenario.
 Copyright Information:
 Huawei Technologies Co., Ltd. All Rights Reserved © 2021
 """
+import copy
+
 from op_test_frame.st.interface import utils
 from op_test_frame.st.interface.const_manager import ConstManager
 
@@ -54,6 +56,95 @@ def check_not_dynamic_shape(shape_list):
     return dynamic_shape_count
 
 
+def _generate_shapes_in_range(shape, shape_range, sweep_count):
+    """
+    generate shapes evenly within shape_range for the -1 dims
+    """
+    dynamic_dims = [index for index, dim in enumerate(shape)
+                    if dim == ConstManager.SHAPE_DYNAMIC_SCENARIOS_ONE]
+    if not dynamic_dims:
+        return []
+    # shape_range is given for each dim, or only for the dynamic dims
+    if len(shape_range) == len(shape):
+        dim_ranges = [shape_range[index] for index in dynamic_dims]
+    elif len(shape_range) == len(dynamic_dims):
+        dim_ranges = shape_range
+    else:
+        utils.print_warn_log(
+            'The shape_range(%s) does not match the shape(%s), skip '
+            'generating shapes in it.' % (shape_range, shape))
+        return []
+    shape_list = []
+    for sweep_index in range(sweep_count):
+        new_shape = list(shape)
+        for dim_index, (min_dim, max_dim) in zip(dynamic_dims, dim_ranges):
+            min_dim = max(min_dim, 1)
+            if max_dim == ConstManager.SHAPE_DYNAMIC_SCENARIOS_ONE:
+                max_dim = min_dim * ConstManager.SHAPE_SWEEP_UNBOUNDED_FACTOR
+            step = (max_dim - min_dim) / (sweep_count - 1) if sweep_count > 1 else 0
+            new_shape[dim_index] = int(round(min_dim + step * sweep_index))
+        if new_shape not in shape_list:
+            shape_list.append(new_shape)
+    return shape_list
+
+
+def _get_typical_shape_sweep(cur_params, tensor, typical_shape_list):
+    """
+    get all typical shapes to sweep, the typical_shape list and the shapes
+    generated in shape_range if shape_sweep_count is set
+    """
+    typical_shape_list = list(typical_shape_list)
+    sweep_count = tensor.get(ConstManager.SHAPE_SWEEP_COUNT)
+    shape_range = cur_params.get(ConstManager.SHAPE_RANGE)
+    if sweep_count and shape_range:
+        for shape in _generate_shapes_in_range(
+                cur_params.get('shape'), shape_range, sweep_count[0]):
+            if shape not in typical_shape_list:
+                typical_shape_list.append(shape)
+    return typical_shape_list
+
+
+def expand_typical_shape_sweep(case):
+    """
+    expand the dynamic shape case to one case for each typical shape. All
+    the expanded cases have the same op description in acl_op.json, so the
+    kernel is compiled once and run with each shape. The first case keeps
+    the case name, the others are named <case_name>_shape<index>.
+    :param case: the test case
+    :return: the list of test case
+    """
+    desc_list = case.get(ConstManager.INPUT_DESC, []) + \
+        case.get(ConstManager.OUTPUT_DESC, [])
+    sweep_counts = set(len(desc.get(ConstManager.TYPICAL_SHAPE_SWEEP))
+                       for desc in desc_list
+                       if desc.get(ConstManager.TYPICAL_SHAPE_SWEEP))
+    if not sweep_counts:
+        return [case]
+    if len(sweep_counts) > 1:
+        utils.print_warn_log(
+            'The number of typical shapes to sweep is different among the '
+            'inputs and outputs of %s, the last one is reused for the shorter.'
+            % case.get(ConstManager.CASE_NAME))
+    case_list = []
+    for sweep_index in range(max(sweep_counts)):
+        sweep_case = copy.deepcopy(case)
+        for desc in sweep_case.get(ConstManager.INPUT_DESC, []) + \
+                sweep_case.get(ConstManager.OUTPUT_DESC, []):
+            typical_shape_list = desc.pop(ConstManager.TYPICAL_SHAPE_SWEEP, None)
+            if typical_shape_list:
+                desc[ConstManager.TYPICAL_SHAPE] = typical_shape_list[
+                    min(sweep_index, len(typical_shape_list) - 1)]
+        # the first shape keeps the case name, the case runs it as before
+        if sweep_index > 0:
+            sweep_case[ConstManager.CASE_NAME] = '%s%s%d' % (
+                case.get(ConstManager.CASE_NAME),
+                ConstManager.SHAPE_SWEEP_CASE_SUFFIX, sweep_index)
+        case_list.append(sweep_case)
+    utils.print_info_log('Sweep %d typical shapes for the dynamic shape case %s.'
+                         % (len(case_list), case.get(ConstManager.CASE_NAME)))
+    return case_list
+
+
 def set_typical_shape_in_cur_params(cur_params, tensor, current_json_path):
     """
     update cur_params dict
@@ -71,7 +162,12 @@ def set_typical_shape_in_cur_params(cur_params, tensor, current_json_path):
                 raise utils.OpTestGenException(
                     ConstManager.OP_TEST_GEN_NONE_TYPICAL_SHAPE_ERROR)
             if typical_shape_list is not None:
+                typical_shape_list = _get_typical_shape_sweep(
+                    cur_params, tensor, typical_shape_list)
                 cur_params.update({ConstManager.TYPICAL_SHAPE: typical_shape_list[0]})
+                if len(typical_shape_list) > 1:
+                    cur_params.update({
+                        ConstManager.TYPICAL_SHAPE_SWEEP: typical_shape_list})
             # dynamic shape scenarios two, need to remove shape_range.
             if dim == ConstManager.SHAPE_DYNAMIC_SCENARIOS_TWO \
                     and cur_params.get(ConstManager.SHAPE_RANGE):
@@ -8,6 +8,7 @@ Huawei Technologies Co., Ltd. All Rights Reserved © 2021
 Change History: 2021-04-12 file Created
 """
 import os
+import marshal
 
 from op_test_frame.st.interface import utils
 from op_test_frame.st.interface.const_manager import ConstManager
@@ -19,6 +20,7 @@ class WhiteLists:
     """
     def __init__(self):
         self.format_map = None
+        self.format_list = None
         self.type_list = None
         self.mindspore_type_list = None
         self.data_distribution_list = None
@@ -30,14 +32,56 @@ class WhiteLists:
         """
         config_dir = os.path.join(os.path.dirname(__file__), "..")
         config_path = os.path.join(config_dir, "config", ConstManager.WHITE_LIST_FILE_NAME)
-        config_dict = utils.load_json_file(config_path)
+        config_dict = self._load_config_cache(config_path)
+        if config_dict is None:
+            config_dict = utils.load_json_file(config_path)
+            self._save_config_cache(config_path, config_dict)
         self.format_map = config_dict.get(ConstManager.FORMAT_ENUM_MAP)
+        self.format_list = list(self.format_map.keys()) if self.format_map else []
         self.type_list = config_dict.get(ConstManager.DTYPE_LIST)
         self.mindspore_type_list = config_dict.get(ConstManager.MINDSPORE_DTYPE_LIST)
         self.data_distribution_list = config_dict.get(ConstManager.DATA_DISTRIBUTION_LIST)
         self.aicpu_ir2ini_type_map = config_dict.get(ConstManager.AICPU_PROTO2INI_TYPE_MAP)
         return config_dict
 
+    @staticmethod
+    def _get_config_cache_key(config_path):
+        config_stat = os.stat(config_path)
+        return [os.path.realpath(config_path), config_stat.st_mtime_ns, config_stat.st_size]
+
+    @staticmethod
+    def _load_config_cache(config_path):
+        """
+        load the marshal cache of white list json, invalidated by json path,
+        mtime and size.
+        :return: config dict, None if cache is unavailable
+        """
+        try:
+            with open(ConstManager.WHITE_LIST_CACHE_PATH, 'rb') as cache_file:
+                cache_key, config_dict = marshal.load(cache_file)
+            if cache_key == WhiteLists._get_config_cache_key(config_path):
+                return config_dict
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        finally:
+            pass
+        return None
+
+    @staticmethod
+    def _save_config_cache(config_path, config_dict):
+        cache_path = ConstManager.WHITE_LIST_CACHE_PATH
+        try:
+            os.makedirs(os.path.dirname(cache_path), ConstManager.FOLDER_MASK, exist_ok=True)
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            with os.fdopen(os.open(cache_path, ConstManager.WRITE_FLAGS,
+                                   ConstManager.WRITE_MODES), 'wb') as cache_file:
+                marshal.dump([WhiteLists._get_config_cache_key(config_path), config_dict], cache_file)
+        except (OSError, ValueError):
+            utils.print_warn_log("Failed to save white lists cache to %s." % cache_path)
+        finally:
+            pass
+
     def get_aicpu_ir2ini_type_map(self):
         """
         Get aicpu_ir2ini_type_map
@@ -71,3 +115,12 @@ class GlobalConfig:
         Get white lists
         """
         return self.white_lists
+
+
+class LazyWhiteLists:
+    """
+    The descriptor for white lists class attribute, the white lists are
+    loaded on first access instead of at class definition time.
+    """
+    def __get__(self, instance, owner):
+        return GlobalConfig.instance().white_lists
@@ -9,16 +9,24 @@ Change History: 2020-07-11 file Created
 """
 
 import os
+import copy
+import json
+import hashlib
 import importlib
 
 from op_test_frame.st.interface import utils
 from op_test_frame.st.interface.const_manager import ConstManager
 
+_FRAMEWORK_CONFIG = {}
+_MODEL_NODE_INDEXES = {}
+
 
 def _get_framework_type(path):
-    cur_dir = os.path.split(os.path.realpath(__file__))[0]
-    config_path = os.path.join(cur_dir, ConstManager.FRAMEWORK_CONFIG_PATH)
-    framework_dict = utils.load_json_file(config_path)
+    if not _FRAMEWORK_CONFIG:
+        cur_dir = os.path.split(os.path.realpath(__file__))[0]
+        config_path = os.path.join(cur_dir, ConstManager.FRAMEWORK_CONFIG_PATH)
+        _FRAMEWORK_CONFIG.update(utils.load_json_file(config_path))
+    framework_dict = _FRAMEWORK_CONFIG
     suffix_list = []
     for (key, value) in list(framework_dict.items()):
         for item in value:
@@ -32,14 +40,20 @@ def _get_framework_type(path):
         ConstManager.OP_TEST_GEN_INVALID_PARAM_ERROR)
 
 
-def _function_call(args, op_type, func_name):
-    framework = _get_framework_type(args.model_path)
+def _get_framework_module(model_path):
+    framework = _get_framework_type(model_path)
     module_name = 'op_test_frame.st.interface.framework.%s_model_parser' % \
                   framework
     utils.print_info_log("Start to import %s." % module_name)
-    module = importlib.import_module(module_name)
+    return importlib.import_module(module_name)
+
+
+def _function_call(args, op_type, func_name):
+    module = _get_framework_module(args.model_path)
     func = getattr(module, func_name)
     try:
+        if func_name == ConstManager.GET_ALL_MODEL_NODES_FUNC:
+            return func(args)
         return func(args, op_type)
     except Exception as ex:
         utils.print_error_log(
@@ -49,6 +63,202 @@ def _function_call(args, op_type, func_name):
         pass
 
 
+def _get_model_hash(model_path):
+    """
+    get the sha256 of the model file, the hash is cached by path, mtime and
+    size, so a large model is not read again if it is not changed.
+    :param model_path: the model path
+    :return: the hash string
+    """
+    model_stat = os.stat(model_path)
+    stat_key = [model_path, model_stat.st_mtime_ns, model_stat.st_size]
+    hash_cache_path = os.path.join(
+        ConstManager.MSOPST_CACHE_DIR, ConstManager.MODEL_HASH_FILE_NAME %
+        hashlib.sha256(model_path.encode()).hexdigest()[:16])
+    try:
+        with open(hash_cache_path) as hash_cache_file:
+            cache_key, model_hash = json.load(hash_cache_file)
+        if cache_key == stat_key:
+            return model_hash
+    except (OSError, ValueError, TypeError):
+        pass
+    finally:
+        pass
+    sha256 = hashlib.sha256()
+    with open(model_path, 'rb') as model_file:
+        for chunk in iter(lambda: model_file.read(ConstManager.MODEL_HASH_CHUNK_SIZE), b''):
+            sha256.update(chunk)
+    model_hash = sha256.hexdigest()
+    _save_json_atomic(hash_cache_path, [stat_key, model_hash])
+    return model_hash
+
+
+def _get_parse_args_key(args):
+    """
+    get the sha256 of the arguments which may change the nodes parsed from
+    the model, the op info file, output and log arguments are ignored.
+    :param args: the argument
+    :return: the hash string
+    """
+    parse_args = {name: value for name, value in vars(args).items()
+                  if name not in ConstManager.MODEL_INDEX_IGNORED_ARGS and
+                  isinstance(value, (str, int, float, bool, list, tuple, type(None)))}
+    return hashlib.sha256(json.dumps(parse_args, sort_keys=True).encode()).hexdigest()
+
+
+def _save_json_atomic(json_path, json_obj):
+    tmp_json_path = '%s.%d.tmp' % (json_path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(json_path), ConstManager.FOLDER_MASK, exist_ok=True)
+        with os.fdopen(os.open(tmp_json_path, ConstManager.WRITE_FLAGS,
+                               ConstManager.WRITE_MODES), 'w') as json_file:
+            json.dump(json_obj, json_file)
+        # replace atomically, the file may be read by other processes
+        os.replace(tmp_json_path, json_path)
+    except (OSError, TypeError, ValueError) as error:
+        utils.print_warn_log('Failed to save %s. %s' % (json_path, str(error)))
+    finally:
+        pass
+
+
+class ModelNodeIndex:
+    """
+    The class for index of op type to model nodes. The model is parsed once
+    and the index is cached on disk keyed by the model file hash and the
+    parse arguments.
+    """
+
+    def __init__(self, model_path, args_key):
+        self.model_path = os.path.realpath(model_path)
+        self.index_path = os.path.join(
+            ConstManager.MSOPST_CACHE_DIR, ConstManager.MODEL_NODE_INDEX_FILE_NAME
+            % (_get_model_hash(self.model_path), args_key[:16]))
+        # {op type: [node]}
+        self.op_nodes = {}
+        # all op types of the model are parsed
+        self.is_complete = False
+
+    def load(self):
+        """
+        load the index from disk
+        :return: self
+        """
+        index_obj = self._load_index_file()
+        self.op_nodes.update(index_obj.get('op_nodes', {}))
+        self.is_complete = index_obj.get('is_complete') is True
+        return self
+
+    def save(self):
+        """
+        save the index to disk, merged with the index saved by other process
+        """
+        index_obj = self._load_index_file()
+        op_nodes = index_obj.get('op_nodes', {})
+        op_nodes.update(self.op_nodes)
+        _save_json_atomic(self.index_path, {
+            'model_path': self.model_path,
+            'is_complete': self.is_complete or index_obj.get('is_complete') is True,
+            'op_nodes': op_nodes})
+
+    def _load_index_file(self):
+        try:
+            with open(self.index_path) as index_file:
+                index_obj = json.load(index_file)
+            if isinstance(index_obj, dict):
+                return index_obj
+        except (OSError, ValueError):
+            pass
+        finally:
+            pass
+        return {}
+
+    def get_nodes(self, args, op_type):
+        """
+        get the nodes of op type, parse the model if it is not indexed
+        :param args: the argument
+        :param op_type: the op type
+        :return: the list of nodes
+        """
+        if op_type not in self.op_nodes:
+            if self.is_complete:
+                return []
+            if hasattr(_get_framework_module(self.model_path),
+                       ConstManager.GET_ALL_MODEL_NODES_FUNC):
+                return self.get_all_nodes(args).get(op_type, [])
+            self.op_nodes[op_type] = _function_call(
+                args, op_type, ConstManager.GET_MODEL_NODES_FUNC)
+            self.save()
+        else:
+            utils.print_info_log('Get "%s" nodes from model node index %s.'
+                                 % (op_type, self.index_path))
+        return copy.deepcopy(self.op_nodes.get(op_type))
+
+    def get_all_nodes(self, args):
+        """
+        get the nodes of all op types in the model
+        :param args: the argument
+        :return: dict of op type and the list of nodes
+        """
+        if not self.is_complete:
+            self.op_nodes = {}
+            for node in _function_call(args, '', ConstManager.GET_ALL_MODEL_NODES_FUNC):
+                self.op_nodes.setdefault(node.get('op_type'), []).append(node)
+            self.is_complete = True
+            self.save()
+        return copy.deepcopy(self.op_nodes)
+
+
+def get_model_node_index(args):
+    """
+    get the node index of the model, it is loaded once per process for the
+    same parse arguments
+    :param args: the argument
+    :return: ModelNodeIndex object
+    """
+    model_path = os.path.realpath(args.model_path)
+    index_key = (model_path, _get_parse_args_key(args))
+    if index_key not in _MODEL_NODE_INDEXES:
+        utils.check_path_valid(model_path)
+        _MODEL_NODE_INDEXES[index_key] = ModelNodeIndex(*index_key).load()
+    return _MODEL_NODE_INDEXES.get(index_key)
+
+
+def prepare_model_node_index(args):
+    """
+    parse all op types of the model into the index if the framework parser
+    supports it, so the later queries of each op type do not parse again.
+    :param args: the argument
+    """
+    index = get_model_node_index(args)
+    if index.is_complete:
+        return
+    if hasattr(_get_framework_module(args.model_path),
+               ConstManager.GET_ALL_MODEL_NODES_FUNC):
+        index.get_all_nodes(args)
+    else:
+        utils.print_warn_log(
+            'The parser of model "%s" does not support getting all nodes, '
+            'the model is parsed once for each op type.' % args.model_path)
+
+
+def get_all_model_nodes(args):
+    """
+    get nodes of all op types in the model, the framework parser module
+    should implement get_all_model_nodes(args).
+    :param args: the argument
+    :return: dict of op type and the list of nodes
+    """
+    index = get_model_node_index(args)
+    if not index.is_complete and not hasattr(
+            _get_framework_module(args.model_path),
+            ConstManager.GET_ALL_MODEL_NODES_FUNC):
+        utils.print_error_log(
+            'The parser of model "%s" does not support getting all nodes.'
+            % args.model_path)
+        raise utils.OpTestGenException(ConstManager.OP_TEST_GEN_INVALID_PARAM_ERROR)
+    return index.get_all_nodes(args)
+
+
 def get_model_nodes(args, op_type):
     """
     get model nodes by framework
@@ -66,7 +276,7 @@ def get_model_nodes(args, op_type):
     "attr": [{'name :'T', type:'type', value:'AT_FLOAT'}]
     }]
     """
-    return _function_call(args, op_type, ConstManager.GET_MODEL_NODES_FUNC)
+    return get_model_node_index(args).get_nodes(args, op_type)
 
 
 def get_shape(args):
@@ -8,12 +8,12 @@ Huawei Technologies Co., Ltd. All Rights Reserved Â© 2020-201
 """
 
 import os
-import subprocess
 
 from op_test_frame.common import op_status
 from op_test_frame.st.interface.const_manager import ConstManager
 from op_test_frame.st.interface import utils
 from op_test_frame.st.interface import op_st_case_info
+from op_test_frame.st.interface import ms_op_worker
 
 
 class MsOpRunner:
@@ -21,11 +21,15 @@ class MsOpRunner:
     Class for compile and run mindspore op test code.
     """
 
-    def __init__(self, path, op_name, soc_version, report):
+    def __init__(self, path, op_name, soc_version, report, device_id=None):
         self.path = path
         self.soc_version = soc_version
         self.report = report
         self.op_name = op_name
+        # run in the persistent mindspore worker of the device, the device
+        # id of the run command is used if not specified
+        self.device_id = device_id if device_id is not None \
+            else ms_op_worker.get_worker_device_id()
 
     def run(self):
         """
@@ -44,11 +48,17 @@ class MsOpRunner:
         src_path = os.path.dirname(test_py_path)
         utils.check_path_valid(src_path, True)
         output_path = os.path.dirname(self.path)
+        if self.device_id is not None:
+            with self.report.tracer.span('run_ms_op_test_code'):
+                self._run_in_worker(test_py_path, output_path)
+            utils.print_info_log('Finish to run %s.' % test_py_path)
+            return
         os.chdir(output_path)
         run_cmd = ['python3', '-m', 'pytest', '-s', test_py_path]
         utils.print_info_log("Run command line: cd %s && %s " % (
             output_path, " ".join(run_cmd)))
-        self._execute_command(run_cmd)
+        with self.report.tracer.span('run_ms_op_test_code'):
+            self._execute_command(run_cmd)
         utils.print_info_log('Finish to run %s.' % test_py_path)
         self.add_op_st_stage_result(op_status.SUCCESS, "run_ms_op_test_code",
                                     None, " ".join(run_cmd))
@@ -69,17 +79,38 @@ class MsOpRunner:
         """
         self.run()
 
+    def _run_in_worker(self, test_py_path, output_path):
+        run_cmd = 'ms_op_worker(device_id=%s): %s' % (self.device_id, test_py_path)
+        utils.print_info_log("Run in mindspore worker: cd %s && %s " % (
+            output_path, test_py_path))
+        worker_client = ms_op_worker.get_worker_client(self.device_id)
+        case_results = worker_client.run(test_py_path, output_path)
+        if case_results is None:
+            self.add_op_st_stage_result(op_status.FAILED, "run_ms_op_test_code",
+                                        None, run_cmd)
+            raise utils.OpTestGenException(
+                ConstManager.OP_TEST_GEN_INVALID_DATA_ERROR)
+        failed_cases = []
+        for case_result in case_results:
+            utils.print_info_log('Case %s %s, running time: %.2f s.' % (
+                case_result.get('case_name'), case_result.get('status'),
+                case_result.get('duration')))
+            if case_result.get('status') != op_status.SUCCESS:
+                utils.print_error_log(case_result.get('error'))
+                failed_cases.append(case_result.get('case_name'))
+        if failed_cases:
+            self.add_op_st_stage_result(op_status.FAILED, "run_ms_op_test_code",
+                                        None, run_cmd)
+            utils.print_error_log('Failed to run cases: %s' % failed_cases)
+            raise utils.OpTestGenException(
+                ConstManager.OP_TEST_GEN_INVALID_DATA_ERROR)
+        self.add_op_st_stage_result(op_status.SUCCESS, "run_ms_op_test_code",
+                                    None, run_cmd)
+
     def _execute_command(self, cmd):
-        utils.print_info_log('Execute command: %s' % cmd)
-        ms_process = subprocess.Popen(cmd, shell=False,
-                                      stdout=subprocess.PIPE,
-                                      stderr=subprocess.STDOUT)
-        while ms_process.poll() is None:
-            line = ms_process.stdout.readline()
-            line = line.strip()
-            if line:
-                print(line)
-        if ms_process.returncode != 0:
+        cmd_result = utils.CommandExecutor(max_workers=1).run([cmd])[0]
+        utils.print_info_log('Command execute time: %f s.' % cmd_result.duration)
+        if not cmd_result.is_success():
             self.add_op_st_stage_result(op_status.FAILED, "run_ms_op_test_code",
                                         None, " ".join(cmd))
             utils.print_error_log('Failed to execute command: %s' % cmd)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Function:
+This class mainly involves a persistent worker to run mindspore op test code.
+The worker keeps mindspore imported and the context initialized, receives
+the generated test_{op}.py over a local socket and executes its test
+functions in-process, so the startup cost is paid only once.
+Copyright Information:
+Huawei Technologies Co., Ltd. All Rights Reserved © 2021
+"""
+
+import os
+import sys
+import time
+import shutil
+import signal
+import atexit
+import argparse
+import tempfile
+import traceback
+import subprocess
+import importlib.util
+from multiprocessing.connection import Client
+from multiprocessing.connection import Listener
+
+from op_test_frame.common import op_status
+from op_test_frame.st.interface import utils
+from op_test_frame.st.interface.const_manager import ConstManager
+
+_WORKER_CLIENTS = {}
+# the device id of the run command, the ms op runs in the worker of it
+_WORKER_DEVICE_ID = {"device_id": None}
+
+
+class MsCaseTimeoutError(Exception):
+    """
+    The class for case timeout in worker
+    """
+
+
+def _raise_case_timeout(signum, frame):
+    raise MsCaseTimeoutError("case timeout, signal %s, %s" % (signum, frame))
+
+
+def _purge_modules(src_path):
+    # drop modules imported from src path, the op definition may be changed
+    src_dir = os.path.join(os.path.realpath(src_path), '')
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, '__file__', None)
+        if module_file and os.path.realpath(module_file).startswith(src_dir):
+            sys.modules.pop(name, None)
+
+
+def _run_case(case_func, case_timeout):
+    case_result = {'case_name': case_func.__name__,
+                   'status': op_status.SUCCESS, 'error': None}
+    start_time = time.time()
+    signal.alarm(case_timeout)
+    try:
+        case_func()
+    except MsCaseTimeoutError:
+        case_result['status'] = op_status.FAILED
+        case_result['error'] = 'Timeout after %d s.' % case_timeout
+    except Exception:
+        case_result['status'] = op_status.FAILED
+        case_result['error'] = traceback.format_exc()
+    finally:
+        signal.alarm(0)
+    case_result['duration'] = time.time() - start_time
+    return case_result
+
+
+def _run_test_file(request):
+    """
+    load test_{op}.py as a new module and run all test functions in it.
+    :param request: dict with test_py_path, cwd and case_timeout
+    :return: list of case result
+    """
+    test_py_path = request.get('test_py_path')
+    src_path = os.path.dirname(test_py_path)
+    os.chdir(request.get('cwd'))
+    sys.path.insert(0, src_path)
+    try:
+        module_name = '%s_%d' % (
+            os.path.splitext(os.path.basename(test_py_path))[0], time.time_ns())
+        spec = importlib.util.spec_from_file_location(module_name, test_py_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        case_func_list = [getattr(module, name) for name in dir(module)
+                          if name.startswith('test') and callable(getattr(module, name))]
+        # run the cases in the order of definition as pytest does
+        case_func_list.sort(key=lambda case_func: getattr(
+            getattr(case_func, '__code__', None), 'co_firstlineno', 0))
+        return [_run_case(case_func, request.get('case_timeout'))
+                for case_func in case_func_list]
+    except Exception:
+        return [{'case_name': os.path.basename(test_py_path),
+                 'status': op_status.FAILED, 'duration': 0.0,
+                 'error': traceback.format_exc()}]
+    finally:
+        sys.path.remove(src_path)
+        _purge_modules(src_path)
+
+
+def _serve(address, authkey, device_id):
+    # import mindspore and init context once for all requests
+    import mindspore.context as context
+    context.set_context(mode=context.GRAPH_MODE, device_target="Ascend",
+                        device_id=device_id)
+    with Listener(address, authkey=authkey) as listener:
+        with listener.accept() as conn:
+            while True:
+                request = conn.recv()
+                if request.get('cmd') == 'close':
+                    break
+                conn.send(_run_test_file(request))
+
+
+class MsOpWorkerClient:
+    """
+    Class for start and communicate with the mindspore worker process.
+    """
+
+    def __init__(self, device_id):
+        self.device_id = device_id
+        self.worker_process = None
+        self.conn = None
+        self.socket_dir = None
+
+    def start(self):
+        """
+        start the worker process and connect to it
+        """
+        self.socket_dir = tempfile.mkdtemp(prefix='msopst_')
+        address = os.path.join(self.socket_dir, 'worker.sock')
+        authkey = os.urandom(ConstManager.MS_WORKER_AUTHKEY_LENGTH)
+        worker_cmd = [sys.executable, '-m', __name__, '--address', address,
+                      '--device_id', str(self.device_id)]
+        utils.print_info_log('Start mindspore worker: %s' % ' '.join(worker_cmd))
+        self.worker_process = subprocess.Popen(worker_cmd, stdin=subprocess.PIPE)
+        self.worker_process.stdin.write(authkey)
+        self.worker_process.stdin.close()
+        deadline = time.time() + ConstManager.MS_WORKER_START_TIMEOUT
+        while self.conn is None:
+            if self.worker_process.poll() is not None or time.time() > deadline:
+                utils.print_error_log('Failed to start mindspore worker.')
+                self.close()
+                raise utils.OpTestGenException(
+                    ConstManager.OP_TEST_GEN_INVALID_DATA_ERROR)
+            try:
+                self.conn = Client(address, authkey=authkey)
+            except OSError:
+                time.sleep(ConstManager.MS_WORKER_POLL_INTERVAL)
+            finally:
+                pass
+
+    def is_alive(self):
+        """
+        check the worker process is alive
+        """
+        return self.worker_process is not None and \
+            self.worker_process.poll() is None
+
+    def run(self, test_py_path, cwd, case_timeout=ConstManager.MS_WORKER_CASE_TIMEOUT,
+            run_timeout=ConstManager.MS_WORKER_RUN_TIMEOUT):
+        """
+        run test_{op}.py in the worker
+        :param test_py_path: the generated test py file
+        :param cwd: the working directory
+        :param case_timeout: timeout for each case in second
+        :param run_timeout: timeout for the whole test py file in second
+        :return: list of case result, None if the worker does not respond
+        """
+        if not self.is_alive():
+            self.start()
+        self.conn.send({'cmd': 'run', 'test_py_path': test_py_path,
+                        'cwd': cwd, 'case_timeout': case_timeout})
+        # the worker may hang in native code which can not be interrupted
+        # by signal, wait for the whole file and kill the worker if timeout.
+        if not self.conn.poll(run_timeout):
+            utils.print_error_log('The mindspore worker does not respond, '
+                                  'kill it.')
+            self.close()
+            return None
+        return self.conn.recv()
+
+    def close(self):
+        """
+        close the worker process
+        """
+        if self.conn is not None:
+            try:
+                if self.is_alive():
+                    self.conn.send({'cmd': 'close'})
+                self.conn.close()
+            except OSError:
+                pass
+            finally:
+                self.conn = None
+        if self.worker_process is not None:
+            try:
+                self.worker_process.wait(ConstManager.MS_WORKER_POLL_INTERVAL * 10)
+            except subprocess.TimeoutExpired:
+                self.worker_process.kill()
+            finally:
+                self.worker_process = None
+        if self.socket_dir is not None:
+            shutil.rmtree(self.socket_dir, ignore_errors=True)
+            self.socket_dir = None
+
+
+def set_worker_device_id(device_id):
+    """
+    set the device id of the run command for the ms op runner
+    :param device_id: the device id
+    """
+    _WORKER_DEVICE_ID["device_id"] = int(device_id)
+
+
+def get_worker_device_id():
+    """
+    get the device id of the run command
+    :return: the device id, None if not set
+    """
+    return _WORKER_DEVICE_ID.get("device_id")
+
+
+def get_worker_client(device_id):
+    """
+    get the worker client of the device, reuse it across op runs
+    :param device_id: the device id
+    :return: MsOpWorkerClient object
+    """
+    if device_id not in _WORKER_CLIENTS:
+        _WORKER_CLIENTS[device_id] = MsOpWorkerClient(device_id)
+    return _WORKER_CLIENTS.get(device_id)
+
+
+@atexit.register
+def close_all_workers():
+    """
+    close all worker process
+    """
+    for worker_client in _WORKER_CLIENTS.values():
+        worker_client.close()
+    _WORKER_CLIENTS.clear()
+
+
+def main():
+    """
+    worker process entry
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--address', dest='address', required=True)
+    parser.add_argument('--device_id', dest='device_id', type=int, default=0)
+    args = parser.parse_args()
+    authkey = sys.stdin.buffer.read()
+    signal.signal(signal.SIGALRM, _raise_case_timeout)
+    _serve(args.address, authkey, args.device_id)
+
+
+if __name__ == '__main__':
+    main()
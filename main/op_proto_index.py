@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Function:
+OpProtoIndex class.
+This class mainly involves the index of op proto headers. Each REG_OP in the
+headers is parsed once into its INPUT/OUTPUT/ATTR signature and saved on disk
+with the header path and byte offset, the index is updated incrementally by
+header mtime and size.
+Copyright Information:
+Huawei Technologies Co., Ltd. All Rights Reserved © 2021
+"""
+
+import os
+import re
+import json
+import hashlib
+
+from op_test_frame.st.interface import utils
+from op_test_frame.st.interface.const_manager import ConstManager
+
+_COMMENT_PATTERN = re.compile(r'//[^\n]*|/\*.*?\*/', re.S)
+_REG_OP_PATTERN = re.compile(r'\bREG_OP\s*\(\s*(\w+)\s*\)')
+_END_REG_PATTERN = re.compile(r'\bOP_END_FACTORY_REG\s*\(\s*\w+\s*\)')
+_BLANK_PATTERN = re.compile(r'\s+')
+_OP_PROTO_INDEXES = {}
+
+
+def _blank_comment(match):
+    # keep the length of comments, so the offset in file is not changed
+    return re.sub(r'[^\n]', ' ', match.group())
+
+
+def parse_reg_op_lines(reg_op_text):
+    """
+    delete comments and blanks of the REG_OP text and split it to lines
+    :param reg_op_text: the text starts with REG_OP
+    :return: list of line, like ['REG_OP(Add', 'INPUT(x1,TensorType({DT_FLOAT}))']
+    """
+    no_comments_content = _COMMENT_PATTERN.sub('', reg_op_text)
+    line = _BLANK_PATTERN.sub(ConstManager.EMPTY, no_comments_content)
+    return [item.strip() for item in line.split(').')]
+
+
+def _parse_header(header_path):
+    """
+    parse all REG_OP in the header file
+    :param header_path: the header file path
+    :return: dict of op type and its byte offset and signature lines
+    """
+    with open(header_path, 'rb') as header_file:
+        # latin-1 maps byte to char one by one, the offset is byte offset
+        content = header_file.read().decode('latin-1')
+    content = _COMMENT_PATTERN.sub(_blank_comment, content)
+    op_dict = {}
+    reg_op_list = list(_REG_OP_PATTERN.finditer(content))
+    for index, reg_op in enumerate(reg_op_list):
+        block_end = reg_op_list[index + 1].start() \
+            if index + 1 < len(reg_op_list) else len(content)
+        end_reg = _END_REG_PATTERN.search(content, reg_op.end(), block_end)
+        if end_reg:
+            block_end = end_reg.end()
+        op_dict[reg_op.group(1)] = {
+            'offset': reg_op.start(),
+            'lines': parse_reg_op_lines(content[reg_op.start():block_end])
+        }
+    return op_dict
+
+
+class OpProtoIndex:
+    """
+    The class for index of op type to op proto header and signature.
+    """
+
+    def __init__(self, op_proto_path):
+        self.op_proto_path = os.path.realpath(op_proto_path)
+        path_hash = hashlib.sha256(self.op_proto_path.encode()).hexdigest()
+        self.index_path = os.path.join(
+            ConstManager.MSOPST_CACHE_DIR,
+            ConstManager.OP_PROTO_INDEX_FILE_NAME % path_hash[:16])
+        # {header path: [mtime_ns, size, [op type]]}
+        self.headers = {}
+        # {op type: {'path': header path, 'offset': offset, 'lines': [...]}}
+        self.ops = {}
+
+    def get(self, op_type):
+        """
+        get the op proto of op type
+        :param op_type: the op type
+        :return: dict with path, offset and lines, None if not found
+        """
+        return self.ops.get(op_type)
+
+    def load(self):
+        """
+        load the index from disk, update it with the changed headers and
+        save it back if changed.
+        :return: self
+        """
+        self._load_index_file()
+        if self._update():
+            self._save_index_file()
+        return self
+
+    def _get_header_stats(self):
+        header_stats = {}
+        if not os.path.isdir(self.op_proto_path):
+            return header_stats
+        for root, _, files in os.walk(self.op_proto_path, followlinks=True):
+            for file_name in files:
+                if not file_name.endswith(ConstManager.HEADER_FILE):
+                    continue
+                header_path = os.path.join(root, file_name)
+                try:
+                    header_stat = os.stat(header_path)
+                except OSError:
+                    continue
+                finally:
+                    pass
+                header_stats[header_path] = [header_stat.st_mtime_ns, header_stat.st_size]
+        return header_stats
+
+    def _remove_header(self, header_path):
+        for op_type in self.headers.pop(header_path)[2]:
+            if self.ops.get(op_type, {}).get('path') == header_path:
+                self.ops.pop(op_type)
+
+    def _update(self):
+        header_stats = self._get_header_stats()
+        changed_headers = [header_path for header_path, header_stat in header_stats.items()
+                           if self.headers.get(header_path, [None, None])[:2] != header_stat]
+        removed_headers = [header_path for header_path in self.headers
+                           if header_path not in header_stats]
+        for header_path in removed_headers + changed_headers:
+            if header_path in self.headers:
+                self._remove_header(header_path)
+        for header_path in sorted(changed_headers):
+            try:
+                op_dict = _parse_header(header_path)
+            except OSError as error:
+                utils.print_warn_log('Failed to parse %s. %s' % (header_path, str(error)))
+                continue
+            finally:
+                pass
+            self.headers[header_path] = header_stats.get(header_path) + [list(op_dict.keys())]
+            for op_type, op_proto in op_dict.items():
+                op_proto['path'] = header_path
+                self.ops[op_type] = op_proto
+        if changed_headers or removed_headers:
+            utils.print_info_log('Update op proto index of %s, %d headers changed.' % (
+                self.op_proto_path, len(changed_headers) + len(removed_headers)))
+            return True
+        return False
+
+    def _load_index_file(self):
+        try:
+            with open(self.index_path) as index_file:
+                index_obj = json.load(index_file)
+            if index_obj.get('op_proto_path') == self.op_proto_path:
+                self.headers = index_obj.get('headers')
+                self.ops = index_obj.get('ops')
+        except (OSError, ValueError, AttributeError):
+            self.headers = {}
+            self.ops = {}
+        finally:
+            pass
+
+    def _save_index_file(self):
+        tmp_index_path = '%s.%d.tmp' % (self.index_path, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(self.index_path), ConstManager.FOLDER_MASK, exist_ok=True)
+            with os.fdopen(os.open(tmp_index_path, ConstManager.WRITE_FLAGS,
+                                   ConstManager.WRITE_MODES), 'w') as index_file:
+                json.dump({'op_proto_path': self.op_proto_path,
+                           'headers': self.headers,
+                           'ops': self.ops}, index_file)
+            # replace atomically, the index may be read by other processes
+            os.replace(tmp_index_path, self.index_path)
+        except OSError as error:
+            utils.print_warn_log('Failed to save op proto index to %s. %s' % (
+                self.index_path, str(error)))
+        finally:
+            pass
+
+
+def get_op_proto_index(op_proto_path):
+    """
+    get the op proto index of the directory, it is loaded once per process
+    :param op_proto_path: the op proto directory
+    :return: OpProtoIndex object
+    """
+    op_proto_path = os.path.realpath(op_proto_path)
+    if op_proto_path not in _OP_PROTO_INDEXES:
+        _OP_PROTO_INDEXES[op_proto_path] = OpProtoIndex(op_proto_path).load()
+    return _OP_PROTO_INDEXES.get(op_proto_path)
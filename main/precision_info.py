@@ -18,6 +18,11 @@
 precision info module
 """
 from op_test_frame.common import op_status
+from op_test_frame.st.interface.const_manager import ConstManager
+
+# the metrics should not be larger than the threshold, except the metrics
+# in this list should not be smaller than the threshold
+_MIN_BOUND_METRICS = ["cosine_similarity", "pass_rate"]
 
 
 class PrecisionStandard:
@@ -25,17 +30,25 @@ class PrecisionStandard:
     precision standard
     """
 
-    def __init__(self, rtol, atol, max_atol=None, precision_type="percent"):
+    def __init__(self, rtol, atol, max_atol=None, precision_type="percent", metric_thresholds=None):
         """
         init methos
-        :param rtol: The relative tolerance parameter
-        :param atol: The absolute tolerance parameter
-        :param max_atol: The max absolute tolerance parameter
+        :param rtol: The allowed percent of error elements, for "percent"
+        precision type
+        :param atol: The tolerance of the element error, the relative diff
+        for "percent" precision type and the absolute diff for "absolute"
+        :param max_atol: The max error of the error elements should be smaller
+        than it
+        :param metric_thresholds: The extra metrics gate pass/fail, like
+        {"cosine_similarity": 0.99, "rmse": 0.001, "max_ulp": 2}. The nan/inf
+        elements are passed unless it has "nan_inf_mismatch", like
+        {"nan_inf_mismatch": 0}
         """
         self.precision_type = precision_type
         self.rtol = rtol
         self.atol = atol
         self.max_atol = max_atol
+        self.metric_thresholds = metric_thresholds if metric_thresholds else {}
 
     @staticmethod
     def parse_json_obj(json_obj):
@@ -46,10 +59,78 @@ class PrecisionStandard:
         """
         if json_obj:
             return PrecisionStandard(json_obj['rtol'], json_obj['atol'], json_obj['max_atol'],
-                                     json_obj['precision_type'])
+                                     json_obj['precision_type'], json_obj.get('metric_thresholds'))
 
         return None
 
+    @staticmethod
+    def check_size(real_size, expect_size):
+        """
+        check the data size of npu output and expect output
+        :return: PrecisionCompareResult
+        """
+        return PrecisionCompareResult(
+            op_status.FAILED, "The size of npu output[%d] and expect output[%d] is not equal."
+            % (real_size, expect_size))
+
+    @staticmethod
+    def from_err_thr(err_thr):
+        """
+        get the standard of the msopst error threshold
+        :param err_thr: [diff_thd, pct_thd] or [diff_thd, pct_thd, max_diff_thd]
+        :return: PrecisionStandard
+        """
+        max_diff_thd = err_thr[2] if len(err_thr) > 2 else ConstManager.DEFAULT_MAX_DIFF_THRESHOLD
+        return PrecisionStandard(err_thr[1], err_thr[0], max_diff_thd)
+
+    def is_absolute(self):
+        """
+        whether the element error is the absolute diff
+        """
+        return self.precision_type == "absolute"
+
+    def get_error_percent_threshold(self):
+        """
+        get the allowed percent of error elements, no element should be error
+        for "absolute" precision type
+        """
+        return 0.0 if self.is_absolute() else self.rtol
+
+    def to_err_thr(self):
+        """
+        get the msopst error threshold [diff_thd, pct_thd, max_diff_thd] with
+        the same meaning as check
+        """
+        return [self.atol, self.get_error_percent_threshold(), self.max_atol]
+
+    def check(self, metrics):
+        """
+        check the metrics by the standard, the element is error if its error
+        diff of PrecisionMetrics > atol. The error percent should not be
+        larger than get_error_percent_threshold, and the max error of the
+        error elements should be smaller than max_atol.
+        :param metrics: the metrics json obj of PrecisionMetrics
+        :return: PrecisionCompareResult
+        """
+        err_msg_list = []
+        allowed_percent = self.get_error_percent_threshold()
+        if metrics.get("pass_rate") < 1.0 - allowed_percent:
+            err_msg_list.append("error percent %f > %f" % (1.0 - metrics.get("pass_rate"), allowed_percent))
+        if self.max_atol is not None and metrics.get("error_count") and \
+                metrics.get("max_error") >= self.max_atol:
+            err_msg_list.append("max error %f >= %f" % (metrics.get("max_error"), self.max_atol))
+        for metric_name, threshold in self.metric_thresholds.items():
+            value = metrics.get(metric_name)
+            if value is None:
+                continue
+            if metric_name in _MIN_BOUND_METRICS and value < threshold:
+                err_msg_list.append("%s %f < %f" % (metric_name, value, threshold))
+            elif metric_name not in _MIN_BOUND_METRICS and value > threshold:
+                err_msg_list.append("%s %f > %f" % (metric_name, value, threshold))
+        if err_msg_list:
+            return PrecisionCompareResult(op_status.FAILED, "; ".join(err_msg_list))
+        return PrecisionCompareResult(op_status.SUCCESS)
+
     def to_json_obj(self):
         """
         get json obj
@@ -59,7 +140,8 @@ class PrecisionStandard:
             "precision_type": self.precision_type,
             "rtol": self.rtol,
             "atol": self.atol,
-            "max_atol": self.max_atol
+            "max_atol": self.max_atol,
+            "metric_thresholds": self.metric_thresholds
         }
 
 
@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Function:
+PrecisionMetrics class.
+This class mainly involves computing all precision metrics of the npu
+output and the expect output in one pass. The data is processed chunk by
+chunk, so the large data is not converted to float64 at once.
+Copyright Information:
+Huawei Technologies Co., Ltd. All Rights Reserved © 2021
+"""
+
+import math
+
+import numpy as np
+
+from op_test_frame.st.interface.const_manager import ConstManager
+from op_test_frame.st.interface.precision_info import PrecisionStandard
+
+# the relative error histogram edges, the last bin counts error >= 1
+HISTOGRAM_EDGES = [0.0, 1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, math.inf]
+_ULP_INT_TYPES = {'float16': np.int16, 'float32': np.int32}
+
+
+def _to_ordered_int(data, int_type):
+    # map the float bits to int, the adjacent floats differ by 1
+    bits = data.view(int_type).astype(np.int64)
+    sign_mask = np.int64(np.iinfo(int_type).min)
+    return np.where(bits < 0, sign_mask - bits, bits)
+
+
+def _concat_errors(errors_list):
+    return tuple(np.concatenate([errors[index] for errors in errors_list])
+                 for index in range(len(errors_list[0])))
+
+
+class PrecisionMetrics:
+    """
+    The class for accumulating precision metrics chunk by chunk.
+    """
+
+    def __init__(self, dtype, standard: PrecisionStandard, keep_all_errors=False):
+        self.dtype = str(dtype)
+        self.standard = standard
+        self.count = 0
+        self.pass_cnt = 0
+        self.nan_inf_mismatch_cnt = 0
+        self.expect_nan_inf_cnt = 0
+        self.max_error = 0.0
+        self.max_abs_error = 0.0
+        self.max_rel_error = 0.0
+        self.sum_abs_error = 0.0
+        self.sum_rel_error = 0.0
+        self.sum_square_error = 0.0
+        self.dot = 0.0
+        self.real_norm = 0.0
+        self.expect_norm = 0.0
+        # the ulp is only computed if the real and expect data types are same
+        self.ulp_int_type = _ULP_INT_TYPES.get(self.dtype)
+        self.max_ulp = 0
+        self.sum_ulp = 0
+        self.histogram = np.zeros(len(HISTOGRAM_EDGES) - 1, dtype=np.int64)
+        # the (index, error diff, real value, expect value) arrays of the error
+        # elements, all of them for the error report, otherwise only the
+        # first and the last ones to display
+        self.keep_all_errors = keep_all_errors
+        self.error_cnt = 0
+        self._error_head = []
+        self._error_tail = []
+
+    def _get_error_diff(self, real, expect, abs_error):
+        # the relative diff of msopst, the diff smaller than atol is absolute
+        diff_thd = self.standard.atol
+        if self.standard.is_absolute() or diff_thd <= 0:
+            return abs_error
+        max_data = np.maximum(np.abs(real), np.abs(expect))
+        denominator = np.maximum(max_data, (1.0 / (1 << 14)) / diff_thd) + 10e-10
+        return np.where(abs_error < diff_thd, abs_error, abs_error / denominator)
+
+    def _get_head_error_cnt(self):
+        return sum(errors[0].size for errors in self._error_head)
+
+    def _add_errors(self, errors):
+        self.error_cnt += errors[0].size
+        if self.keep_all_errors:
+            self._error_head.append(errors)
+            return
+        display_cnt = ConstManager.ERROR_DISPLAY_COUNT
+        head_cnt = self._get_head_error_cnt()
+        if head_cnt < display_cnt:
+            self._error_head.append(tuple(item[:display_cnt - head_cnt] for item in errors))
+        self._error_tail.append(tuple(item[-display_cnt:] for item in errors))
+        self._error_tail = [tuple(item[-display_cnt:] for item in _concat_errors(self._error_tail))]
+
+    def update(self, real_data, expect_data, offset=0):
+        """
+        update the metrics with a chunk of data
+        :param real_data: the flatten npu output chunk
+        :param expect_data: the flatten expect output chunk
+        :param offset: the index of the chunk in the whole data
+        """
+        self.count += real_data.size
+        real_finite = np.isfinite(real_data)
+        expect_finite = np.isfinite(expect_data)
+        self.expect_nan_inf_cnt += int(np.count_nonzero(~expect_finite))
+        # nan and inf are equal only if they are at the same position with
+        # the same value, the mismatched ones are counted but passed as
+        # msopst does, they fail the case by the nan_inf_mismatch threshold
+        non_finite = ~(real_finite & expect_finite)
+        same_non_finite = non_finite & ((np.isnan(real_data) & np.isnan(expect_data)) |
+                                        (real_data == expect_data))
+        self.nan_inf_mismatch_cnt += int(np.count_nonzero(non_finite & ~same_non_finite))
+        finite = real_finite & expect_finite
+        real_finite_data = real_data[finite]
+        expect_finite_data = expect_data[finite]
+        real = real_finite_data.astype(np.float64)
+        expect = expect_finite_data.astype(np.float64)
+        abs_error = np.abs(real - expect)
+        rel_error = abs_error / np.maximum(np.abs(expect), ConstManager.MIN_RELATIVE_DENOMINATOR)
+        error_diff = self._get_error_diff(real, expect, abs_error)
+        is_error = error_diff > self.standard.atol
+        self.pass_cnt += real.size - int(np.count_nonzero(is_error))
+        self.pass_cnt += int(np.count_nonzero(non_finite))
+        if abs_error.size:
+            self.max_abs_error = max(self.max_abs_error, float(abs_error.max()))
+            self.max_rel_error = max(self.max_rel_error, float(rel_error.max()))
+        if np.any(is_error):
+            self.max_error = max(self.max_error, float(error_diff[is_error].max()))
+            self._add_errors((np.flatnonzero(finite)[is_error] + offset, error_diff[is_error],
+                              real_finite_data[is_error], expect_finite_data[is_error]))
+        self.sum_abs_error += float(abs_error.sum())
+        self.sum_rel_error += float(rel_error.sum())
+        self.sum_square_error += float(np.dot(abs_error, abs_error))
+        self.dot += float(np.dot(real, expect))
+        self.real_norm += float(np.dot(real, real))
+        self.expect_norm += float(np.dot(expect, expect))
+        self.histogram += np.histogram(rel_error, bins=HISTOGRAM_EDGES)[0]
+        if real_data.dtype != expect_data.dtype:
+            self.ulp_int_type = None
+        if self.ulp_int_type is not None and abs_error.size:
+            ulp = np.abs(_to_ordered_int(real_finite_data, self.ulp_int_type) -
+                         _to_ordered_int(expect_finite_data, self.ulp_int_type))
+            self.max_ulp = max(self.max_ulp, int(ulp.max()))
+            self.sum_ulp += int(ulp.sum())
+
+    def compute(self, real_data, expect_data, chunk_size=ConstManager.PRECISION_CHUNK_SIZE):
+        """
+        update the metrics with the whole flatten data chunk by chunk
+        """
+        for start in range(0, real_data.size, chunk_size):
+            self.update(real_data[start:start + chunk_size],
+                        expect_data[start:start + chunk_size], start)
+
+    def get_error_elements(self):
+        """
+        get the error elements in index order, all of them if keep_all_errors,
+        otherwise the first and the last ERROR_DISPLAY_COUNT ones
+        :return: ((index, error diff, real value, expect value) arrays,
+        position list), the position is the order of the element in all error
+        elements, starting from 1
+        """
+        if not self._error_head:
+            return (np.empty(0, dtype=np.int64), np.empty(0), np.empty(0), np.empty(0)), []
+        head_cnt = self._get_head_error_cnt()
+        head = _concat_errors(self._error_head)
+        if self.keep_all_errors or self.error_cnt <= head_cnt:
+            return head, list(range(1, head_cnt + 1))
+        tail = _concat_errors(self._error_tail)
+        tail_cnt = tail[0].size
+        # the head and the tail overlap if there are few error elements
+        overlap = max(head_cnt + tail_cnt - self.error_cnt, 0)
+        errors = tuple(np.concatenate([head_item, tail_item[overlap:]])
+                       for head_item, tail_item in zip(head, tail))
+        positions = list(range(1, head_cnt + 1)) + list(
+            range(self.error_cnt - tail_cnt + overlap + 1, self.error_cnt + 1))
+        return errors, positions
+
+    def get_cosine_similarity(self):
+        """
+        get cosine similarity, 1.0 if both data are zero
+        """
+        if self.real_norm == 0 and self.expect_norm == 0:
+            return 1.0
+        if self.real_norm == 0 or self.expect_norm == 0:
+            return 0.0
+        return self.dot / math.sqrt(self.real_norm * self.expect_norm)
+
+    def to_json_obj(self):
+        """
+        get json obj
+        :return: json obj
+        """
+        finite_cnt = max(int(self.histogram.sum()), 1)
+        metrics = {
+            "count": self.count,
+            "pass_rate": self.pass_cnt / self.count if self.count else 1.0,
+            "error_count": self.error_cnt,
+            "max_error": self.max_error,
+            "max_abs_error": self.max_abs_error,
+            "max_rel_error": self.max_rel_error,
+            "mean_abs_error": self.sum_abs_error / finite_cnt,
+            "mean_rel_error": self.sum_rel_error / finite_cnt,
+            "rmse": math.sqrt(self.sum_square_error / finite_cnt),
+            "cosine_similarity": self.get_cosine_similarity(),
+            "nan_inf_mismatch": self.nan_inf_mismatch_cnt,
+            "expect_nan_inf": self.expect_nan_inf_cnt,
+            "rel_error_histogram": {
+                "edges": HISTOGRAM_EDGES[:-1],
+                "counts": self.histogram.tolist()
+            }
+        }
+        if self.ulp_int_type is not None:
+            metrics["max_ulp"] = self.max_ulp
+            metrics["mean_ulp"] = self.sum_ulp / finite_cnt
+        return metrics
+
+
+def compare_precision(real_data, expect_data, standard: PrecisionStandard,
+                      chunk_size=ConstManager.PRECISION_CHUNK_SIZE, keep_all_errors=False):
+    """
+    compute the metrics of numpy data in one pass and check them by standard
+    :param real_data: the npu output
+    :param expect_data: the expect output
+    :param standard: the PrecisionStandard object
+    :param chunk_size: the element count of one chunk
+    :param keep_all_errors: keep all error elements for the error report
+    :return: (PrecisionMetrics, PrecisionCompareResult)
+    """
+    real_data = real_data.reshape(-1)
+    expect_data = expect_data.reshape(-1)
+    metrics = PrecisionMetrics(real_data.dtype, standard, keep_all_errors)
+    if real_data.size != expect_data.size:
+        return metrics, standard.check_size(real_data.size, expect_data.size)
+    metrics.compute(real_data, expect_data, chunk_size)
+    return metrics, standard.check(metrics.to_json_obj())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Function:
+This method mainly handle the rerun failed cases scenario.
+Copyright Information:
+Huawei Technologies Co., Ltd. All Rights Reserved © 2021
+"""
+import os
+
+from op_test_frame.st.interface import utils
+from op_test_frame.st.interface import data_file
+from op_test_frame.st.interface.st_report import OpSTReport
+from op_test_frame.st.interface.const_manager import ConstManager
+
+# the failed cases of --rerun-failed of this run, they are loaded by the
+# argument parser and used by CaseDesign and DataGenerator
+_RERUN_CASE_INFO = {"cases": None}
+
+
+def load_rerun_case_info(report_path):
+    """
+    load the failed cases from the previous st report
+    :param report_path: the path of previous st_report.json
+    :return: dict of case name and the OpSTCase object of previous run
+    """
+    utils.check_path_valid(report_path)
+    previous_report = OpSTReport()
+    previous_report.load(report_path)
+    rerun_case_info = {}
+    for case_report in previous_report.get_failed_case_reports():
+        if not case_report.trace_detail:
+            continue
+        rerun_case_info[case_report.case_name] = \
+            case_report.trace_detail.st_case_info
+    if not rerun_case_info:
+        utils.print_warn_log(
+            'There is no failed case in %s. Nothing to rerun.' % report_path)
+        raise utils.OpTestGenException(
+            ConstManager.OP_TEST_GEN_INVALID_DATA_ERROR)
+    utils.print_info_log('Find %d failed cases to rerun in %s: %s.' % (
+        len(rerun_case_info), report_path, list(rerun_case_info.keys())))
+    return rerun_case_info
+
+
+def set_rerun_case_info(rerun_case_info):
+    """
+    set the failed cases to rerun of this run
+    :param rerun_case_info: dict of case name and previous OpSTCase, None to
+    run all cases
+    """
+    _RERUN_CASE_INFO["cases"] = rerun_case_info
+
+
+def get_rerun_case_info():
+    """
+    get the failed cases to rerun of this run
+    :return: dict of case name and previous OpSTCase, None if all cases run
+    """
+    return _RERUN_CASE_INFO.get("cases")
+
+
+def filter_rerun_cases(case_list, rerun_case_info, report):
+    """
+    keep only the cases need to rerun, also remove the others from report
+    :param case_list: the list of test case designed
+    :param rerun_case_info: dict of case name and previous OpSTCase
+    :param report: the OpSTReport object of current run
+    :return: the list of test case need to rerun
+    """
+    rerun_case_list = [case for case in case_list
+                       if case.get(ConstManager.CASE_NAME) in rerun_case_info]
+    report.report_list = [case_rpt for case_rpt in report.report_list
+                          if case_rpt.case_name in rerun_case_info]
+    missing_case_names = set(rerun_case_info.keys()) - set(
+        case.get(ConstManager.CASE_NAME) for case in rerun_case_list)
+    if missing_case_names:
+        utils.print_warn_log(
+            'The case %s in previous report can not be found in current '
+            'test case json, skip them.' % sorted(missing_case_names))
+    return rerun_case_list
+
+
+def get_previous_input_paths(previous_case_info, case):
+    """
+    get the input data paths of previous run
+    :param previous_case_info: the OpSTCase object of previous run
+    :param case: the test case
+    :return: list of input data path, empty if any of them does not exist
+    """
+    if not previous_case_info or not previous_case_info.input_data_paths:
+        return []
+    input_paths = []
+    for index, input_desc in enumerate(case.get(ConstManager.INPUT_DESC)):
+        if input_desc.get('type') in ConstManager.OPTIONAL_TYPE_LIST:
+            continue
+        input_path = os.path.join(
+            previous_case_info.input_data_paths,
+            case.get(ConstManager.CASE_NAME) + '_input_' + str(index) + '.bin')
+        if not os.path.isfile(input_path):
+            return []
+        input_paths.append(input_path)
+    return input_paths
+
+
+def copy_previous_data(src_path, dst_dir):
+    """
+    copy data file of previous run to current run directory
+    :param src_path: the data file of previous run
+    :param dst_dir: the data directory of current run
+    :return: the data file path of current run
+    """
+    dst_path = os.path.join(dst_dir, os.path.basename(src_path))
+    try:
+        if os.path.lexists(dst_path):
+            # the file may be linked to the shared input store, do not
+            # write through it
+            os.remove(dst_path)
+        data_file.copy_raw_data(src_path, dst_path)
+        os.chmod(dst_path, ConstManager.WRITE_MODES)
+    except OSError as err:
+        utils.print_error_log(
+            'Failed to copy %s to %s. %s' % (src_path, dst_dir, str(err)))
+        raise utils.OpTestGenException(
+            ConstManager.OP_TEST_GEN_WRITE_FILE_ERROR) from err
+    finally:
+        pass
+    return dst_path
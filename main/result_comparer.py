@@ -18,16 +18,26 @@
 result compare
 """
 import os
+import csv
+import json
 import time
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 
 from op_test_frame.common import op_status
 from op_test_frame.st.interface import utils
 from op_test_frame.st.interface import op_st_case_info
+from op_test_frame.st.interface import data_file
+from op_test_frame.st.interface import precision_info
 from op_test_frame.st.interface.compare_data import CompareData
 from op_test_frame.st.interface.const_manager import ConstManager
 
 
+_SUMMARY_METRICS = ['max_abs_error', 'max_rel_error', 'mean_abs_error', 'rmse',
+                    'cosine_similarity', 'max_ulp', 'nan_inf_mismatch']
+
+
 class ResultTxtParser:
     """
     class parse result.txt.
@@ -80,50 +90,47 @@ class ResultCompare:
     """
     Class for result compare.
     """
-    def __init__(self, report, run_dir, err_thr, error_report):
+    def __init__(self, report, run_dir, err_thr, error_report, compress_data=False):
         self.report = report
         self.err_thr = err_thr
         self.error_report = error_report
         self.run_dir = run_dir
+        # compress the result and input data of the compared case for archive
+        self.compress_data = compress_data
 
     @staticmethod
-    def compare_by_path(result_dir, expect_dir, error_report):
+    def compare_by_path(result_dir, expect_dir, error_report, jobs=0, output_path=None):
         """
-        compare output data with expect data by path
+        compare output data with expect data by path, the files are compared
+        in worker processes with the default threshold of their dtype
         :param result_dir: result data path
         :param expect_dir: expecet data path
-        :return:
+        :param error_report: 'true' to generate error reports (.csv)
+        :param jobs: the number of worker processes, 0 for cpu count
+        :param output_path: the path of compare summary, default is result_dir
+        :return: list of compare summary, sorted by worst error
         """
         start_time = time.time()
         utils.print_info_log(
             'Step:------>>>>>> Start to compare result <<<<<<------ ')
-        names = os.listdir(result_dir)
-        result_list = []
-        for name in names:
-            result_file = os.path.join(result_dir, name)
-            expect_name = name.replace("_output_", "_expect_output_")
-            expect_file = os.path.join(expect_dir, expect_name)
-            if not os.path.isfile(result_file):
-                utils.print_warn_log("There is no result file :%s" %
-                                    result_file)
-                continue
-            if not os.path.isfile(expect_file):
-                utils.print_warn_log("There is no expect output file"
-                                    ":%s" % expect_file)
-                continue
-
-            np_type = _parse_dtype_by_filename(result_file)
-            if not np_type:
-                utils.print_warn_log("Failed to get numpy data type from file "
-                                    "name(%s),the np_type = %s")
-                continue
-            npu_output = np.fromfile(result_file, np_type)
-            cpu_output = np.fromfile(expect_file, np_type)
-            compare_data_obj = CompareData('current case', [0.01, 0.05], error_report, '')
-            result, error_percent, max_error = compare_data_obj.compare(npu_output, cpu_output)
-            result_list.append([result, error_percent, max_error])
+        output_path = os.path.realpath(output_path if output_path else result_dir)
+        compare_pairs, summary_list = _get_compare_pairs(result_dir, expect_dir)
+        jobs = jobs if jobs else os.cpu_count()
+        utils.print_info_log('Compare %d result files with %d workers.'
+                             % (len(compare_pairs), jobs))
+        if compare_pairs:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                futures = [executor.submit(_compare_file_pair, result_file, expect_file,
+                                           error_report, output_path)
+                           for result_file, expect_file in compare_pairs]
+                summary_list.extend(future.result() for future in futures)
+        # the failed file with the largest error is the first
+        summary_list.sort(key=lambda x: (x.get('result') == 'Pass', -x.get('max_error'),
+                                         x.get('pass_percent'), x.get('result_file')))
+        _save_compare_summary(summary_list, output_path)
         utils.print_info_log('End to compare result. Duration:%0.2f second.'
-                            % (time.time() - start_time))
+                             % (time.time() - start_time))
+        return summary_list
 
     @staticmethod
     def _add_op_st_stage_result(case_report, status=op_status.FAILED, stage_name=None, result=None):
@@ -154,6 +161,13 @@ class ResultCompare:
         utils.print_info_log("The data type is {}, the numpy type is {}".format(str_type, np_type))
         return np_type
 
+    @staticmethod
+    def _get_compare_data_bytes(case_info):
+        data_paths = list(case_info.expect_data_paths)
+        if case_info.planned_output_data_paths:
+            data_paths.extend(case_info.planned_output_data_paths)
+        return sum(data_file.get_data_size(path) for path in data_paths if os.path.isfile(path))
+
     def compare(self):
         """
         compare
@@ -203,7 +217,9 @@ class ResultCompare:
             case_info = self._get_case_info(case_name, index, case_report)
             if not case_info:
                 return
-            result_list = self._get_compare_result_list(case_info)
+            with self.report.tracer.span('compare_data', case_name) as trace_span:
+                result_list = self._get_compare_result_list(case_info)
+                trace_span.bytes_processed = self._get_compare_data_bytes(case_info)
             # add compare report
             compare_status = op_status.SUCCESS
             if not result_list:
@@ -212,6 +228,8 @@ class ResultCompare:
                 if result_info[0] == "Failed":
                     compare_status = op_status.FAILED
             self._add_op_st_stage_result(case_report, compare_status, "compare_data", None)
+            if self.compress_data:
+                self._compress_case_data(case_info)
         else:
             utils.print_warn_log("The result in result.txt only support '[pass]' and '[fail]', '%s' is "
                                  "unsupported." % result)
@@ -231,6 +249,23 @@ class ResultCompare:
                                  "'[pass]' and '[fail]', '%s' is "
                                  "unsupported." % result)
 
+    def _compress_case_data(self, case_info):
+        data_paths = list(case_info.planned_output_data_paths or [])
+        if case_info.input_data_paths:
+            for index in range(len(case_info.op_params.get(ConstManager.INPUT_DESC, []))):
+                data_paths.append(os.path.join(
+                    case_info.input_data_paths,
+                    case_info.case_name + '_input_' + str(index) + '.bin'))
+        for data_path in data_paths:
+            if not os.path.isfile(data_path):
+                continue
+            try:
+                data_file.compress_file(data_path, self.report.compress_stats)
+            except OSError as error:
+                utils.print_warn_log('Failed to compress %s. %s' % (data_path, str(error)))
+            finally:
+                pass
+
     def _get_err_thr(self, case_info):
         if self.err_thr:
             err_thr = self.err_thr
@@ -250,8 +285,9 @@ class ResultCompare:
             if not np_type:
                 utils.print_warn_log("Failed to get numpy data type. Skip compare")
                 continue
-            npu_output = np.fromfile(result_file, np_type)
-            cpu_output = np.fromfile(expect_file, np_type)
+            # the data is read chunk by chunk when it is compared
+            npu_output = data_file.DataFileArray(result_file, np_type, self.report.compress_stats)
+            cpu_output = data_file.DataFileArray(expect_file, np_type, self.report.compress_stats)
             err_thr = self._get_err_thr(case_info)
             compare_data_obj = CompareData(case_info.op_params, err_thr, self.error_report, self.run_dir)
             result, error_percent, max_error = compare_data_obj.compare(npu_output, cpu_output)
@@ -259,6 +295,108 @@ class ResultCompare:
         return result_list
 
 
+def _get_compare_pairs(result_dir, expect_dir):
+    """
+    find the result files and their expect files, the expect file has the
+    same relative path with '_output_' replaced by '_expect_output_'
+    :return: list of (result file, expect file), list of summary for the
+    files can not be compared
+    """
+    compare_pairs = []
+    summary_list = []
+    for root, _, files in os.walk(result_dir, followlinks=True):
+        for name in sorted(files):
+            # the expect files are skipped when they are in the result dir
+            if "_output_" not in name or "_expect_output_" in name:
+                continue
+            result_file = os.path.join(root, name)
+            expect_file = os.path.normpath(os.path.join(
+                expect_dir, os.path.relpath(root, result_dir),
+                name.replace("_output_", "_expect_output_")))
+            if not os.path.isfile(expect_file):
+                utils.print_warn_log("There is no expect output file"
+                                     ":%s" % expect_file)
+                summary_list.append(_get_file_summary(result_file, expect_file, None, "NoExpect"))
+                continue
+            compare_pairs.append((result_file, expect_file))
+    return compare_pairs, summary_list
+
+
+def _get_file_summary(result_file, expect_file, dtype, result, *compare_info):
+    pass_percent, max_error, err_thr, metrics = compare_info if compare_info else (0.0, 0.0, None, None)
+    summary = {
+        'result_file': result_file,
+        'expect_file': expect_file,
+        'dtype': dtype,
+        'result': result,
+        'pass_percent': pass_percent,
+        'max_error': max_error,
+        'error_threshold': err_thr
+    }
+    metrics = metrics if metrics else {}
+    for metric_name in _SUMMARY_METRICS:
+        summary[metric_name] = metrics.get(metric_name)
+    summary['rel_error_histogram'] = metrics.get('rel_error_histogram')
+    return summary
+
+
+def _compare_file_pair(result_file, expect_file, error_report, output_path):
+    """
+    compare one result file with its expect file, run in the worker process
+    :return: the compare summary of the file
+    """
+    np_type = _parse_dtype_by_filename(result_file)
+    if not np_type:
+        utils.print_warn_log("Failed to get numpy data type from file "
+                             "name(%s)." % result_file)
+        return _get_file_summary(result_file, expect_file, None, "UnknownDtype")
+    dtype = np.dtype(np_type).name
+    standard = precision_info.get_default_standard(dtype)
+    err_thr = standard.to_err_thr()
+    case_name = os.path.splitext(os.path.basename(result_file))[0]
+    try:
+        npu_output = data_file.DataFileArray(result_file, np_type)
+        cpu_output = data_file.DataFileArray(expect_file, np_type)
+        compare_data_obj = CompareData({ConstManager.CASE_NAME: case_name}, err_thr,
+                                       error_report, output_path, standard)
+        result, pass_percent, max_error = compare_data_obj.compare(npu_output, cpu_output)
+    except (OSError, ValueError, MemoryError) as error:
+        utils.print_warn_log("Failed to compare %s. %s" % (result_file, str(error)))
+        return _get_file_summary(result_file, expect_file, dtype, "Error")
+    finally:
+        pass
+    return _get_file_summary(result_file, expect_file, dtype, result,
+                             float(pass_percent), float(max_error), err_thr, compare_data_obj.metrics)
+
+
+def _save_compare_summary(summary_list, output_path):
+    json_path = os.path.join(output_path, ConstManager.COMPARE_SUMMARY_JSON_FILE_NAME)
+    csv_path = os.path.join(output_path, ConstManager.COMPARE_SUMMARY_CSV_FILE_NAME)
+    pass_cnt = len([summary for summary in summary_list if summary.get('result') == 'Pass'])
+    try:
+        utils.make_dirs(output_path)
+        with os.fdopen(os.open(json_path, ConstManager.WRITE_FLAGS | os.O_TRUNC,
+                               ConstManager.WRITE_MODES), 'w') as json_file:
+            json.dump({'total count': len(summary_list), 'pass count': pass_cnt,
+                       'failed count': len(summary_list) - pass_cnt,
+                       'compare_list': summary_list}, json_file, indent=4)
+        with os.fdopen(os.open(csv_path, ConstManager.WRITE_FLAGS | os.O_TRUNC,
+                               ConstManager.WRITE_MODES), 'w', newline='') as csv_file:
+            # the histogram is only saved in json
+            fieldnames = [name for name in _get_file_summary('', '', '', '').keys()
+                          if name != 'rel_error_histogram']
+            writer = csv.DictWriter(csv_file, fieldnames=fieldnames, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(summary_list)
+    except OSError as error:
+        utils.print_error_log("Failed to save compare summary to %s. %s" % (output_path, str(error)))
+        raise utils.OpTestGenException(ConstManager.OP_TEST_GEN_WRITE_FILE_ERROR) from error
+    finally:
+        pass
+    utils.print_info_log("Compare %d files, %d passed, %d failed. The summary is saved in %s and %s."
+                         % (len(summary_list), pass_cnt, len(summary_list) - pass_cnt, json_path, csv_path))
+
+
 def _parse_dtype_by_filename(file_name):
     file_str_list = file_name.split("_")
     file_str = file_str_list[-1]  # eg:int32.bin
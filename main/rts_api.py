@@ -474,14 +474,32 @@ class AscendRTSApi:
         """
         if not isinstance(data, bytes):
             raise TypeError("Copy binary to hbm supports bytes only, reveviced %s" % str(type(data)))
+        return self.copy_buffer_to_hbm(data, len(data))
 
+    def copy_buffer_to_hbm(self, data: Union[bytes, ctypes.c_void_p], data_size: int) -> ctypes.c_void_p:
+        """
+        Copy host buffer to hbm, the buffer is not copied on host
+
+        Parameters
+        ----------
+        data: Union[bytes, ctypes.c_void_p]
+            binary data or a host buffer pointer, such as a memory mapped file
+        data_size: int
+            data size
+
+        Returns
+        -------
+        hbm buffer pointer
+
+        """
         try:
-            c_memory_p = self.malloc(int(math.ceil(len(data) / 32) * 32 + 32), "RT_MEMORY_HBM")
+            c_memory_p = self.malloc(int(math.ceil(data_size / 32) * 32 + 32), "RT_MEMORY_HBM")
         except BaseException as e:
             logger.log_err("rtMalloc on HBM failed, HBM memory info:  %s"
                            % str(self.get_memory_info_ex("RT_MEMORYINFO_HBM")))
             raise
-        self.memcpy(c_memory_p, int(math.ceil(len(data) / 32) * 32 + 32), data, len(data), "RT_MEMCPY_HOST_TO_DEVICE")
+        self.memcpy(c_memory_p, int(math.ceil(data_size / 32) * 32 + 32), data, data_size,
+                    "RT_MEMCPY_HOST_TO_DEVICE")
         return c_memory_p
 
     def get_data_from_hbm(self,
@@ -26,6 +26,8 @@ import numpy as np
 from op_test_frame.common import op_status
 from op_test_frame.utils import file_util
 from op_test_frame.st.interface.op_st_case_info import OpSTCaseTrace
+from op_test_frame.st.interface.st_trace import OpSTStageTracer
+from op_test_frame.st.interface.data_file import DataCompressStats
 from op_test_frame.st.interface.const_manager import ConstManager
 from op_test_frame.st.interface import utils
 
@@ -67,8 +69,11 @@ class OpSTCaseReport:
         """
         if not json_obj:
             return ""
-        return OpSTCaseReport(OpSTCaseTrace.parser_json_obj(
+        case_rpt = OpSTCaseReport(OpSTCaseTrace.parser_json_obj(
             json_obj.get("trace_detail")))
+        if json_obj.get("expect") in [ConstManager.EXPECT_SUCCESS, ConstManager.EXPECT_FAILED]:
+            case_rpt.expect = json_obj.get("expect")
+        return case_rpt
 
     def update_case_status(self):
         """
@@ -120,6 +125,8 @@ class OpSTReport:
         self.success_cnt = 0
         self.report_list = []
         self.expect_dict = {}
+        self.tracer = OpSTStageTracer()
+        self.compress_stats = DataCompressStats()
 
     @staticmethod
     def parser_json_obj(json_obj):
@@ -197,6 +204,21 @@ class OpSTReport:
             return ""
         return case_reports[0]
 
+    def get_failed_case_reports(self):
+        """
+        get the case reports whose status does not match the expect,
+        the status is recalculated by the stage results of trace detail
+        :return: the list of OpSTCaseReport object
+        """
+        failed_case_reports = []
+        for case_rpt in self.report_list:
+            if not case_rpt.trace_detail:
+                continue
+            case_rpt.update_case_status()
+            if case_rpt.status != case_rpt.expect:
+                failed_case_reports.append(case_rpt)
+        return failed_case_reports
+
     def console_print(self):
         """
         print summary info to console
@@ -238,14 +260,33 @@ class OpSTReport:
             raise utils.OpTestGenException(ConstManager.OP_TEST_GEN_INVALID_PATH_ERROR) from ex
         finally:
             pass
+        self._save_trace(report_data_dir)
+
+    def _save_trace(self, report_data_dir):
+        if not self.tracer.spans:
+            return
+        trace_file_path = os.path.join(report_data_dir, ConstManager.ST_TRACE_FILE_NAME)
+        try:
+            self.tracer.save_chrome_trace(trace_file_path)
+            utils.print_info_log("The stage trace is saved in: %s." % trace_file_path)
+        except OSError as ex:
+            utils.print_warn_log(
+                'Failed to save the stage trace to {}. {} '.format(trace_file_path, str(ex)))
+        finally:
+            pass
 
     def _to_json_obj(self):
         report_tuple = (case_rpt.to_json_obj() for case_rpt in self.report_list)
-        return {
+        json_obj = {
             "run_cmd": self.run_cmd,
             "report_list": list(report_tuple),
             "summary": self._summary_to_json()
         }
+        if self.tracer.spans:
+            json_obj["slowest_cases"] = self.tracer.slowest_cases_to_json()
+        if self.compress_stats.file_cnt:
+            json_obj["data_compression"] = self.compress_stats.to_json_obj()
+        return json_obj
 
     def _summary_to_json(self):
         return {
@@ -270,5 +311,15 @@ run command: %s
 - failed count: %d
 ------------------------------------------------------------------------
 """ % (self.run_cmd, self.total_cnt, self.success_cnt, self.failed_cnt)
+        slowest_cases_txt = self.tracer.slowest_cases_txt()
+        if slowest_cases_txt:
+            total_txt += slowest_cases_txt
+            total_txt += "------------------------------------------------------------------------\n"
+        if self.compress_stats.file_cnt:
+            compress_info = self.compress_stats.to_json_obj()
+            total_txt += "- data compression ratio: %.2f, compress %.2f MB/s, decompress %.2f MB/s\n" % (
+                compress_info.get("compression ratio"), compress_info.get("compress MB/s"),
+                compress_info.get("decompress MB/s"))
+            total_txt += "------------------------------------------------------------------------\n"
         total_txt += "========================================================================\n"
         return total_txt
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# coding=utf-8
+# Copyright 2021 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+op st stage trace,
+apply info classes: OpSTTraceSpan, OpSTStageTracer
+"""
+import os
+import json
+import time
+import threading
+import contextlib
+
+from op_test_frame.st.interface.const_manager import ConstManager
+
+
+class OpSTTraceSpan:
+    """
+    The class for store one stage span information.
+    """
+    def __init__(self, stage_name, case_name=None, start_time=0.0):
+        self.stage_name = stage_name
+        self.case_name = case_name
+        self.start_time = start_time
+        self.end_time = start_time
+        self.bytes_processed = 0
+        self.thread_id = threading.get_ident()
+
+    def get_duration(self):
+        """
+        get span duration
+        :return: duration in second
+        """
+        return self.end_time - self.start_time
+
+    def to_chrome_event(self, pid):
+        """
+        generate chrome trace complete event
+        :param pid: the process id
+        :return: json
+        """
+        args = {"bytes_processed": self.bytes_processed}
+        if self.case_name:
+            args["case_name"] = self.case_name
+        return {
+            "name": self.stage_name,
+            "cat": self.case_name if self.case_name else "msopst",
+            "ph": "X",
+            "ts": self.start_time * ConstManager.US_PER_SECOND,
+            "dur": self.get_duration() * ConstManager.US_PER_SECOND,
+            "pid": pid,
+            "tid": self.thread_id,
+            "args": args
+        }
+
+
+class OpSTStageTracer:
+    """
+    The class for record spans of each stage and case.
+    """
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, stage_name, case_name=None):
+        """
+        record a span for the stage, the bytes_processed of the yield span
+        can be updated by caller.
+        :param stage_name: the stage name
+        :param case_name: the case name, None for the stage of all cases
+        """
+        trace_span = OpSTTraceSpan(stage_name, case_name, time.time())
+        try:
+            yield trace_span
+        finally:
+            trace_span.end_time = time.time()
+            with self._lock:
+                self.spans.append(trace_span)
+
+    def get_case_durations(self):
+        """
+        get durations of each case grouped by stage
+        :return: dict, like {case_name: {stage_name: duration}}
+        """
+        case_durations = {}
+        for trace_span in self.spans:
+            if not trace_span.case_name:
+                continue
+            stage_durations = case_durations.setdefault(
+                trace_span.case_name, {})
+            stage_durations[trace_span.stage_name] = \
+                stage_durations.get(trace_span.stage_name, 0.0) + \
+                trace_span.get_duration()
+        return case_durations
+
+    def get_slowest_cases(self, top_n=ConstManager.TRACE_TOP_N):
+        """
+        get the top n slowest cases
+        :param top_n: the count of cases
+        :return: list of (case_name, total duration, stage durations)
+        """
+        case_list = [(case_name, sum(stage_durations.values()), stage_durations)
+                     for case_name, stage_durations in self.get_case_durations().items()]
+        case_list.sort(key=lambda x: x[1], reverse=True)
+        return case_list[:top_n]
+
+    def slowest_cases_to_json(self, top_n=ConstManager.TRACE_TOP_N):
+        """
+        generate json of the top n slowest cases
+        :return: json
+        """
+        return [{"case_name": case_name,
+                 "duration": total_duration,
+                 "stage_duration": stage_durations}
+                for case_name, total_duration, stage_durations in self.get_slowest_cases(top_n)]
+
+    def slowest_cases_txt(self, top_n=ConstManager.TRACE_TOP_N):
+        """
+        generate table text of the top n slowest cases
+        :return: table text
+        """
+        slowest_cases = self.get_slowest_cases(top_n)
+        if not slowest_cases:
+            return ""
+        table_txt = "- top %d slowest cases:\n" % len(slowest_cases)
+        for case_name, total_duration, stage_durations in slowest_cases:
+            stage_txt = ", ".join("%s: %0.3fs" % (stage_name, duration)
+                                  for stage_name, duration in stage_durations.items())
+            table_txt += "  %-50s %10.3fs  (%s)\n" % (case_name, total_duration, stage_txt)
+        return table_txt
+
+    def save_chrome_trace(self, trace_file_path):
+        """
+        save spans as chrome trace json, can be opened by chrome://tracing
+        or perfetto ui.
+        :param trace_file_path: the trace json file path
+        """
+        pid = os.getpid()
+        events = [trace_span.to_chrome_event(pid) for trace_span in self.spans]
+        if os.path.exists(trace_file_path):
+            os.remove(trace_file_path)
+        with os.fdopen(os.open(trace_file_path, ConstManager.DATA_FILE_FLAGS,
+                               ConstManager.DATA_FILE_MODES), 'w') as trace_fout:
+            trace_fout.write(json.dumps({"traceEvents": events,
+                                         "displayTimeUnit": "ms"}))
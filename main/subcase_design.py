@@ -10,7 +10,7 @@ Huawei Technologies Co., Ltd. All Rights Reserved © 2020
 
 import os
 
-from op_test_frame.st.interface.global_config_parser import GlobalConfig as GC
+from op_test_frame.st.interface.global_config_parser import LazyWhiteLists
 
 from op_test_frame.st.interface import utils
 from op_test_frame.st.interface import st_report
@@ -24,7 +24,7 @@ class SubCaseDesign:
     """
     the class for design test subcase.
     """
-    WHITE_LISTS = GC.instance().white_lists
+    WHITE_LISTS = LazyWhiteLists()
 
     def __init__(self, current_json_path, json_obj,
                  total_case_list, report):
@@ -353,13 +353,15 @@ class SubCaseDesign:
         err_thr = py_file_and_function[2]
         self._parse_expect_output_param(case, py_file, function, err_thr)
         case_idx += 1
-        case_list.append(case)
-        # deal with report
-        case_info = op_st_case_info.OpSTCase(case['case_name'],
-                                             case)
-        st_case_trace = op_st_case_info.OpSTCaseTrace(case_info)
-        case_rpt = st_report.OpSTCaseReport(st_case_trace)
-        self.report.add_case_report(case_rpt)
+        # dynamic shape case is expanded to one case for each typical shape
+        for sweep_case in dynamic_handle.expand_typical_shape_sweep(case):
+            case_list.append(sweep_case)
+            # deal with report
+            case_info = op_st_case_info.OpSTCase(sweep_case['case_name'],
+                                                 sweep_case)
+            st_case_trace = op_st_case_info.OpSTCaseTrace(case_info)
+            case_rpt = st_report.OpSTCaseReport(st_case_trace)
+            self.report.add_case_report(case_rpt)
         return case_idx, case_list
 
     def _check_list_str_valid(self, json_obj, key, support_list, tensor):
@@ -437,6 +439,19 @@ class SubCaseDesign:
                 item, self.current_json_path)
         one_op_dict.update({
             ConstManager.TYPICAL_SHAPE: typical_shape_list})
+        sweep_count = op_desc.get(ConstManager.SHAPE_SWEEP_COUNT)
+        if sweep_count is not None:
+            if not isinstance(sweep_count, int) or isinstance(sweep_count, bool) \
+                    or sweep_count <= 0:
+                utils.print_error_log(
+                    'The value(%s) of "%s" for "%s" must be an int greater '
+                    'than 0. Please modify it in file %s.' % (
+                        sweep_count, ConstManager.SHAPE_SWEEP_COUNT, op_key,
+                        self.current_json_path))
+                raise utils.OpTestGenException(
+                    ConstManager.OP_TEST_GEN_INVALID_DATA_ERROR)
+            # values of one_op_dict are lists
+            one_op_dict.update({ConstManager.SHAPE_SWEEP_COUNT: [sweep_count]})
         if op_desc.get(ConstManager.SHAPE_RANGE):
             shape_range_list_list = []
             shape_range_list = self._check_list_list_valid(
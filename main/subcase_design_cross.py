@@ -298,7 +298,7 @@ class SubCaseDesignCross(SD.SubCaseDesign):
             return input_desc_list
         for input_desc in json_obj[ConstManager.INPUT_DESC]:
             format_list = self._check_list_str_valid(
-                input_desc, 'format', list(self.WHITE_LISTS.format_map.keys()), ConstManager.INPUT_DESC)
+                input_desc, 'format', self.WHITE_LISTS.format_list, ConstManager.INPUT_DESC)
             type_list = self._check_list_str_valid(
                 input_desc, 'type', self.WHITE_LISTS.type_list,
                 ConstManager.INPUT_DESC)
@@ -346,7 +346,7 @@ class SubCaseDesignCross(SD.SubCaseDesign):
             raise utils.OpTestGenException(ConstManager.OP_TEST_GEN_INVALID_DATA_ERROR)
         for output_desc in json_obj[ConstManager.OUTPUT_DESC]:
             format_list = self._check_list_str_valid(
-                output_desc, 'format', list(self.WHITE_LISTS.format_map.keys()), ConstManager.OUTPUT_DESC)
+                output_desc, 'format', self.WHITE_LISTS.format_list, ConstManager.OUTPUT_DESC)
             type_list = self._check_list_str_valid(
                 output_desc, 'type', self.WHITE_LISTS.type_list,
                 ConstManager.OUTPUT_DESC)
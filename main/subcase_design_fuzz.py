@@ -328,7 +328,7 @@ class SubCaseDesignFuzz(SD.SubCaseDesign):
                 ConstManager.OP_TEST_GEN_INVALID_DATA_ERROR)
         for desc_obj in json_obj[desc_type]:
             format_value = self._check_fuzz_value_valid(
-                (desc_obj, 'format', list(self.WHITE_LISTS.format_map.keys())),
+                (desc_obj, 'format', self.WHITE_LISTS.format_list),
                 desc_type, fuzz_dict)
             type_value = self._check_fuzz_value_valid(
                 (desc_obj, 'type', self.WHITE_LISTS.type_list),
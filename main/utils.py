@@ -9,15 +9,14 @@ Huawei Technologies Co., Ltd. All Rights Reserved © 2020
 
 import os
 import os.path
-import subprocess
+import signal
+import asyncio
 import sys
 import time
 import re
 import json
+import hashlib
 
-import numpy as np
-
-from op_test_frame.st.interface.data_generator import DataGenerator
 from op_test_frame.st.interface.const_manager import ConstManager
 
 
@@ -591,22 +590,182 @@ def add_new_key_to_cross_list(tensor, cross_key_list):
             cross_key_list.append(key)
 
 
-def execute_command(cmd):
+class CommandResult:
+    """
+    The class for store the result of an executed command.
+    """
+    def __init__(self, cmd, log_path=None):
+        self.cmd = cmd
+        self.log_path = log_path
+        self.returncode = None
+        self.duration = 0.0
+        self.is_timeout = False
+
+    def is_success(self):
+        """
+        check the command is executed successfully
+        :return: bool
+        """
+        return self.returncode == 0 and not self.is_timeout
+
+    def to_json_obj(self):
+        """
+        generate json
+        :return: json
+        """
+        return {
+            "cmd": " ".join(self.cmd),
+            "returncode": self.returncode,
+            "duration": self.duration,
+            "timeout": self.is_timeout,
+            "log_path": self.log_path
+        }
+
+
+class CommandExecutor:
+    """
+    The class for executing commands concurrently by asyncio.
+    The output of each command is streamed to console with prefix, and to
+    its own log file if log_dir is specified.
+    """
+    def __init__(self, max_workers=None, log_dir=None, timeout=None):
+        self.max_workers = max_workers if max_workers else (os.cpu_count() or 1)
+        self.log_dir = log_dir
+        self.timeout = timeout
+        # the running processes, they are in their own sessions, so SIGINT of
+        # the terminal is forwarded to them
+        self._processes = set()
+        self._interrupted = False
+
+    @staticmethod
+    async def _stream_output(process, prefix, log_file):
+        # read by chunk instead of readline, the line of atc may be longer
+        # than the line limit of StreamReader
+        pending = b''
+        while True:
+            chunk = await process.stdout.read(ConstManager.STREAM_READ_SIZE)
+            lines = (pending + chunk).split(b'\n')
+            # read until EOF, so the output after process exit is not dropped
+            pending = lines.pop() if chunk else b''
+            for line in lines:
+                line = line.decode(errors='replace').rstrip()
+                if log_file is not None:
+                    log_file.write(line + '\n')
+                if line:
+                    print(prefix + line)
+            if not chunk:
+                break
+        return await process.wait()
+
+    def run(self, cmd_list, cwd=None):
+        """
+        run commands concurrently, up to max_workers at a time
+        :param cmd_list: the list of command, each command is a list
+        :param cwd: the working directory of commands
+        :return: the list of CommandResult, in the order of cmd_list
+        """
+        if self.log_dir:
+            make_dirs(self.log_dir)
+        self._interrupted = False
+        results = asyncio.run(self._run_all(cmd_list, cwd))
+        if self._interrupted:
+            raise KeyboardInterrupt
+        return results
+
+    def _forward_sigint(self):
+        self._interrupted = True
+        print_warn_log('Interrupted, send SIGINT to the running commands.')
+        for process in list(self._processes):
+            try:
+                os.killpg(process.pid, signal.SIGINT)
+            except OSError:
+                pass
+            finally:
+                pass
+
+    async def _run_all(self, cmd_list, cwd):
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGINT, self._forward_sigint)
+            has_handler = True
+        except (RuntimeError, ValueError, NotImplementedError):
+            # not in the main thread
+            has_handler = False
+        finally:
+            pass
+        semaphore = asyncio.Semaphore(self.max_workers)
+        tasks = [self._run_one(index, cmd, cwd, semaphore, len(cmd_list) > 1)
+                 for index, cmd in enumerate(cmd_list)]
+        try:
+            return list(await asyncio.gather(*tasks))
+        finally:
+            if has_handler:
+                loop.remove_signal_handler(signal.SIGINT)
+
+    def _open_log_file(self, index, cmd):
+        if not self.log_dir:
+            return None, None
+        log_path = os.path.join(self.log_dir, 'cmd_%d_%s.log' % (index, os.path.basename(cmd[0])))
+        if os.path.exists(log_path):
+            os.remove(log_path)
+        return log_path, os.fdopen(os.open(log_path, ConstManager.WRITE_FLAGS,
+                                           ConstManager.WRITE_MODES), 'w')
+
+    async def _run_one(self, index, cmd, cwd, semaphore, with_prefix):
+        prefix = '[%d] ' % index if with_prefix else ''
+        async with semaphore:
+            log_path, log_file = self._open_log_file(index, cmd)
+            result = CommandResult(cmd, log_path)
+            print_info_log('%sExecute command: %s' % (prefix, cmd))
+            start_time = time.time()
+            try:
+                if self._interrupted:
+                    raise OSError('interrupted')
+                process = await asyncio.create_subprocess_exec(
+                    *cmd, cwd=cwd, stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT, start_new_session=True)
+                self._processes.add(process)
+                try:
+                    result.returncode = await asyncio.wait_for(
+                        self._stream_output(process, prefix, log_file), self.timeout)
+                except asyncio.TimeoutError:
+                    # kill the whole process group, the children may hold the pipe
+                    try:
+                        os.killpg(process.pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        # the process group exits before it is killed
+                        pass
+                    finally:
+                        pass
+                    result.returncode = await process.wait()
+                    result.is_timeout = True
+                    print_error_log('%sThe command %s exceeds the timeout %s s, killed.'
+                                    % (prefix, cmd, self.timeout))
+                finally:
+                    self._processes.discard(process)
+            except OSError as err:
+                print_error_log('%sFailed to start command %s. %s' % (prefix, cmd, str(err)))
+            finally:
+                if log_file is not None:
+                    log_file.close()
+            result.duration = time.time() - start_time
+        return result
+
+
+def execute_command(cmd, cwd=None, timeout=None):
     """
     Execute command
+    :param cmd: the command list
+    :param cwd: the working directory
+    :param timeout: the timeout in second, None for no limit
+    :return: the CommandResult
     """
-    print_info_log('Execute command: %s' % cmd)
-    process = subprocess.Popen(cmd, shell=False, stdout=subprocess.PIPE,
-                               stderr=subprocess.STDOUT)
-    while process.poll() is None:
-        line = process.stdout.readline()
-        line = line.strip()
-        if line:
-            print(line)
-    if process.returncode != 0:
+    result = CommandExecutor(max_workers=1, timeout=timeout).run([cmd], cwd)[0]
+    if not result.is_success():
         print_error_log('Failed to execute command: %s' % cmd)
         raise OpTestGenException(
             ConstManager.OP_TEST_GEN_INVALID_DATA_ERROR)
+    return result
 
 
 class ScanFile:
@@ -665,7 +824,8 @@ class ConstInput:
         self.is_const = is_const
 
     @staticmethod
-    def add_const_info_in_acl_json(desc_dict, res_desc_dic, output_path, case_name, index):
+    def add_const_info_in_acl_json(desc_dict, res_desc_dic, output_path, case_name, index,
+                                   const_store=None):
         """
         Function: check whether there is an is_const field in the desc_dict,
         and then check whether there is a value field. Otherwise, use the
@@ -677,29 +837,40 @@ class ConstInput:
         output_path-> output path
         case_name-> case name
         index-> input/output index
+        const_store-> ConstDataStore object, the const value larger than its
+        threshold is stored in binary file and referenced by offset
         """
         input_shape = desc_dict.get('shape')
         dtype = desc_dict.get('type')
         if desc_dict.get(ConstManager.IS_CONST) is True:
+            # numpy and data generator are only needed by const input,
+            # import them lazily to keep the startup of other commands fast.
+            import numpy as np
+            from op_test_frame.st.interface.data_generator import DataGenerator
             case_value = desc_dict.get(ConstManager.VALUE)
             if case_value:
                 if isinstance(case_value, str):
                     np_type = getattr(np, dtype)
                     data = np.fromfile(case_value, np_type)
-                    const_value = data.tolist()
                 else:
-                    const_value = np.array(
-                        desc_dict.get(ConstManager.VALUE)).flatten().tolist()
+                    data = np.array(desc_dict.get(ConstManager.VALUE)).flatten()
             else:
                 # generate const value with data_distribute
                 range_min, range_max = desc_dict.get(ConstManager.VALUE_RANGE)
                 data = DataGenerator.gen_data(
                     input_shape, range_min, range_max, dtype,
                     desc_dict.get(ConstManager.DATA_DISTRIBUTE))
-                const_value = ConstInput._generate_const_value(data, output_path, case_name, index)
+                data = ConstInput._generate_const_value(data, output_path, case_name, index)
             const_value_dict = {
-                ConstManager.IS_CONST: desc_dict.get(ConstManager.IS_CONST),
-                ConstManager.CONST_VALUE: const_value}
+                ConstManager.IS_CONST: desc_dict.get(ConstManager.IS_CONST)}
+            if const_store is not None:
+                # the list value is float64 or int64 by numpy, the stored
+                # value is read by the desc type
+                typed_data = data.astype(dtype, copy=False)
+                if const_store.is_external(typed_data):
+                    const_value_dict[ConstManager.CONST_VALUE_FILE] = const_store.add(typed_data)
+            if ConstManager.CONST_VALUE_FILE not in const_value_dict:
+                const_value_dict[ConstManager.CONST_VALUE] = data.tolist()
             res_desc_dic.update(const_value_dict)
 
     @staticmethod
@@ -733,8 +904,7 @@ class ConstInput:
                                  case_name + '_input_' + str(index) + '.bin')
         const_data.tofile(file_path)
         os.chmod(file_path, ConstManager.WRITE_MODES)
-        const_value = const_data.tolist()
-        return const_value
+        return const_data
 
     def deal_with_const(self, input_desc, for_fuzz):
         """
@@ -755,3 +925,63 @@ class ConstInput:
                             'type: true or false.')
             raise OpTestGenException(ConstManager.OP_TEST_GEN_INVALID_DATA_ERROR)
         return True
+
+
+class ConstDataStore:
+    """
+    The class for storing large const values of acl_op.json in one binary
+    file, the json references the value by path and offset, and the same
+    const value of different cases is stored only once.
+    """
+    def __init__(self, data_dir, threshold):
+        self.data_dir = data_dir
+        self.data_path = os.path.join(data_dir, ConstManager.CONST_DATA_FILE_NAME)
+        self.threshold = threshold
+        # {sha256 of data: const value reference}
+        self.ref_map = {}
+        self.offset = 0
+        self.dedup_bytes = 0
+        if os.path.exists(self.data_path):
+            os.remove(self.data_path)
+
+    @staticmethod
+    def load_value(const_ref, data_dir):
+        """
+        load the const value referenced by acl_op.json
+        :param const_ref: dict with path, offset, size and type
+        :param data_dir: the directory of acl_op.json
+        :return: the flatten const value list
+        """
+        import numpy as np
+        np_type = np.dtype(const_ref.get('type'))
+        data = np.fromfile(os.path.join(data_dir, const_ref.get('path')), np_type,
+                           count=const_ref.get('size') // np_type.itemsize,
+                           offset=const_ref.get('offset'))
+        return data.tolist()
+
+    def is_external(self, data):
+        """
+        check the const value should be stored out of acl_op.json
+        :param data: the numpy array of const value
+        """
+        return self.threshold is not None and data.nbytes > self.threshold
+
+    def add(self, data):
+        """
+        append the const value to the binary file if it is not stored
+        :param data: the numpy array of const value
+        :return: dict with path, offset, size and type
+        """
+        payload = data.tobytes()
+        data_hash = hashlib.sha256(payload).hexdigest() + str(data.dtype)
+        if data_hash in self.ref_map:
+            self.dedup_bytes += len(payload)
+            return self.ref_map.get(data_hash)
+        with os.fdopen(os.open(self.data_path, ConstManager.WRITE_FLAGS | os.O_APPEND,
+                               ConstManager.WRITE_MODES), 'ab') as data_file:
+            data_file.write(payload)
+        const_ref = {'path': ConstManager.CONST_DATA_FILE_NAME, 'offset': self.offset,
+                     'size': len(payload), 'type': str(data.dtype)}
+        self.offset += len(payload)
+        self.ref_map[data_hash] = const_ref
+        return const_ref
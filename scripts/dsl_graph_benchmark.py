@@ -0,0 +1,91 @@
+# encoding: utf-8
+"""
+Measure the graph construction time of a long elementwise chain built by the
+te.lang.cce DSL. The auto cast decorators resolve the intrinsic and dtype
+support from the soc support table, the cold column clears the table before
+each api call, which is the cost without the table.
+"""
+import time
+import argparse
+import warnings
+
+DEFAULT_LENGTH = 1000
+DEFAULT_REPEAT = 3
+DEFAULT_SHAPE = [16, 16]
+DEFAULT_SOC_VERSION = "Ascend910"
+MS_PER_S = 1000.0
+
+
+def build_chain(shape, dtype, length, before_call=None):
+    """
+    build the elementwise chain, the int32 input is casted by auto cast
+    :param shape: the shape of input tensors
+    :param dtype: the dtype of input tensors
+    :param length: the api count of the chain
+    :param before_call: called before each api
+    :return: the output tensor
+    """
+    from te import tvm
+    import te.lang.cce as shim
+    data_x = tvm.placeholder(shape, name="data_x", dtype=dtype)
+    data_y = tvm.placeholder(shape, name="data_y", dtype=dtype)
+    scalar = tvm.const(0.5, dtype=dtype)
+    apis = [
+        lambda res: shim.vadd(res, data_y),
+        lambda res: shim.vmuls(res, scalar),
+        lambda res: shim.vmul(res, data_y),
+        lambda res: shim.vabs(res),
+        lambda res: shim.vmaxs(res, scalar),
+    ]
+    res = data_x
+    for index in range(length):
+        if before_call is not None:
+            before_call()
+        res = apis[index % len(apis)](res)
+    return res
+
+
+def measure(shape, dtype, length, repeat, before_call=None):
+    """
+    build the chain for repeat rounds
+    :return: the fastest time in ms
+    """
+    best_time = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        build_chain(shape, dtype, length, before_call)
+        cost = time.perf_counter() - start_time
+        if best_time is None or cost < best_time:
+            best_time = cost
+    return best_time * MS_PER_S
+
+
+def main():
+    """
+    benchmark entry
+    """
+    parser = argparse.ArgumentParser(description="te.lang.cce DSL graph construction benchmark")
+    parser.add_argument("-l", "--length", type=int, default=DEFAULT_LENGTH,
+                        help="api count of the elementwise chain")
+    parser.add_argument("-r", "--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="rounds of each case, the fastest is kept")
+    parser.add_argument("-s", "--shape", type=int, nargs="+", default=DEFAULT_SHAPE,
+                        help="shape of the input tensors")
+    parser.add_argument("--soc_version", default=DEFAULT_SOC_VERSION,
+                        help="the soc version to build for")
+    args = parser.parse_args()
+
+    from te.platform.cce_conf import te_set_version
+    from te.lang.cce.te_compute.util import clear_soc_support_table
+    te_set_version(args.soc_version)
+    warnings.simplefilter("ignore", DeprecationWarning)
+    print("%-10s %8s %12s %12s %10s" % ("dtype", "apis", "cold ms", "cached ms", "speedup"))
+    for dtype in ("float16", "float32", "int32"):
+        cold_ms = measure(args.shape, dtype, args.length, args.repeat, clear_soc_support_table)
+        cached_ms = measure(args.shape, dtype, args.length, args.repeat)
+        print("%-10s %8d %12.2f %12.2f %9.2fx" % (
+            dtype, args.length, cold_ms, cached_ms, cold_ms / cached_ms if cached_ms else 0.0))
+
+
+if __name__ == "__main__":
+    main()
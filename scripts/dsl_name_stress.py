@@ -0,0 +1,125 @@
+# encoding: utf-8
+"""
+Stress the name generator of DSL graph construction with a thread pool. Each
+task builds names in its own name_scope, or in the process scope, and the
+names are checked to be unique and deterministic. If te is installed, the
+cast and reduce graphs are also built concurrently and their tensor names are
+checked.
+"""
+import os
+import sys
+import argparse
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_THREADS = 16
+DEFAULT_TASKS = 200
+DEFAULT_NAMES = 500
+NAME_KINDS = ("cast_compute", "reduce", "dim_conv_ub")
+NAME_GENERATOR_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                                   "..", "auto_schedule", "python", "name_generator.py")
+
+
+def load_name_generator():
+    """
+    load name_generator.py by path, it does not import te
+    """
+    spec = importlib.util.spec_from_file_location("name_generator", NAME_GENERATOR_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def scope_task(name_generator, name_count):
+    """
+    generate names in a scope with a nested scope
+    :return: error message, None if passed
+    """
+    with name_generator.name_scope():
+        indexes = {kind: [] for kind in NAME_KINDS}
+        for index in range(name_count):
+            kind = NAME_KINDS[index % len(NAME_KINDS)]
+            if index % 7 == 0:
+                with name_generator.name_scope():
+                    indexes.get(kind).append(name_generator.next_name_index(kind))
+            else:
+                indexes.get(kind).append(name_generator.next_name_index(kind))
+    for kind, kind_indexes in indexes.items():
+        if kind_indexes != list(range(len(kind_indexes))):
+            return "the indexes of %s in scope are not 0..%d" % (kind, len(kind_indexes) - 1)
+    return None
+
+
+def process_task(name_generator, name_count):
+    """
+    generate names out of scope
+    :return: list of index
+    """
+    return [name_generator.next_name_index("process") for _ in range(name_count)]
+
+
+def graph_task(shape):
+    """
+    build a cast and reduce graph in a scope
+    :return: error message, None if passed
+    """
+    from te import tvm
+    import te.lang.cce as shim
+    from te.lang.cce.te_compute.name_generator import name_scope
+    with name_scope():
+        data = tvm.placeholder(shape, name="data", dtype="float16")
+        res = data
+        for _ in range(4):
+            res = shim.sum(shim.cast_to(shim.cast_to(res, "float32"), "float16"), [0], True)
+        names = []
+        stack = [res]
+        visited = set()
+        while stack:
+            tensor = stack.pop()
+            if tensor in visited:
+                continue
+            visited.add(tensor)
+            names.append(tensor.op.name)
+            stack.extend(tensor.op.input_tensors)
+    if len(names) != len(set(names)):
+        return "duplicated tensor names %s" % sorted(names)
+    return None
+
+
+def main():
+    """
+    stress entry
+    """
+    parser = argparse.ArgumentParser(description="DSL name generator stress")
+    parser.add_argument("-t", "--threads", type=int, default=DEFAULT_THREADS, help="thread count")
+    parser.add_argument("-n", "--tasks", type=int, default=DEFAULT_TASKS, help="task count")
+    parser.add_argument("-m", "--names", type=int, default=DEFAULT_NAMES, help="names in one task")
+    args = parser.parse_args()
+
+    name_generator = load_name_generator()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        errors = [error for error in executor.map(
+            lambda _: scope_task(name_generator, args.names), range(args.tasks)) if error]
+        process_indexes = [index for indexes in executor.map(
+            lambda _: process_task(name_generator, args.names), range(args.tasks))
+                           for index in indexes]
+    if len(process_indexes) != len(set(process_indexes)):
+        errors.append("the indexes out of scope are duplicated")
+    print("name generator: %d tasks, %d threads, %d errors" % (args.tasks, args.threads, len(errors)))
+
+    if importlib.util.find_spec("te") is None:
+        print("te is not installed, the graph stress is skipped")
+    else:
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            graph_errors = [error for error in executor.map(
+                lambda _: graph_task([16, 16]), range(args.tasks)) if error]
+        print("graph: %d tasks, %d threads, %d errors" % (args.tasks, args.threads, len(graph_errors)))
+        errors.extend(graph_errors)
+
+    for error in errors[:10]:
+        print(error)
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# encoding: utf-8
+"""
+Measure the per call overhead of the deprecated te.lang.cce DSL shims over
+calling tbe.dsl directly. Run it before and after changing the shims, the
+overhead column shows the cost of warnings, imports and auto cast layers.
+"""
+import time
+import argparse
+import warnings
+
+DEFAULT_NUMBER = 2000
+DEFAULT_REPEAT = 5
+DEFAULT_SHAPE = [16, 16]
+US_PER_S = 1000000.0
+
+
+def get_cases(shape):
+    """
+    get the benchmark cases
+    :param shape: the shape of input tensors
+    :return: list of (name, shim call, tbe.dsl call)
+    """
+    from te import tvm
+    import te.lang.cce as shim
+    import tbe.dsl as dsl
+    data_fp16 = tvm.placeholder(shape, name="data_fp16", dtype="float16")
+    data_fp32 = tvm.placeholder(shape, name="data_fp32", dtype="float32")
+    scalar_fp16 = tvm.const(2.0, dtype="float16")
+    return [
+        ("vadd", lambda: shim.vadd(data_fp16, data_fp16),
+         lambda: dsl.vadd(data_fp16, data_fp16)),
+        ("vmuls", lambda: shim.vmuls(data_fp16, scalar_fp16),
+         lambda: dsl.vmuls(data_fp16, scalar_fp16)),
+        ("vexp", lambda: shim.vexp(data_fp32),
+         lambda: dsl.vexp(data_fp32)),
+        ("cast_to", lambda: shim.cast_to(data_fp16, "float32"),
+         lambda: dsl.cast_to(data_fp16, "float32")),
+        ("sum", lambda: shim.sum(data_fp32, [1]),
+         lambda: dsl.reduce_sum(data_fp32, [1])),
+        ("broadcast", lambda: shim.broadcast(scalar_fp16, shape),
+         lambda: dsl.broadcast(scalar_fp16, shape)),
+    ]
+
+
+def measure(func, number, repeat):
+    """
+    call the function number times for repeat rounds
+    :return: the fastest time per call in us
+    """
+    best_time = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for _ in range(number):
+            func()
+        cost = (time.perf_counter() - start_time) / number
+        if best_time is None or cost < best_time:
+            best_time = cost
+    return best_time * US_PER_S
+
+
+def main():
+    """
+    benchmark entry
+    """
+    parser = argparse.ArgumentParser(description="te.lang.cce DSL shim benchmark")
+    parser.add_argument("-n", "--number", type=int, default=DEFAULT_NUMBER,
+                        help="calls in one round")
+    parser.add_argument("-r", "--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="rounds of each api, the fastest is kept")
+    parser.add_argument("-s", "--shape", type=int, nargs="+", default=DEFAULT_SHAPE,
+                        help="shape of the input tensors")
+    args = parser.parse_args()
+
+    # keep the default filters, the shims warn as in a real compile
+    warnings.simplefilter("default", DeprecationWarning)
+    print("%-12s %14s %14s %14s" % ("api", "tbe.dsl us", "te.lang.cce us", "overhead us"))
+    for name, shim_call, dsl_call in get_cases(args.shape):
+        dsl_us = measure(dsl_call, args.number, args.repeat)
+        shim_us = measure(shim_call, args.number, args.repeat)
+        print("%-12s %14.2f %14.2f %14.2f" % (name, dsl_us, shim_us, shim_us - dsl_us))
+
+
+if __name__ == "__main__":
+    main()
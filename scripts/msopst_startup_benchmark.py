@@ -0,0 +1,86 @@
+# encoding: utf-8
+"""
+Track the import time of msopst modules by `python -X importtime`.
+The cumulative import time of each module and the slowest imports are
+printed, so the startup regression of the command line tool can be found.
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+MSOPST_PACKAGE = "op_test_frame.st.interface"
+DEFAULT_MODULES = ["arg_parser", "case_generator", "case_design",
+                   "data_generator", "result_comparer"]
+DEFAULT_REPEAT = 5
+DEFAULT_TOP_N = 10
+US_PER_MS = 1000.0
+
+
+def parse_import_time(stderr_txt):
+    """
+    parse the output of `python -X importtime`
+    :param stderr_txt: the stderr of python
+    :return: list of (module name, self time us, cumulative time us)
+    """
+    import_times = []
+    for line in stderr_txt.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        import_times.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return import_times
+
+
+def measure_module(module_name, repeat):
+    """
+    import the module in a new interpreter for several times
+    :param module_name: the full module name
+    :param repeat: the repeat times
+    :return: list of import times of the fastest run
+    """
+    best_times = None
+    for _ in range(repeat):
+        res = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import %s" % module_name],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            universal_newlines=True, env=os.environ.copy())
+        if res.returncode != 0:
+            print("[ERROR] Failed to import %s:\n%s" % (module_name, res.stderr))
+            return []
+        import_times = parse_import_time(res.stderr)
+        total = import_times[-1][2] if import_times else 0
+        if best_times is None or total < best_times[-1][2]:
+            best_times = import_times
+    return best_times or []
+
+
+def main():
+    """
+    benchmark entry
+    """
+    parser = argparse.ArgumentParser(description="msopst startup benchmark")
+    parser.add_argument("-m", "--modules", nargs="+", default=DEFAULT_MODULES,
+                        help="msopst modules to import")
+    parser.add_argument("-r", "--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="import times of each module, the fastest is kept")
+    parser.add_argument("-n", "--top_n", type=int, default=DEFAULT_TOP_N,
+                        help="count of the slowest imports to print")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        module_name = "%s.%s" % (MSOPST_PACKAGE, module)
+        import_times = measure_module(module_name, args.repeat)
+        if not import_times:
+            continue
+        print("[INFO] %-60s %10.2f ms" % (module_name, import_times[-1][2] / US_PER_MS))
+        import_times.sort(key=lambda x: x[1], reverse=True)
+        for name, self_us, cumulative_us in import_times[:args.top_n]:
+            print("       %-58s self %8.2f ms  cumulative %8.2f ms" % (
+                name, self_us / US_PER_MS, cumulative_us / US_PER_MS))
+
+
+if __name__ == "__main__":
+    main()
@@ -29,7 +29,8 @@ OTHER_FILE="OTHER_FILE"
 class FileChangeInfo:
     def __init__(self, proto_changed_files=None, tiling_changed_files=None, pass_changed_files=None,
                  om_changed_files=None, aicpu_changed_files=None,
-                 plugin_changed_files=None, onnx_plugin_changed_files=None, other_changed_files=None):
+                 plugin_changed_files=None, onnx_plugin_changed_files=None, other_changed_files=None,
+                 python_changed_files=None):
         self.proto_changed_files = [] if proto_changed_files is None else proto_changed_files
         self.tiling_changed_files = [] if tiling_changed_files is None else tiling_changed_files
         self.pass_changed_files = [] if pass_changed_files is None else pass_changed_files
@@ -38,6 +39,7 @@ class FileChangeInfo:
         self.plugin_changed_files = [] if plugin_changed_files is None else plugin_changed_files
         self.onnx_plugin_changed_files = [] if onnx_plugin_changed_files is None else onnx_plugin_changed_files
         self.other_changed_files = [] if other_changed_files is None else other_changed_files
+        self.python_changed_files = [] if python_changed_files is None else python_changed_files
 
     def print_change_info(self):
         print("=========================================================================\n")
@@ -58,6 +60,9 @@ class FileChangeInfo:
         print("onnx plugin changed files: \n%s" % "\n".join(self.onnx_plugin_changed_files))
         print("-------------------------------------------------------------------------\n")
         print("other changed files: \n%s" % "\n".join(self.other_changed_files))
+        print("-------------------------------------------------------------------------\n")
+        print("python changed files, the python ut is selected by scripts/ut_dependency_graph.py: \n%s" %
+              "\n".join(self.python_changed_files))
         print("=========================================================================\n")
 
 
@@ -81,13 +86,15 @@ def get_file_change_info_from_ci(changed_file_info_from_ci):
         plugin_changed_files = []
         onnx_plugin_changed_files = []
         other_changed_files = []
-
+        python_changed_files = []
 
         base_path = os.path.join("ops", "built-in")
         ut_path = os.path.join("ops", "built-in", "tests", "ut")
         for line in lines:
             line = line.strip()
             if line.endswith(".py"):
+                # the python ut is run by scripts/run_ut.py, not the c++ ut
+                python_changed_files.append(line)
                 continue
             if line.startswith(os.path.join(base_path, "aicpu")) or line.startswith(
                     os.path.join(ut_path, "aicpu_test")) or line.startswith(
@@ -119,7 +126,8 @@ def get_file_change_info_from_ci(changed_file_info_from_ci):
     return FileChangeInfo(proto_changed_files=proto_changed_files, tiling_changed_files=tiling_changed_files,
                           pass_changed_files=pass_changed_files, om_changed_files=om_changed_files,
                           aicpu_changed_files=aicpu_changed_files, plugin_changed_files=plugin_changed_files,
-                          onnx_plugin_changed_files=onnx_plugin_changed_files, other_changed_files=other_changed_files)
+                          onnx_plugin_changed_files=onnx_plugin_changed_files, other_changed_files=other_changed_files,
+                          python_changed_files=python_changed_files)
 
 
 def get_change_relate_ut_dir_list(changed_file_info_from_ci):
@@ -0,0 +1,121 @@
+# encoding: utf-8
+"""
+Measure matching the tag sequences of synthetic compute graphs against the
+fused op patterns, by scanning pattern.data one by one and by the pattern
+index. The synthetic graphs are the patterns, the patterns with one tag
+changed and random sequences of the same tags.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import importlib.util
+
+DEFAULT_GRAPHS = 10000
+DEFAULT_REPEAT = 5
+DEFAULT_SEED = 0
+DEFAULT_EXTRA_PATTERNS = 0
+US_PER_S = 1000000.0
+PATTERN_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                            "..", "auto_schedule", "python", "pattern.py")
+
+
+def load_pattern_module():
+    """
+    load pattern.py by path, it does not import te
+    """
+    spec = importlib.util.spec_from_file_location("pattern", PATTERN_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def get_patterns(pattern, extra_count, rand):
+    """
+    get the patterns, the extra patterns are the shuffled copies
+    :return: list of (name, tag sequence)
+    """
+    patterns = list(pattern.data.items()) + \
+        [(pattern.BN_UPDATE_BERT_TARGET, tags) for tags in pattern.bn_update_bert_target]
+    for index in range(extra_count):
+        tags = list(patterns[index % len(patterns)][1])
+        rand.shuffle(tags)
+        patterns.append(("extra_%d" % index, tags))
+    return patterns
+
+
+def get_graphs(patterns, count, rand):
+    """
+    get the tag sequences of synthetic graphs
+    """
+    all_tags = sorted({tag for _, tags in patterns for tag in tags})
+    graphs = []
+    for index in range(count):
+        tags = list(patterns[rand.randrange(len(patterns))][1])
+        if index % 3 == 1:
+            tags[rand.randrange(len(tags))] = rand.choice(all_tags)
+        elif index % 3 == 2:
+            tags = [rand.choice(all_tags) for _ in tags]
+        graphs.append(tags)
+    return graphs
+
+
+def scan_match(patterns, tags):
+    """
+    match by comparing with each pattern
+    """
+    for name, pattern_tags in patterns:
+        if tags == pattern_tags:
+            return name
+    return None
+
+
+def measure(func, graphs, repeat):
+    """
+    match all graphs for repeat rounds
+    :return: (the fastest time per graph in us, matched count)
+    """
+    best_time = None
+    matched = 0
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        matched = sum(1 for tags in graphs if func(tags) is not None)
+        cost = (time.perf_counter() - start_time) / len(graphs)
+        if best_time is None or cost < best_time:
+            best_time = cost
+    return best_time * US_PER_S, matched
+
+
+def main():
+    """
+    benchmark entry
+    """
+    parser = argparse.ArgumentParser(description="fused op pattern matching benchmark")
+    parser.add_argument("-n", "--graphs", type=int, default=DEFAULT_GRAPHS,
+                        help="count of synthetic graphs")
+    parser.add_argument("-r", "--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="rounds, the fastest is kept")
+    parser.add_argument("-e", "--extra_patterns", type=int, default=DEFAULT_EXTRA_PATTERNS,
+                        help="count of extra patterns, to simulate a larger catalogue")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="random seed")
+    args = parser.parse_args()
+
+    rand = random.Random(args.seed)
+    pattern = load_pattern_module()
+    patterns = get_patterns(pattern, args.extra_patterns, rand)
+    graphs = get_graphs(patterns, args.graphs, rand)
+    pattern_index = pattern.PatternIndex(patterns)
+    scan_us, scan_matched = measure(lambda tags: scan_match(patterns, tags), graphs, args.repeat)
+    index_us, index_matched = measure(pattern_index.match, graphs, args.repeat)
+    if scan_matched != index_matched:
+        print("matched count differs: scan %d, index %d" % (scan_matched, index_matched))
+        sys.exit(1)
+    print("patterns: %d, graphs: %d, matched: %d" % (len(patterns), len(graphs), index_matched))
+    print("%-8s %12s" % ("method", "us/graph"))
+    print("%-8s %12.3f" % ("scan", scan_us))
+    print("%-8s %12.3f" % ("index", index_us))
+
+
+if __name__ == "__main__":
+    main()
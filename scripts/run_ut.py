@@ -3,6 +3,14 @@ import os
 import subprocess
 from absl import flags, app
 import shutil
+from ut_dependency_graph import OPS_SUITE
+from ut_dependency_graph import SCH_SUITE
+from ut_dependency_graph import get_suite_ut_files
+from ut_dependency_graph import get_unmapped_files
+from ut_dependency_graph import select_ut
+from ut_shard import merge_coverage
+from ut_shard import print_shard_table
+from ut_shard import run_shards
 
 FLAGS = flags.FLAGS
 
@@ -19,29 +27,88 @@ flags.DEFINE_string(
     "pr_changed_file", None,
     "git diff result file by ci, analyse relate ut by this file")
 flags.DEFINE_integer("process_num", None, "process number")
+flags.DEFINE_string("timing_file", None,
+                    "the durations of schedule ut case files to balance the shards")
 
 cur_dir = os.path.realpath(__file__)
 
 
+def write_case_list(case_files, list_name):
+    """
+    write the case files as a changed file list for --pr_changed_file of the
+    ut runners, which run the cases related to the changed files
+    :return: the path of the list file
+    """
+    root_path = os.path.dirname(os.path.dirname(cur_dir))
+    list_dir = os.path.join(root_path, "build", "test", "ut", "selected_ut")
+    if not os.path.exists(list_dir):
+        os.makedirs(list_dir)
+    list_path = os.path.join(list_dir, list_name + ".txt")
+    with open(list_path, "w") as list_file:
+        list_file.write("".join(case_file + "\n" for case_file in case_files))
+    return list_path
+
+
+def run_sch_shards(run_file_path, sch_params, case_files, sch_cov_path,
+                   sch_report_path):
+    """
+    run the schedule ut case files in parallel shards, the shards are
+    balanced by the durations in the timing file, each shard has its own
+    coverage and report directory
+    :return: the shard results of run_shards
+    """
+    root_path = os.path.dirname(os.path.dirname(cur_dir))
+    timing_path = FLAGS.timing_file or os.path.join(
+        root_path, "build", "test", "ut", "sch_ut_timing.json")
+    shard_num = FLAGS.process_num or os.cpu_count()
+
+    def _get_shard_cmd(index, shard_files):
+        shard_params = [param for param in sch_params
+                        if not param.startswith(("--cov_path=", "--report_path=",
+                                                 "--pr_changed_file="))]
+        shard_params.append("--cov_path=" + os.path.join(sch_cov_path, "shard_%d" % index))
+        shard_params.append("--report_path=" + os.path.join(sch_report_path, "shard_%d" % index))
+        shard_params.append("--pr_changed_file=" + write_case_list(
+            shard_files, "%s_shard_%d" % (SCH_SUITE, index)))
+        return ["python3", run_file_path] + shard_params
+
+    print("[INFO]Run %d schedule ut case files in %d shards" %
+          (len(case_files), min(shard_num, len(case_files))))
+    results = run_shards(_get_shard_cmd, case_files, shard_num, timing_path,
+                         sch_report_path)
+    print_shard_table(results)
+    return results
+
+
 def main(argv):
     del argv
-    sch_tag = 0
-    ops_tag = 0
     pr_changed_files = FLAGS.pr_changed_file
+    lines = []
     if not pr_changed_files or not str(pr_changed_files).strip():
-        ops_tag = 1
+        # None is all cases of the suite
+        selection = {OPS_SUITE: None}
     else:
         pr_changed_files = os.path.realpath(FLAGS.pr_changed_file)
         with open(pr_changed_files) as pr_f:
             lines = pr_f.readlines()
-
-        for line in lines:
-            line = line.strip()
-            if line.startswith(os.path.join("auto_schedule", "python")) or   \
-                    line.startswith(os.path.join("tools", "sch_test_frame")):
-                sch_tag = 1
-            else:
-                ops_tag = 1
+        selection = select_ut(lines)
+    # the changed files out of the import graph run the ops runner with the
+    # original changed file list as before
+    unmapped_files = get_unmapped_files(lines)
+    if unmapped_files and not selection.get(OPS_SUITE):
+        print("[INFO]ops ut: %d changed files are not in the import graph, "
+              "pass the changed file list to the ops runner" % len(unmapped_files))
+        selection[OPS_SUITE] = None
+    for suite in (SCH_SUITE, OPS_SUITE):
+        if suite not in selection:
+            continue
+        if selection.get(suite) is None:
+            print("[INFO]%s ut: all cases are selected" % suite)
+        else:
+            print("[INFO]%s ut: %d case files are selected by the import graph" %
+                  (suite, len(selection.get(suite))))
+    sch_tag = selection.get(SCH_SUITE, []) != []
+    ops_tag = selection.get(OPS_SUITE, []) != []
     params_dict = {
         "--soc_version=": FLAGS.soc_version,
         "--simulator_lib_path=": FLAGS.simulator_lib_path,
@@ -51,6 +118,11 @@ def main(argv):
     }
     if ops_tag:
         params_dict["--process_num="]=FLAGS.process_num
+    if selection.get(OPS_SUITE):
+        # the runner is not limited by the list, the original changed files
+        # select the cases as before, and the selected case files are added
+        params_dict["--pr_changed_file="] = write_case_list(
+            [line.strip() for line in lines if line.strip()] + selection.get(OPS_SUITE), OPS_SUITE)
     params = []
     for input_key in params_dict.keys():
         params.append(input_key + str(params_dict[input_key]))
@@ -61,17 +133,17 @@ def main(argv):
     sch_cov_path = os.path.join(root_path, 'build/test/ut/cov_report/sch/python_utest')
     sch_report_path = os.path.join(root_path, 'build/test/ut/cov_report/sch/report')
 
+    sch_cov_files = []
     if sch_tag:
         print("[INFO]Run schedule ut case!!!")
 
         params_dict["--cov_path="] = sch_cov_path
         params_dict["--report_path="] = sch_report_path
+        params_dict["--pr_changed_file="] = FLAGS.pr_changed_file
         sch_params = []
         for input_key in params_dict.keys():
             sch_params.append(input_key + str(params_dict[input_key]))
 
-
-
         frame_path = os.path.join(root_path, 'auto_schedule', 'python',
                                   'tests')
         case_path = os.path.join(root_path, 'auto_schedule', 'python', 'tests',
@@ -80,11 +152,25 @@ def main(argv):
             [case_path, frame_path, python_path])
         run_file_path = os.path.join(root_path, "auto_schedule", "python",
                                      "tests", "sch_run_ut.py")
-        cmd = ["python3", run_file_path] + sch_params
-        print("[INFO]cmd is ", str(cmd))
-        res_msg = os.system(" ".join(cmd))
-        if res_msg != 0:
-            exit(-1)
+        case_files = selection.get(SCH_SUITE)
+        if case_files is None:
+            case_files = get_suite_ut_files(SCH_SUITE)
+        if not case_files:
+            cmd = ["python3", run_file_path] + sch_params
+            print("[INFO]cmd is ", str(cmd))
+            res_msg = os.system(" ".join(cmd))
+            if res_msg != 0:
+                exit(-1)
+            sch_cov_files.append(os.path.join(sch_cov_path, ".coverage"))
+        else:
+            shard_results = run_sch_shards(run_file_path, sch_params,
+                                           case_files, sch_cov_path,
+                                           sch_report_path)
+            sch_cov_files.extend(
+                os.path.join(sch_cov_path, "shard_%d" % index, ".coverage")
+                for index in range(len(shard_results)))
+            if any(result.get("return_code") != 0 for result in shard_results):
+                exit(-1)
 
     if ops_tag:
         print("[INFO]Run ops ut case!!!")
@@ -99,12 +185,20 @@ def main(argv):
         if res_msg != 0:
             exit(-1)
     
-    sch_cov_file = os.path.join(sch_cov_path, ".coverage")
-    if os.path.exists(sch_cov_file):
+    sch_cov_files = [cov_file for cov_file in sch_cov_files
+                     if os.path.exists(cov_file)]
+    if sch_cov_files:
         if not os.path.exists(FLAGS.cov_path):
             os.makedirs(FLAGS.cov_path)
         dst_path = os.path.join(FLAGS.cov_path, '.coverage.sch')
-        shutil.move(sch_cov_file, dst_path)
+        if os.path.exists(dst_path):
+            os.remove(dst_path)
+        if len(sch_cov_files) == 1:
+            shutil.move(sch_cov_files[0], dst_path)
+        elif not merge_coverage(sch_cov_files, dst_path):
+            # coverage combine of run_test.sh merges the .coverage.* files
+            for index, sch_cov_file in enumerate(sch_cov_files):
+                shutil.move(sch_cov_file, "%s.%d" % (dst_path, index))
 
     exit(0)
 
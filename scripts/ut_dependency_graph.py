@@ -0,0 +1,347 @@
+# encoding: utf-8
+"""
+Select the python UT files affected by a pull request from an import graph of
+the python modules and UT files. The imports of each file are parsed by ast
+and cached by the sha256 of the file, so only the changed files are parsed
+again. The UT files which import a changed module, directly or transitively,
+are selected. A UT which names an op module by string, like
+OpUT("Add", "impl.add", "add"), depends on that module too.
+"""
+import os
+import re
+import ast
+import sys
+import json
+import hashlib
+import argparse
+from collections import deque
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+DEFAULT_CACHE_PATH = os.path.join(ROOT_PATH, "build", "test", "ut", "ut_dependency_graph.json")
+# increase it if the module names or the import parsing are changed
+GRAPH_CACHE_VERSION = 1
+
+# the directories on the python path of the UT and the packages of their modules
+SOURCE_ROOTS = (
+    (os.path.join("auto_schedule", "python"), ("te.lang.cce", "te.lang.cce.te_compute", "tbe.dsl.compute")),
+    (os.path.join("auto_schedule", "python", "tests"), ("",)),
+    (os.path.join("auto_schedule", "python", "tests", "ut"), ("",)),
+    (os.path.join("ops", "built-in", "tbe"), ("",)),
+    (os.path.join("ops", "built-in", "tests", "ut", "ops_test"), ("",)),
+    (os.path.join("tools", "op_test_frame", "python"), ("",)),
+    ("main", ("op_test_frame.st.interface",)),
+)
+
+SCH_SUITE = "sch"
+OPS_SUITE = "ops"
+# the UT files of a suite are the test_*.py under its directory
+UT_SUITES = (
+    (SCH_SUITE, os.path.join("auto_schedule", "python", "tests", "ut")),
+    (OPS_SUITE, os.path.join("ops", "built-in", "tests", "ut", "ops_test")),
+)
+# the changes which run all UT of the suite, the runner and the test frames
+FULL_RUN_PREFIXES = {
+    SCH_SUITE: (os.path.join("auto_schedule", "python", "tests", "sch_run_ut.py"),
+                os.path.join("tools", "sch_test_frame")),
+    OPS_SUITE: (os.path.join("ops", "built-in", "tests", "run_ut.py"),),
+}
+# the changes which run all UT of all suites
+FULL_RUN_FILES = (os.path.join("scripts", "run_ut.py"), os.path.join("scripts", "ut_dependency_graph.py"))
+SKIP_DIRS = ("__pycache__", ".git")
+MODULE_NAME_PATTERN = re.compile(r"^[A-Za-z_]\w*(\.[A-Za-z_]\w*)+$")
+
+
+def get_module_names(file_path):
+    """
+    get the module names of a python file, one for each package of the
+    innermost root which contains it
+    :param file_path: the path relative to the repository
+    :return: list of module name
+    """
+    roots = [(root, packages) for root, packages in SOURCE_ROOTS if file_path.startswith(root + os.sep)]
+    if not roots:
+        return []
+    root, packages = max(roots, key=lambda item: len(item[0]))
+    parts = os.path.splitext(os.path.relpath(file_path, root))[0].split(os.sep)
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return [module_name for module_name in
+            (".".join([package] + parts if package else parts) for package in packages) if module_name]
+
+
+def _get_prefixes(module_name):
+    parts = module_name.split(".")
+    return [".".join(parts[:index]) for index in range(1, len(parts) + 1)]
+
+
+def _resolve_relative(module_name, is_package, node):
+    """
+    get the absolute module of a relative import in the module
+    """
+    parts = module_name.split(".")
+    if not is_package:
+        parts = parts[:-1]
+    if node.level > 1:
+        parts = parts[:-(node.level - 1)]
+    if node.module:
+        parts.append(node.module)
+    return ".".join(parts)
+
+
+def parse_imports(file_path):
+    """
+    get the modules which may be imported by a python file, they are filtered
+    by the modules in the repository when the graph is built
+    :param file_path: the path relative to the repository
+    :return: sorted list of module name
+    """
+    with open(os.path.join(ROOT_PATH, file_path), "rb") as source_file:
+        tree = ast.parse(source_file.read(), filename=file_path)
+    module_names = get_module_names(file_path)
+    is_package = os.path.basename(file_path) == "__init__.py"
+    imports = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.update(_get_prefixes(alias.name))
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                bases = [_resolve_relative(module_name, is_package, node) for module_name in module_names]
+            else:
+                bases = [node.module]
+            for base in bases:
+                if not base:
+                    continue
+                imports.update(_get_prefixes(base))
+                imports.update(base + "." + alias.name for alias in node.names if alias.name != "*")
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str) and \
+                MODULE_NAME_PATTERN.match(node.value):
+            imports.add(node.value)
+    return sorted(imports)
+
+
+def get_python_files():
+    """
+    get the python files under the source roots
+    :return: sorted list of the path relative to the repository
+    """
+    file_paths = set()
+    for root, _ in SOURCE_ROOTS:
+        for dir_path, dir_names, file_names in os.walk(os.path.join(ROOT_PATH, root)):
+            dir_names[:] = [dir_name for dir_name in dir_names if dir_name not in SKIP_DIRS]
+            file_paths.update(os.path.relpath(os.path.join(dir_path, file_name), ROOT_PATH)
+                              for file_name in file_names if file_name.endswith(".py"))
+    return sorted(file_paths)
+
+
+def _get_file_hash(file_path):
+    with open(os.path.join(ROOT_PATH, file_path), "rb") as source_file:
+        return hashlib.sha256(source_file.read()).hexdigest()
+
+
+class DependencyGraph:
+    """
+    The import graph of the python files in the repository.
+    """
+
+    def __init__(self, file_imports):
+        """
+        :param file_imports: dict of file path to the modules it may import
+        """
+        self.file_imports = file_imports
+        self.module_files = {}
+        # the root packages have no __init__.py in the repository, they are
+        # installed with an __init__ which imports all of their modules
+        package_modules = {}
+        for file_path in file_imports:
+            for module_name in get_module_names(file_path):
+                self.module_files.setdefault(module_name, set()).add(file_path)
+                package = module_name.rpartition(".")[0]
+                if any(package in packages for _, packages in SOURCE_ROOTS):
+                    package_modules.setdefault(package, []).append(module_name)
+        # module name -> the files which import it
+        self.dependents = {}
+        for file_path, imports in file_imports.items():
+            for module_name in imports:
+                if module_name in self.module_files:
+                    self.dependents.setdefault(module_name, set()).add(file_path)
+                elif module_name in package_modules and \
+                        not self._imports_submodule(module_name, imports, package_modules):
+                    for package_module in package_modules.get(module_name):
+                        self.dependents.setdefault(package_module, set()).add(file_path)
+
+    def _imports_submodule(self, package, imports, package_modules):
+        """
+        whether the package is only the prefix of the imports of its modules,
+        like `from te.lang.cce.te_compute import util`, the names which are
+        not modules are imported from the package __init__
+        """
+        prefix = package + "."
+        return any(module_name.startswith(prefix) and
+                   (module_name in self.module_files or module_name in package_modules)
+                   for module_name in imports)
+
+    @classmethod
+    def load(cls, cache_path=DEFAULT_CACHE_PATH):
+        """
+        build the graph, the imports of the files which are not changed since
+        the last build are read from the cache
+        :param cache_path: None to parse all files
+        """
+        cached_files = {}
+        if cache_path is not None and os.path.isfile(cache_path):
+            try:
+                with open(cache_path) as cache_file:
+                    cache = json.load(cache_file)
+                if cache.get("version") == GRAPH_CACHE_VERSION:
+                    cached_files = cache.get("files", {})
+            except (OSError, ValueError):
+                cached_files = {}
+            finally:
+                pass
+
+        files = {}
+        for file_path in get_python_files():
+            file_hash = _get_file_hash(file_path)
+            cached = cached_files.get(file_path)
+            if cached is not None and cached.get("hash") == file_hash:
+                files[file_path] = cached
+                continue
+            try:
+                imports = parse_imports(file_path)
+            except SyntaxError as error:
+                print("[WARNING] parse %s failed: %s" % (file_path, error))
+                imports = []
+            finally:
+                pass
+            files[file_path] = {"hash": file_hash, "imports": imports}
+
+        if cache_path is not None and files != cached_files:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_cache_path = "%s.%d.tmp" % (cache_path, os.getpid())
+            with open(tmp_cache_path, "w") as cache_file:
+                json.dump({"version": GRAPH_CACHE_VERSION, "files": files}, cache_file)
+            os.replace(tmp_cache_path, cache_path)
+        return cls({file_path: item.get("imports") for file_path, item in files.items()})
+
+    def get_affected_files(self, changed_files):
+        """
+        get the files which depend on the changed files, directly or
+        transitively, the changed files are included. The deleted files are
+        found by their module names.
+        """
+        affected = set(changed_files)
+        queue = deque(changed_files)
+        while queue:
+            for module_name in get_module_names(queue.popleft()):
+                for file_path in self.dependents.get(module_name, ()):
+                    if file_path not in affected:
+                        affected.add(file_path)
+                        queue.append(file_path)
+        return affected
+
+
+def is_ut_file(file_path, suite_dir):
+    """
+    whether the file is a UT file of the suite
+    """
+    return file_path.startswith(suite_dir + os.sep) and file_path.endswith(".py") and \
+        os.path.basename(file_path).startswith("test_")
+
+
+def get_suite_ut_files(suite):
+    """
+    get all UT files of the suite
+    :return: sorted list of the path relative to the repository
+    """
+    suite_dir = dict(UT_SUITES).get(suite)
+    return [file_path for file_path in get_python_files() if is_ut_file(file_path, suite_dir)]
+
+
+def get_unmapped_files(changed_files):
+    """
+    get the changed files which are out of the source roots and the
+    schedule UT, like the op proto .cc files. The import graph does not map
+    them to UT, they are passed to the ops runner as they are.
+    :return: list of the path relative to the repository
+    """
+    python_roots = tuple(root + os.sep for root, _ in SOURCE_ROOTS)
+    changed_files = [os.path.normpath(line.strip()) for line in changed_files if line.strip()]
+    return [file_path for file_path in changed_files
+            if not file_path.startswith(python_roots) and
+            not file_path.startswith(FULL_RUN_PREFIXES.get(SCH_SUITE)) and
+            file_path not in FULL_RUN_FILES]
+
+
+def select_ut(changed_files, graph=None, cache_path=DEFAULT_CACHE_PATH):
+    """
+    select the UT files affected by the changed files
+
+    Parameters
+    ----------
+    changed_files : list of str
+        the changed file paths relative to the repository, like `git diff --name-only`
+
+    graph : DependencyGraph
+        None to load the graph from cache_path
+
+    Returns
+    -------
+    dict of suite name to the sorted list of the UT files to run, or None to
+    run all UT of the suite
+    """
+    changed_files = [os.path.normpath(line.strip()) for line in changed_files if line.strip()]
+    python_roots = tuple(root + os.sep for root, _ in SOURCE_ROOTS)
+    full_run = set()
+    changed_modules = []
+    for file_path in changed_files:
+        if file_path in FULL_RUN_FILES:
+            full_run.update(suite for suite, _ in UT_SUITES)
+        for suite, prefixes in FULL_RUN_PREFIXES.items():
+            if file_path.startswith(prefixes):
+                full_run.add(suite)
+        if file_path.endswith(".py"):
+            changed_modules.append(file_path)
+        elif file_path.startswith(python_roots):
+            # the data files may be read by any module
+            full_run.update(suite for suite, _ in UT_SUITES)
+
+    selection = {suite: None for suite in full_run}
+    if len(selection) == len(UT_SUITES):
+        return selection
+    if graph is None:
+        graph = DependencyGraph.load(cache_path)
+    affected = graph.get_affected_files(changed_modules)
+    for suite, suite_dir in UT_SUITES:
+        if suite not in selection:
+            selection[suite] = sorted(file_path for file_path in affected if is_ut_file(file_path, suite_dir)
+                                      and os.path.isfile(os.path.join(ROOT_PATH, file_path)))
+    return selection
+
+
+def main():
+    """
+    print the UT files affected by a git diff file list
+    """
+    parser = argparse.ArgumentParser(description="select the python UT by the import graph")
+    parser.add_argument("changed_file", help="file of changed paths, like `git diff --name-only`")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="the graph cache file")
+    parser.add_argument("--no_cache", action="store_true", help="parse all files without the cache")
+    args = parser.parse_args()
+
+    with open(args.changed_file) as changed_file:
+        changed_files = changed_file.readlines()
+    selection = select_ut(changed_files, cache_path=None if args.no_cache else args.cache)
+    for suite, _ in UT_SUITES:
+        ut_files = selection.get(suite)
+        if ut_files is None:
+            print("%s: all" % suite)
+            continue
+        print("%s: %d" % (suite, len(ut_files)))
+        for file_path in ut_files:
+            print("    %s" % file_path)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# encoding: utf-8
+"""
+Run the UT case files in parallel shards. The case files are assigned to the
+shards by their durations of the last runs, which are kept in a local timing
+file, the longest file is assigned first to the shard with the least time.
+Each shard runs in its own process with its own coverage and report
+directory, the coverage data files of the shards are merged at the end.
+"""
+import os
+import json
+import time
+import heapq
+import subprocess
+
+# the duration of the case file which has not been run
+DEFAULT_DURATION = 10.0
+# the weight of the new duration in the moving average of the timing file
+TIMING_WEIGHT = 0.5
+
+
+def load_timing(timing_path):
+    """
+    :return: dict of case file to duration in seconds
+    """
+    try:
+        with open(timing_path) as timing_file:
+            timing = json.load(timing_file)
+    except (OSError, ValueError):
+        return {}
+    finally:
+        pass
+    return {case_file: float(duration) for case_file, duration in timing.items()
+            if isinstance(duration, (int, float))}
+
+
+def save_timing(timing_path, timing):
+    os.makedirs(os.path.dirname(os.path.realpath(timing_path)), exist_ok=True)
+    tmp_timing_path = "%s.%d.tmp" % (timing_path, os.getpid())
+    with open(tmp_timing_path, "w") as timing_file:
+        json.dump(timing, timing_file, indent=4, sort_keys=True)
+    os.replace(tmp_timing_path, timing_path)
+
+
+def get_durations(case_files, timing):
+    """
+    get the durations of the case files, the case file which has not been run
+    takes the median duration of the others
+    """
+    known = sorted(timing.get(case_file) for case_file in case_files if case_file in timing)
+    default_duration = known[len(known) // 2] if known else DEFAULT_DURATION
+    return {case_file: timing.get(case_file, default_duration) for case_file in case_files}
+
+
+def split_shards(case_files, shard_num, timing):
+    """
+    split the case files to shards with balanced durations
+
+    Parameters
+    ----------
+    case_files : list of str
+        the case files to run
+
+    shard_num : int
+        the max count of shards, there is no empty shard
+
+    timing : dict
+        the durations of the case files
+
+    Returns
+    -------
+    list of (estimated seconds, list of case file)
+    """
+    durations = get_durations(case_files, timing)
+    shard_num = max(1, min(shard_num, len(case_files)))
+    heap = [(0.0, index, []) for index in range(shard_num)]
+    for case_file in sorted(case_files, key=lambda item: (-durations.get(item), item)):
+        seconds, index, shard_files = heapq.heappop(heap)
+        shard_files.append(case_file)
+        heapq.heappush(heap, (seconds + durations.get(case_file), index, shard_files))
+    return [(seconds, shard_files) for seconds, _, shard_files in sorted(heap, key=lambda item: item[1])
+            if shard_files]
+
+
+def update_timing(timing, shard_files, wall_seconds):
+    """
+    update the durations of the case files of a shard, the wall time of the
+    shard is shared by its case files in proportion to their durations
+    """
+    durations = get_durations(shard_files, timing)
+    total = sum(durations.values())
+    for case_file in shard_files:
+        duration = wall_seconds * durations.get(case_file) / total if total else wall_seconds / len(shard_files)
+        if case_file in timing:
+            duration = TIMING_WEIGHT * duration + (1 - TIMING_WEIGHT) * timing.get(case_file)
+        timing[case_file] = duration
+
+
+def run_shards(get_shard_cmd, case_files, shard_num, timing_path, log_dir):
+    """
+    run the case files in shards
+
+    Parameters
+    ----------
+    get_shard_cmd : function
+        get_shard_cmd(shard_index, shard_files) returns the command of the shard
+
+    case_files : list of str
+        the case files to run
+
+    shard_num : int
+        the max count of parallel shards
+
+    timing_path : str
+        the timing file, it is updated by the durations of the passed shards
+
+    log_dir : str
+        the output of shard i is written to log_dir/shard_<i>.log
+
+    Returns
+    -------
+    list of dict of index, case_files, estimated_seconds, wall_seconds and
+    return_code
+    """
+    timing = load_timing(timing_path)
+    shards = split_shards(case_files, shard_num, timing)
+    os.makedirs(log_dir, exist_ok=True)
+    results = []
+    for index, (seconds, shard_files) in enumerate(shards):
+        log_path = os.path.join(log_dir, "shard_%d.log" % index)
+        log_file = open(log_path, "w")
+        process = subprocess.Popen(get_shard_cmd(index, shard_files), stdout=log_file, stderr=subprocess.STDOUT)
+        results.append({"index": index, "case_files": shard_files, "estimated_seconds": seconds,
+                        "wall_seconds": None, "return_code": None, "log_path": log_path,
+                        "_process": process, "_log_file": log_file, "_start_time": time.time()})
+
+    running = list(results)
+    while running:
+        for result in list(running):
+            return_code = result.get("_process").poll()
+            if return_code is None:
+                continue
+            result["wall_seconds"] = time.time() - result.pop("_start_time")
+            result["return_code"] = return_code
+            result.pop("_process")
+            result.pop("_log_file").close()
+            running.remove(result)
+            # the failed shard may stop early, its time is not the durations of its files
+            if return_code == 0:
+                update_timing(timing, result.get("case_files"), result.get("wall_seconds"))
+        time.sleep(0.1)
+    save_timing(timing_path, timing)
+    return results
+
+
+def print_shard_table(results):
+    """
+    print the wall time of the shards of run_shards
+    """
+    print("%-6s %8s %12s %12s %6s  %s" % ("shard", "files", "estimated s", "wall s", "code", "log"))
+    for result in results:
+        print("%-6d %8d %12.2f %12.2f %6d  %s" % (
+            result.get("index"), len(result.get("case_files")), result.get("estimated_seconds"),
+            result.get("wall_seconds"), result.get("return_code"), result.get("log_path")))
+
+
+def merge_coverage(data_files, dst_path):
+    """
+    merge the coverage data files of the shards to dst_path
+    :return: True if merged, False if coverage is not installed
+    """
+    try:
+        import coverage
+    except ImportError:
+        return False
+    finally:
+        pass
+    cov = coverage.Coverage(data_file=dst_path)
+    cov.combine(data_files)
+    cov.save()
+    return True